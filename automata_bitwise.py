@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+bit-parallel stepping of one dimensional universes, with a generation packed in one integer
+"""
+
+# pipenv shell
+
+# standard library imports
+# related third party imports
+import numpy as np
+
+# local application/library specific imports
+import automata_typehints as AHint
+from automata_universe import AutomataUniverse
+from automata_engine import AutomataEngine
+
+# the widest generation held in one integer: wider (more spread out) generations are stepped
+# with the reference neighbour counting, instead of allocating a bit for every address between
+# the outermost cells
+_WIDTH_LIMIT = 1 << 24
+
+class BitwiseEngine(AutomataEngine):
+    """engine for one dimensional universes, stepping every cell at once with integer bit operations
+
+    A generation is held as a Python integer, with bit i set when cell (i + base) is alive. The
+    base moves with the pattern, so negative coordinates need nothing special. Neighbour
+    counts are kept bit sliced: one integer per binary digit of the count, with bit i of each
+    holding that digit for cell i. Adding the generation shifted by each neighbourhood offset
+    is a ripple carry add over the digit integers, and the rule lookup is a mask of the cells
+    with each count that gives birth or survival. Every operation works on all the cells of
+    the generation together.
+
+    advance keeps the packed form between generations, so long runs only convert cells at the
+    start and the end.
+
+    Generations spread wider than _WIDTH_LIMIT addresses are stepped with the reference
+    neighbour counting.
+
+    :property offsets: the neighbourhood offsets
+    :type offsets: tuple of integers
+    """
+
+    def __init__(self, universe: AutomataUniverse) -> None:
+        """constructor
+
+        :param universe: one dimensional cellular automata universe configuration
+        :type universe: AutomataUniverse
+        :raises: TypeError, ValueError
+        """
+        super().__init__(universe)
+        if universe.dimensions != 1:
+            raise ValueError((universe.dimensions, "bitwise engine universe is not 1 dimensional"))
+        geometry = universe.geometry
+        self._offsets = tuple(int(offset) for offset in geometry.offsets[:, 0])
+        self._reach = geometry.radius[0]
+        (birth, survival) = geometry.rules.tolist()
+        self._birth = tuple(count for count, born in enumerate(birth) if born)
+        self._survival = tuple(count for count, lives in enumerate(survival) if lives)
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def offsets(self) -> tuple[int, ...]:
+        return self._offsets
+
+    # end of property methods
+
+    def pack(self, cells: AHint.CellGroupType) -> tuple[int, int]:
+        """bit packed form of a generation
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :returns: the packed cells, and the address of bit 0
+        :rtype: tuple of 2 integers
+        :raises: TypeError, ValueError
+        """
+        self._universe._check_cell_group(cells) # pylint: disable=W0212
+        if not cells:
+            return (0, 0)
+        if self._too_wide(cells):
+            raise ValueError((min(cells)[0], max(cells)[0],
+                "cells are too far apart to pack into one integer"))
+        base = min(cells)[0]
+        # set one byte per cell, then pack the bytes to bits and convert once
+        offsets = np.fromiter((coord - base for (coord,) in cells), dtype=np.int64,
+            count=len(cells))
+        flags = np.zeros(int(offsets.max()) + 1, dtype=np.uint8)
+        flags[offsets] = 1
+        return (int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little'), base)
+
+    @staticmethod
+    def _too_wide(cells: AHint.CellGroupType) -> bool:
+        """check if a non-empty generation spreads over more addresses than one integer holds"""
+        return max(cells)[0] - min(cells)[0] >= _WIDTH_LIMIT
+
+    @staticmethod
+    def unpack(bits: int, base: int) -> AHint.CellGroupWorkingType:
+        """cells from the bit packed form of a generation
+
+        :param bits: the packed cells
+        :type bits: int
+        :param base: the address of bit 0
+        :type base: int
+        :returns: living cells
+        :rtype: set of universe cell address tuples
+        """
+        cells = set()
+        text = bin(bits)[:1:-1]
+        index = text.find('1')
+        while index >= 0:
+            cells.add((index + base,))
+            index = text.find('1', index + 1)
+        return cells
+
+    @staticmethod
+    def _count_mask(digits: list[int], count: int, width: int) -> int:
+        """cells whose bit sliced neighbour count equals a value"""
+        mask = width
+        for digit in digits:
+            mask &= digit if count & 1 else ~digit
+            count >>= 1
+        return 0 if count else mask
+
+    def step_bits(self, bits: int, base: int) -> tuple[int, int]:
+        """iterate a bit packed generation to the next
+
+        :param bits: the packed cells
+        :type bits: int
+        :param base: the address of bit 0
+        :type base: int
+        :returns: the packed next generation, and the address of its bit 0
+        :rtype: tuple of 2 integers
+        """
+        if not bits:
+            return (0, 0)
+        # make room for births on either side
+        reach = self._reach
+        bits <<= reach
+        base -= reach
+        width = (1 << (bits.bit_length() + reach)) - 1
+        digits = []
+        for offset in self._offsets:
+            carry = bits >> offset if offset > 0 else (bits << -offset) & width
+            for place, digit in enumerate(digits):
+                (digits[place], carry) = (digit ^ carry, digit & carry)
+                if not carry:
+                    break
+            if carry:
+                digits.append(carry)
+        born = 0
+        for count in self._birth:
+            born |= self._count_mask(digits, count, width)
+        lives = 0
+        for count in self._survival:
+            lives |= self._count_mask(digits, count, width)
+        bits = (born & ~bits | lives & bits) & width
+        if not bits:
+            return (0, 0)
+        low = (bits & -bits).bit_length() - 1
+        return (bits >> low, base + low)
+    # end def step_bits()
+
+    def step(self, cells: AHint.CellGroupType) -> AHint.CellGroupWorkingType:
+        """iterate from a generation to the next
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :returns: next generation of cells
+        :rtype: set of universe cell address tuples
+        """
+        if cells and self._too_wide(cells):
+            return super().step(cells)
+        return self.unpack(*self.step_bits(*self.pack(cells)))
+
+    def advance(self, cells: AHint.CellGroupType, generations: int) \
+            -> AHint.CellGroupWorkingType:
+        """iterate forward a number of generations
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :param generations: the number of generations to step
+        :type generations: int
+        :returns: generation of cells after the final step
+        :rtype: set of universe cell address tuples
+        """
+        if cells and self._too_wide(cells):
+            return super().advance(cells, generations)
+        (bits, base) = self.pack(cells)
+        for count in range(generations):
+            if not bits:
+                break
+            if bits.bit_length() > _WIDTH_LIMIT:
+                # grown too wide: step cell by cell, packing again if it narrows
+                return super().advance(self.unpack(bits, base), generations - count)
+            (bits, base) = self.step_bits(bits, base)
+        return self.unpack(bits, base)
+    # end def advance()
+# end class BitwiseEngine
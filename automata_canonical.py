@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+canonical forms of cell groups, invariant under translation and a group of transforms
+"""
+
+# pipenv shell
+
+# standard library imports
+from collections import namedtuple
+from hashlib import blake2b
+from typing import Iterable
+
+# related third party imports
+import numpy as np
+
+# local application/library specific imports
+import automata_typehints as AHint
+from automata_transforms import AutomataTransforms
+
+CanonicalForm = namedtuple('CanonicalForm', 'digest encoding transform offset')
+CanonicalForm.__doc__ = """translation and transform invariant identity of a cell group
+
+:field digest: integer hash of the encoding
+:field encoding: compact bytes for the canonical cells: dimensions, key width, 8 byte
+    packing base, then the sorted cell keys
+:field transform: group index of the transform that maps the cells to the canonical cells
+:field offset: minimum corner of the transformed cells, subtracted to reach the canonical
+    cells
+"""
+
+# key width byte for encodings too large to pack into single integer cell keys
+_ROW_ENCODING = 0
+
+class PatternCanonicalizer:
+    """canonical forms for cell groups, using the transform group of an AutomataTransforms
+
+    Every group transform is applied to the cells in one batch. Each image is normalized
+    (shifted against all axes, like Automaton._normalize_cells), each cell packed into an
+    integer key, and the keys sorted. The image with the smallest key sequence is the
+    canonical one. The packing base is the largest normalized coordinate over all images,
+    which is the same for every member of an equivalence class.
+
+    :property transforms: source of the transform group
+    :type transforms: AutomataTransforms
+    :property group_order: the number of transforms, including the identity
+    :type group_order: int
+    :property digest_bits: the size of the integer digest
+    :type digest_bits: int
+    """
+
+    def __init__(self, transforms: AutomataTransforms, digest_bits: int = 64) -> None:
+        """constructor
+
+        The transform group is generated from the stored transforms when that has not been
+        done yet. Without any stored transforms, only translation is factored out.
+
+        :param transforms: rotation and reflection transforms for a universe
+        :type transforms: AutomataTransforms
+        :param digest_bits: 64 or 128
+        :type digest_bits: int
+        :raises: TypeError, ValueError
+        """
+        if not isinstance(transforms, AutomataTransforms):
+            raise TypeError((type(transforms), "transforms is not an AutomataTransforms"))
+        if digest_bits not in (64, 128):
+            raise ValueError((digest_bits, "digest size must be 64 or 128 bits"))
+        self._transforms = transforms
+        self._matrices = np.array(transforms.group_transforms(), dtype=np.int64)
+        self._digest_bits = digest_bits
+        self._dimensions = self._matrices.shape[1]
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def transforms(self) -> AutomataTransforms:
+        return self._transforms
+
+    @property
+    def group_order(self) -> int:
+        return len(self._matrices)
+
+    @property
+    def digest_bits(self) -> int:
+        return self._digest_bits
+
+    # end of property methods
+
+    def _form(self, encoding: bytes, transform: int, offset: list[int]) -> CanonicalForm:
+        digest = blake2b(encoding, digest_size=self._digest_bits // 8).digest()
+        return CanonicalForm(int.from_bytes(digest, 'little'), encoding, transform,
+            tuple(offset))
+
+    def _header(self, width: int, base: int) -> bytes:
+        return bytes((self._dimensions, width)) + base.to_bytes(8, 'little')
+
+    def _canonical_batch(self, points: np.ndarray) -> list[CanonicalForm]:
+        """canonical forms for objects that all have the same number of cells
+
+        :param points: cell coordinates for each object
+        :type points: numpy (objects, cells, dimensions) integer array
+        :returns: canonical form for each object
+        :rtype: list of CanonicalForm
+        """
+        (objects, population, dimensions) = points.shape
+        # (transforms, objects, cells, dimensions)
+        images = np.stack([points @ matrix.T for matrix in self._matrices])
+        corners = images.min(axis=2)
+        images -= corners[:, :, np.newaxis]
+        bases = images.max(axis=(0, 2, 3)) + 1
+        forms = [None] * objects
+        # only the objects too large to pack use row encoding, so every object gets the same
+        # form whatever it is batched with
+        wide = np.array([base ** dimensions >= 2 ** 63 for base in bases.tolist()], dtype=bool)
+        for index in np.nonzero(wide)[0].tolist():
+            forms[index] = self._canonical_rows(images[:, index], corners[:, index])
+        packed = np.nonzero(~wide)[0]
+        if len(packed) == 0:
+            return forms
+        (images, corners, bases) = (images[:, packed], corners[:, packed], bases[packed])
+        objects = len(packed)
+        places = bases[:, np.newaxis] ** np.arange(dimensions - 1, -1, -1, dtype=np.int64)
+        keys = np.sort((images * places[:, np.newaxis]).sum(axis=3), axis=2)
+        # lexicographic minimum of the sorted key sequences, over the transforms
+        best = np.zeros(objects, dtype=np.int64)
+        best_keys = keys[0]
+        rows = np.arange(objects)
+        for transform in range(1, len(self._matrices)):
+            difference = keys[transform] - best_keys
+            first = np.argmax(difference != 0, axis=1)
+            smaller = difference[rows, first] < 0
+            best[smaller] = transform
+            best_keys = np.where(smaller[:, np.newaxis], keys[transform], best_keys)
+        needed = bases ** dimensions
+        widths = np.select((needed <= 2 ** 8, needed <= 2 ** 16, needed <= 2 ** 32), (1, 2, 4), 8)
+        (base_list, best_list) = (bases.tolist(), best.tolist())
+        offsets = corners[best, rows].tolist()
+        targets = packed.tolist()
+        for width in np.unique(widths).tolist():
+            members = np.nonzero(widths == width)[0]
+            raw = best_keys[members].astype('<u{}'.format(width)).tobytes()
+            size = population * width
+            for position, index in enumerate(members.tolist()):
+                forms[targets[index]] = self._form(self._header(width, base_list[index]) +
+                    raw[position * size:(position + 1) * size], best_list[index], offsets[index])
+        return forms
+    # end def _canonical_batch()
+
+    def _canonical_rows(self, images: np.ndarray, corners: np.ndarray) -> CanonicalForm:
+        """canonical form for an object too large to pack cells into single integer keys
+
+        Cells are encoded as rows of 8 byte big endian coordinates, which sort as bytes in the
+        same order as the coordinate tuples, at any extent a cell array can hold.
+
+        :param images: normalized cells for each transform
+        :type images: numpy (transforms, cells, dimensions) integer array
+        :param corners: normalization offsets for each transform
+        :type corners: numpy (transforms, dimensions) integer array
+        :returns: canonical form
+        :rtype: CanonicalForm
+        """
+        best = None
+        for transform, image in enumerate(images):
+            order = np.lexsort(image.T[::-1])
+            encoded = image[order].astype('>u8').tobytes()
+            if best is None or encoded < best[0]:
+                best = (encoded, transform)
+        (encoded, transform) = best
+        base = int(images.max()) + 1
+        return self._form(self._header(_ROW_ENCODING, base) + encoded, transform,
+            corners[transform].tolist())
+    # end def _canonical_rows()
+
+    def canonical_form(self, cells: AHint.CellGroupType) -> CanonicalForm:
+        """canonical form of a single non-empty cell group
+
+        :param cells: cell addresses
+        :type cells: «frozen»set of cell address tuples
+        :returns: translation and transform invariant identity
+        :rtype: CanonicalForm
+        :raises: TypeError, ValueError
+        """
+        return self.canonical_forms((cells,))[0]
+
+    def canonical_forms(self, objects: Iterable[AHint.CellGroupType]) -> list[CanonicalForm]:
+        """canonical forms for many non-empty cell groups
+
+        Objects with the same population are canonicalized together, in batches.
+
+        :param objects: cell groups
+        :type objects: iterable of «frozen»sets of cell address tuples
+        :returns: canonical form for each object, in the same order
+        :rtype: list of CanonicalForm
+        :raises: TypeError, ValueError
+        """
+        universe = self._transforms._universe # pylint: disable=W0212
+        groups = dict()
+        count = 0
+        for index, cells in enumerate(objects):
+            if not isinstance(cells, (set, frozenset)):
+                universe._check_cell_group(cells) # pylint: disable=W0212
+            if not cells:
+                raise ValueError((index, "can not canonicalize an empty cell group"))
+            groups.setdefault(len(cells), []).append((index, cells))
+            count += 1
+        results = [None] * count
+        for population, members in groups.items():
+            # limit the working arrays to about a million coordinates
+            chunk = max(1, 2 ** 20 // (len(self._matrices) * population * self._dimensions))
+            for start in range(0, len(members), chunk):
+                batch = members[start:start + chunk]
+                try:
+                    points = np.array([list(cells) for _index, cells in batch])
+                except ValueError: # cell addresses of different lengths
+                    points = np.array(())
+                if points.dtype.kind != 'i' or points.shape != (len(batch), population,
+                        self._dimensions):
+                    for _index, cells in batch:
+                        # report the first bad cell address
+                        universe._check_cell_group(cells) # pylint: disable=W0212
+                for (index, _cells), form in zip(batch,
+                        self._canonical_batch(points.astype(np.int64))):
+                    results[index] = form
+        return results
+    # end def canonical_forms()
+# end class PatternCanonicalizer
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+census of the objects in a settled cellular automata generation
+"""
+
+# pipenv shell
+
+# standard library imports
+import json
+from collections import Counter, namedtuple
+from hashlib import blake2b
+from typing import Optional
+
+# related third party imports
+import numpy as np
+
+# local application/library specific imports
+import automata_typehints as AHint
+from automaton import Automaton
+from automata_transforms import shared_transforms
+from automata_canonical import PatternCanonicalizer
+from automata_store import AutomataStore
+
+KIND_STILL_LIFE = 'still life'
+KIND_OSCILLATOR = 'oscillator'
+KIND_SPACESHIP = 'spaceship'
+KIND_UNCLASSIFIED = 'unclassified'
+
+CensusEntry = namedtuple('CensusEntry', 'kind period displacement population digest')
+CensusEntry.__doc__ = """classification of a canonical object
+
+:field kind: one of the KIND_… constants
+:field period: generations before the object repeats, or None when unclassified
+:field displacement: movement per period, in the canonical orientation, or None
+:field population: the number of cells in the object, as first seen
+:field digest: integer digest of the canonical form
+"""
+
+class ObjectCensus:
+    """classify and tally the connected objects of an automaton generation
+
+    Objects are the groups of cells that can interact within one generation
+    (Automaton.get_clusters). Each one is reduced to its canonical form, and looked up in a
+    table of objects already classified. Only objects not in the table are stepped on their
+    own (Automaton.object_period) to find their kind, period and velocity.
+
+    :property automaton: the automaton whose generation is counted
+    :type automaton: Automaton
+    :property max_period: the longest period looked for when classifying a new object
+    :type max_period: int
+    :property known: the number of classified canonical objects
+    :type known: int
+    :property hits: objects found in the classification table
+    :type hits: int
+    :property misses: objects that had to be classified
+    :type misses: int
+    """
+
+    def __init__(self, automaton: Automaton, max_period: int = 64,
+            canonicalizer: Optional[PatternCanonicalizer] = None) -> None:
+        """constructor
+
+        :param automaton: source of the generations to count
+        :type automaton: Automaton
+        :param max_period: the longest period to look for
+        :type max_period: int
+        :param canonicalizer: canonical forms to identify objects with, default all the
+            symmetries of the universe neighbourhood
+        :type canonicalizer: PatternCanonicalizer
+        :raises: TypeError, ValueError
+        """
+        if not isinstance(automaton, Automaton):
+            raise TypeError((type(automaton), "census automaton is not an Automaton"))
+        Automaton._check_generations(max_period) # pylint: disable=W0212
+        if canonicalizer is None:
+            canonicalizer = PatternCanonicalizer(shared_transforms(automaton.universe,
+                symmetry=True))
+        self._automaton = automaton
+        self._max_period = max_period
+        self._canonicalizer = canonicalizer
+        self._table = dict()
+        self._hits = 0
+        self._misses = 0
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def automaton(self) -> Automaton:
+        return self._automaton
+
+    @property
+    def max_period(self) -> int:
+        return self._max_period
+
+    @property
+    def known(self) -> int:
+        return len(self._table)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    # end of property methods
+
+    def entry(self, encoding: bytes) -> Optional[CensusEntry]:
+        """classification for a canonical encoding, when it is already known"""
+        return self._table.get(encoding)
+
+    def _classify(self, cells: AHint.CellGroupType, transform: int) -> CensusEntry:
+        """step an object on its own to find what kind of object it is
+
+        :param cells: universe cell addresses of the object
+        :type cells: «frozen»set of cell address tuples
+        :param transform: group index of the transform to the canonical orientation
+        :type transform: int
+        :returns: classification, without the digest
+        :rtype: CensusEntry
+        """
+        result = self._automaton.object_period(cells, self._max_period)
+        if result is None:
+            return CensusEntry(KIND_UNCLASSIFIED, None, None, len(cells), None)
+        (period, displacement) = result
+        universe = self._automaton.universe
+        if any(displacement):
+            transforms = self._canonicalizer.transforms
+            if transforms.group_order > 0:
+                displacement = universe.vector_dot_product(displacement,
+                    transforms.group_transform(transform))
+            return CensusEntry(KIND_SPACESHIP, period, displacement, len(cells), None)
+        kind = KIND_STILL_LIFE if period == 1 else KIND_OSCILLATOR
+        return CensusEntry(kind, period, displacement, len(cells), None)
+    # end def _classify()
+
+    def take(self) -> Counter:
+        """count the objects in the current generation of the automaton
+
+        :returns: the number of each canonical object, by canonical encoding
+        :rtype: Counter
+        """
+        objects = [cluster.cells for cluster in self._automaton.get_clusters()]
+        tally = Counter()
+        if not objects:
+            return tally
+        for cells, form in zip(objects, self._canonicalizer.canonical_forms(objects)):
+            if form.encoding in self._table:
+                self._hits += 1
+            else:
+                self._misses += 1
+                self._table[form.encoding] = self._classify(cells, form.transform)._replace(
+                    digest=form.digest)
+            tally[form.encoding] += 1
+        return tally
+    # end def take()
+
+    def summary(self, tally: Counter) -> Counter:
+        """combine a tally by kind and period
+
+        :param tally: object counts by canonical encoding, from take
+        :type tally: Counter
+        :returns: object counts by (kind, period)
+        :rtype: Counter
+        """
+        summary = Counter()
+        for encoding, count in tally.items():
+            entry = self._table[encoding]
+            summary[(entry.kind, entry.period)] += count
+        return summary
+
+    def _group_key(self) -> str:
+        """stable name for the canonical transform group, the same in every process"""
+        matrices = self._canonicalizer.transforms.group_transforms()
+        return blake2b(np.array(matrices, dtype='<i8').tobytes(), digest_size=16).hexdigest()
+
+    def save_table(self, path: str) -> None:
+        """write the classification table to a json file
+
+        The file records the universe and canonical transform group the encodings belong to,
+        and the max_period the objects were classified with.
+
+        :param path: file to write
+        :type path: str
+        """
+        records = [{'encoding': encoding.hex(), 'kind': entry.kind, 'period': entry.period,
+            'displacement': entry.displacement, 'population': entry.population,
+            'digest': entry.digest} for encoding, entry in self._table.items()]
+        with open(path, 'w', encoding='utf-8') as table_file:
+            json.dump({'universe': AutomataStore.universe_key(self._automaton.universe),
+                'group': self._group_key(), 'max_period': self._max_period,
+                'objects': records}, table_file)
+    # end def save_table()
+
+    def load_table(self, path: str) -> int:
+        """add the classifications saved in a json file to the table
+
+        The file must come from a census of the same universe, with the same canonical
+        transforms. Saved classifications are reconciled with the max_period of this census:
+        objects with a longer period become unclassified, and objects left unclassified with
+        a shorter max_period are not loaded, so they are classified again when seen.
+
+        :param path: file written by save_table
+        :type path: str
+        :returns: the number of entries loaded
+        :rtype: int
+        :raises: ValueError
+        """
+        with open(path, 'r', encoding='utf-8') as table_file:
+            saved = json.load(table_file)
+        if saved.get('universe') != AutomataStore.universe_key(self._automaton.universe):
+            raise ValueError((path, "census table was saved for a different universe"))
+        if saved.get('group') != self._group_key():
+            raise ValueError((path, "census table was saved with different canonical transforms"))
+        loaded = 0
+        for record in saved['objects']:
+            entry = CensusEntry(record['kind'], record['period'], None
+                if record['displacement'] is None else tuple(record['displacement']),
+                record['population'], record['digest'])
+            if entry.kind == KIND_UNCLASSIFIED:
+                if saved['max_period'] < self._max_period:
+                    continue
+            elif entry.period > self._max_period:
+                entry = entry._replace(kind=KIND_UNCLASSIFIED, period=None, displacement=None)
+            self._table[bytes.fromhex(record['encoding'])] = entry
+            loaded += 1
+        return loaded
+    # end def load_table()
+# end class ObjectCensus
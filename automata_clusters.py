@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+packed integer cell keys and connected cluster labelling for cellular automata generations
+"""
+
+# pipenv shell
+
+# standard library imports
+import math
+from collections import namedtuple
+from typing import Collection, Optional
+
+# related third party imports
+import numpy as np
+
+# local application/library specific imports
+import automata_typehints as AHint
+
+# packed keys held in numpy arrays must stay well inside 64 bit integers, leaving room to add
+# packed offsets
+_ARRAY_KEY_LIMIT = 1 << 62
+
+CellCluster = namedtuple('CellCluster', 'cells extent')
+CellCluster.__doc__ = """group of living cells that interact with each other
+
+:field cells: universe cell addresses in the cluster
+:field extent: minimum and maximum corner coordinates of the cluster bounding box
+"""
+
+def cells_extent(cells: Collection[AHint.CellAddressType]) -> AHint.BoundingBoxType:
+    """determine the n-dimensional bounding box for a non-empty group of cells
+
+    :param cells: cell addresses
+    :type cells: sized iterable of cell address tuples
+    :returns: minimum and maximum corner coordinates of bounding box
+    :rtype: tuple[tuple[int, ...],tuple[int, ...]]
+    """
+    if len(cells) == 1:
+        (cell,) = cells
+        return (cell, cell)
+    coordinates = tuple(zip(*cells))
+    return (tuple(min(axis) for axis in coordinates), tuple(max(axis) for axis in coordinates))
+# end def cells_extent()
+
+def normalize_cells(cells: AHint.CellGroupType) \
+        -> tuple[AHint.CellGroupSnapshotType, AHint.BoundingBoxType]:
+    """shift a non-empty group of cells to fit against all axes in the first quadrant
+
+    Automaton._normalize_cells uses this to normalize a set of cells in place.
+
+    :param cells: cell addresses
+    :type cells: «frozen»set of cell address tuples
+    :returns: normalized cells, and the bounding box of the original cells
+    :rtype: tuple containing a frozenset of cell address tuples and a bounding box
+        NOTE  bounding_box[0] is the offset vector need to move the normalized
+              block back to its original location
+    """
+    extent = cells_extent(cells)
+    low = extent[0]
+    return (frozenset(tuple(coord - base for coord, base in zip(cell, low)) for cell in cells),
+        extent)
+# end def normalize_cells()
+
+class CellPacking:
+    """map cell addresses inside a bounding box to single integer keys
+
+    The bounding box is extended by a margin on every side. For an offset with no coordinate
+    larger than the margin, the packed key of (cell + offset) is the packed key of the cell
+    plus the packed offset, for any cell inside the original bounding box.
+
+    :property dimensions: the number of dimension for the packed cell addresses
+    :type dimensions: int
+    :property strides: key increment for a unit step along each axis
+    :type strides: tuple of integers
+    """
+
+    def __init__(self, extent: AHint.BoundingBoxType, margin: int = 0) -> None:
+        """constructor
+
+        :param extent: minimum and maximum corner coordinates of the cells to pack
+        :type extent: tuple of 2 cell address tuples
+        :param margin: extra space needed around the bounding box
+        :type margin: int
+        :raises: ValueError
+        """
+        if margin < 0:
+            raise ValueError((margin, "packing margin can not be negative"))
+        self._low = tuple(low - margin for low in extent[0])
+        sizes = tuple(high - low + 1 + 2 * margin for low, high in zip(*extent))
+        strides = [1] * len(sizes)
+        for axis in range(len(sizes) - 1, 0, -1):
+            strides[axis - 1] = strides[axis] * sizes[axis]
+        self._sizes = sizes
+        self._strides = tuple(strides)
+
+    @classmethod
+    def for_arrays(cls, extent: AHint.BoundingBoxType, margin: int = 0) \
+            -> Optional['CellPacking']:
+        """packing for numpy int64 key arrays, when every key fits
+
+        :param extent: minimum and maximum corner coordinates of the cells to pack
+        :type extent: tuple of 2 cell address tuples
+        :param margin: extra space needed around the bounding box
+        :type margin: int
+        :returns: the packing, or None when the extended bounding box holds too many
+            addresses for 64 bit keys
+        :rtype: CellPacking
+        :raises: ValueError
+        """
+        if math.prod(high - low + 1 + 2 * margin for low, high in zip(*extent)) >= \
+                _ARRAY_KEY_LIMIT:
+            return None
+        return cls(extent, margin)
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def dimensions(self) -> int:
+        return len(self._strides)
+
+    @property
+    def strides(self) -> tuple[int, ...]:
+        return self._strides
+
+    # end of property methods
+
+    def pack(self, cell: AHint.CellAddressType) -> int:
+        """single integer key for a cell address"""
+        return sum((coord - low) * stride
+            for coord, low, stride in zip(cell, self._low, self._strides))
+
+    def pack_array(self, cells: np.ndarray) -> np.ndarray:
+        """single integer keys for the rows of a cell coordinate array"""
+        return (cells - np.array(self._low, dtype=np.int64)) @ np.array(self._strides,
+            dtype=np.int64)
+
+    def pack_offset(self, offset: AHint.CellAddressType) -> int:
+        """key delta for a relative cell address"""
+        return sum(coord * stride for coord, stride in zip(offset, self._strides))
+
+    def unpack_array(self, keys: np.ndarray) -> np.ndarray:
+        """cell coordinate array, one row per cell, for an array of single integer keys"""
+        return (keys[:, np.newaxis] // np.array(self._strides, dtype=np.int64)) % \
+            np.array(self._sizes, dtype=np.int64) + np.array(self._low, dtype=np.int64)
+
+    def unpack(self, key: int) -> AHint.CellAddressType:
+        """cell address for a single integer key"""
+        address = []
+        for low, stride in zip(self._low, self._strides):
+            (coord, key) = divmod(key, stride)
+            address.append(coord + low)
+        return tuple(address)
+# end class CellPacking
+
+def cluster_cells(cells: AHint.CellGroupType, offsets: AHint.NeighbourhoodType) \
+        -> list[CellCluster]:
+    """split a group of cells into clusters connected through an offset neighbourhood
+
+    Union-find over packed cell keys. Each cell looks up only the positive half of the
+    (symmetric) offsets, so every connected pair is checked once. With path halving and union
+    by size, the run time is close to linear in the number of cells.
+
+    :param cells: living cells
+    :type cells: «frozen»set of cell address tuples
+    :param offsets: symmetric relative addresses that connect two cells
+    :type offsets: frozenset of cell address tuples
+    :returns: connected groups of cells, with their bounding boxes
+    :rtype: list of CellCluster
+    """
+    if not cells:
+        return []
+    cell_list = list(cells)
+    packing = CellPacking(cells_extent(cell_list),
+        max(abs(coord) for offset in offsets for coord in offset))
+    keys = [packing.pack(cell) for cell in cell_list]
+    key_index = {key: index for index, key in enumerate(keys)}
+    deltas = [delta for delta in (packing.pack_offset(offset) for offset in offsets)
+        if delta > 0]
+    parent = list(range(len(keys)))
+    size = [1] * len(keys)
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]] # path halving
+            index = parent[index]
+        return index
+
+    lookup = key_index.get
+    for index, key in enumerate(keys):
+        for delta in deltas:
+            other = lookup(key + delta)
+            if other is None:
+                continue
+            (root_a, root_b) = (find(index), find(other))
+            if root_a == root_b:
+                continue
+            if size[root_a] < size[root_b]:
+                (root_a, root_b) = (root_b, root_a)
+            parent[root_b] = root_a
+            size[root_a] += size[root_b]
+
+    groups = dict()
+    for index, cell in enumerate(cell_list):
+        groups.setdefault(find(index), []).append(cell)
+    return [CellCluster(frozenset(group), cells_extent(group)) for group in groups.values()]
+# end def cluster_cells()
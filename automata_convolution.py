@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+neighbour counting by FFT convolution, and choosing an engine to suit the neighbourhood
+"""
+
+# pipenv shell
+
+# standard library imports
+# related third party imports
+import numpy as np
+
+# local application/library specific imports
+from automata_universe import AutomataUniverse
+from automata_engine import AutomataEngine
+from automata_tiles import TiledEngine
+from automata_box import BoxEngine, SeparableEngine, is_box_neighbourhood
+from automata_sparse import SparseSeparableEngine, neighbourhood_factors
+from automata_bitwise import BitwiseEngine
+from automata_sweep import SweepEngine
+
+# the neighbourhood population where counting with whole tile arrays beats visiting every
+# neighbour of every cell. Measured for one step of a 30% random soup, with round (not
+# factorisable) neighbourhoods: in 2D (200x200) the sweep and FFT convolution engines take
+# the same time at 44 neighbours (0.058s, 0.060s), and convolution wins from 68 (0.075s,
+# 0.058s); in 4D (12^4) convolution passes the reference engine between 8 and 32 neighbours,
+# and on a smaller 8^4 soup between 32 and 64. In 3D the sweep stays ahead to at least 80.
+DIRECT_NEIGHBOURHOOD_LIMIT = 48
+# the most cells in one dense tile: keeps high dimension tiles a sensible size
+TILE_CELLS_LIMIT = 1 << 18
+# the most cells in one dense box engine tile: 32^3 tiles step a dense 3D box neighbourhood
+# generation about 25% faster than 64^3 tiles
+BOX_TILE_CELLS_LIMIT = 1 << 15
+
+class ConvolutionEngine(TiledEngine):
+    """engine for large neighbourhoods of any shape, counting neighbours with an FFT
+
+    The neighbour count of every cell in a dense tile (see TiledEngine) is the convolution of
+    the tile with a kernel that holds 1 at each neighbourhood offset. Both are transformed
+    with a real FFT, multiplied, and transformed back, so the cost per cell grows with the log
+    of the tile size instead of with the neighbourhood population. The kernel transform is
+    the same for every tile, and is calculated once. The float results are rounded to the
+    exact integer counts before the rule lookup.
+
+    :property kernel: 1 at each neighbourhood offset, centred on the origin
+    :type kernel: read only numpy integer array, 2 · radius + 1 along each axis
+    """
+
+    def __init__(self, universe: AutomataUniverse, tile: int = 64) -> None:
+        """constructor
+
+        :param universe: cellular automata universe configuration to step cells in
+        :type universe: AutomataUniverse
+        :param tile: the size of the dense tiles along each axis
+        :type tile: int
+        :raises: TypeError, ValueError
+        """
+        super().__init__(universe, tile)
+        kernel = np.zeros(tuple(2 * reach + 1 for reach in self._radius), dtype=np.int32)
+        kernel[tuple(np.array(sorted(universe.neighbourhood)).T + np.array(
+            self._radius)[:, np.newaxis])] = 1
+        kernel.setflags(write=False)
+        self._kernel = kernel
+        # full linear convolution of a padded tile with the kernel, so nothing wraps around
+        self._shape = tuple(tile + 4 * reach for reach in self._radius)
+        self._axes = tuple(range(universe.dimensions))
+        self._kernel_spectrum = np.fft.rfftn(kernel, s=self._shape, axes=self._axes)
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def kernel(self) -> np.ndarray:
+        return self._kernel
+
+    # end of property methods
+
+    def _step_tile(self, corner: np.ndarray, points: np.ndarray) -> np.ndarray:
+        """next generation cells inside one tile
+
+        :param corner: minimum cell address of the tile
+        :type corner: numpy (dimensions,) integer array
+        :param points: living cells, including every one within the radius of the tile
+        :type points: numpy (N, dimensions) integer array
+        :returns: living cells of the tile in the next generation
+        :rtype: numpy (M, dimensions) integer array
+        """
+        grid = self._tile_grid(corner, points)
+        convolved = np.fft.irfftn(np.fft.rfftn(grid, s=self._shape, axes=self._axes) *
+            self._kernel_spectrum, s=self._shape, axes=self._axes)
+        # the neighbourhood is symmetric, so the convolution is also the neighbour count; a
+        # cell of the tile is offset by twice the radius in the full convolution
+        window = tuple(slice(2 * reach, 2 * reach + self._tile) for reach in self._radius)
+        counts = np.rint(convolved[window]).astype(np.int64)
+        return self._next_states(corner, grid, counts)
+    # end def _step_tile()
+# end class ConvolutionEngine
+
+def _tile_size(dimensions: int, cells_limit: int) -> int:
+    """the largest power of 2 tile size, from 64 down to 4, with no more than a limit of cells"""
+    tile = 64
+    while tile > 4 and tile ** dimensions > cells_limit:
+        tile //= 2
+    return tile
+
+def select_engine(universe: AutomataUniverse) -> AutomataEngine:
+    """the engine expected to step generations fastest, for a universe configuration
+
+    One dimensional universes are stepped with bit-parallel integer operations. Smaller
+    neighbourhoods in 2 and 3 dimensions, of any shape, merge sorted rows. Larger box
+    neighbourhoods in 2 and 3 dimensions use the dense box engines: separable sums when their
+    per axis sums need fewer additions than the corners of a summed-area table, and
+    summed-area tables otherwise. Other neighbourhoods that are a product of per axis offsets,
+    boxes in higher dimensions included, use the sparse per axis counting, which only touches
+    cells near living ones. The rest use the reference engine when small, and FFT convolution
+    above DIRECT_NEIGHBOURHOOD_LIMIT.
+
+    The dense box engines step generations with many living cells fastest: one step of a
+    300x300 soup, about 40% alive, takes 0.14s with summed-area tables against 0.20s with
+    sparse counting at radius 5, and 0.13s against 0.27s at radius 10. With 1% alive the two
+    take about the same time in 2 dimensions, but sparse counting is 4 to 6 times faster in
+    3 dimensions, so very sparse 3 dimensional runs are better stepped with an explicit
+    SparseSeparableEngine.
+
+    :param universe: cellular automata universe configuration
+    :type universe: AutomataUniverse
+    :returns: an engine for the universe
+    :rtype: AutomataEngine
+    :raises: TypeError
+    """
+    if not isinstance(universe, AutomataUniverse):
+        raise TypeError((type(universe), "universe is not an AutomataUniverse"))
+    dimensions = universe.dimensions
+    if dimensions == 1:
+        return BitwiseEngine(universe)
+    small = universe.neighbourhood_population < DIRECT_NEIGHBOURHOOD_LIMIT
+    if dimensions in (2, 3):
+        if small:
+            return SweepEngine(universe)
+        if is_box_neighbourhood(universe):
+            tile = _tile_size(dimensions, BOX_TILE_CELLS_LIMIT)
+            # additions per cell: the taps along each axis, against a prefix sum along each
+            # axis followed by the inclusion-exclusion corners
+            if 2 * sum(universe.geometry.radius) <= dimensions + 2 ** dimensions:
+                return SeparableEngine(universe, tile)
+            return BoxEngine(universe, tile)
+    if neighbourhood_factors(universe) is not None:
+        return SparseSeparableEngine(universe)
+    if small:
+        return AutomataEngine(universe)
+    return ConvolutionEngine(universe, _tile_size(dimensions, TILE_CELLS_LIMIT))
+# end def select_engine()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+generation stepping engines for cellular automata
+"""
+
+# pipenv shell
+
+# standard library imports
+# local application/library specific imports
+import automata_typehints as AHint
+from automata_universe import AutomataUniverse
+
+class AutomataEngine:
+    """reference engine: step generations with the universe neighbour counting
+
+    Other engines produce exactly the same generations, using different ways to get there.
+
+    :property universe: the automata universe configuration
+    :type universe: AutomataUniverse
+    """
+
+    def __init__(self, universe: AutomataUniverse) -> None:
+        """constructor
+
+        :param universe: cellular automata universe configuration to step cells in
+        :type universe: AutomataUniverse
+        :raises: TypeError
+        """
+        if not isinstance(universe, AutomataUniverse):
+            raise TypeError((type(universe), "engine universe is not an AutomataUniverse"))
+        self._universe = universe
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def universe(self) -> AutomataUniverse:
+        return self._universe
+
+    # end of property methods
+
+    def close(self) -> None:
+        """release resources held by the engine, such as a worker pool (the base has none)"""
+
+    def step(self, cells: AHint.CellGroupType) -> AHint.CellGroupWorkingType:
+        """iterate from a generation to the next
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :returns: next generation of cells
+        :rtype: set of universe cell address tuples
+        """
+        return self._universe.step(cells)
+
+    def advance(self, cells: AHint.CellGroupType, generations: int) \
+            -> AHint.CellGroupWorkingType:
+        """iterate forward a number of generations
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :param generations: the number of generations to step
+        :type generations: int
+        :returns: generation of cells after the final step
+        :rtype: set of universe cell address tuples
+        """
+        working = set(cells)
+        for _count in range(generations):
+            working = self.step(working)
+        return working
+# end class AutomataEngine
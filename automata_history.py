@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+bounded generation history and early stop conditions for cellular automata runs
+"""
+
+# pipenv shell
+
+# standard library imports
+from collections import deque, namedtuple
+from typing import Optional
+
+# local application/library specific imports
+import automata_typehints as AHint
+
+# reasons for ending a run of generations
+STOP_EXTINCT = 'extinct'
+STOP_STILL_LIFE = 'still life'
+STOP_CYCLE = 'cycle'
+STOP_POPULATION = 'population limit'
+STOP_EXTENT = 'extent limit'
+STOP_STABLE = 'stable population'
+STOP_GENERATIONS = 'generation limit'
+
+StopConditions = namedtuple('StopConditions', 'population extent stable cycle',
+    defaults=(None, None, None, True))
+StopConditions.__doc__ = """configurable conditions to end a run of generations early
+
+:field population: stop when the population exceeds this many cells
+:field extent: stop when the generation bounding box spans more than this many cells on any axis
+:field stable: stop after the population has not changed for this many generations
+:field cycle: stop when the generation exactly repeats an earlier (remembered) generation
+"""
+RunResult = namedtuple('RunResult', 'reason iteration period')
+RunResult.__doc__ = """outcome of a run of generations
+
+:field reason: one of the STOP_* reason strings
+:field iteration: generation sequence number when the run stopped
+:field period: cycle length when the generation repeated, otherwise None
+"""
+
+def generation_fingerprint(cells: AHint.CellGroupType) -> AHint.FingerprintType:
+    """compact identifier for the content of a generation
+
+    Two generations with the same population and the same (64 bit) hash are treated as
+    identical. Keeping the fingerprint instead of the generation keeps the history bounded
+    in memory regardless of the size of the generations.
+
+    :param cells: living cells
+    :type cells: «frozen»set of cell address tuples
+    :returns: population and hash of the cells
+    :rtype: tuple of 2 integers
+    """
+    if not isinstance(cells, frozenset):
+        cells = frozenset(cells)
+    return (len(cells), hash(cells))
+# end def generation_fingerprint()
+
+class AutomataHistory:
+    """bounded history of generation fingerprints
+
+    :property limit: the maximum number of generations remembered
+    :type limit: int
+    :property period: cycle length found by the most recent record, or None
+    :type period: int
+    :property stable_count: number of consecutive generations with unchanged population
+    :type stable_count: int
+    :property translation: period and displacement found by the most recent record, when the
+        generation is a translated copy of a remembered generation
+    :type translation: tuple of int and cell address tuple, or None
+    """
+
+    def __init__(self, limit: int = 64) -> None:
+        """constructor
+
+        :param limit: the maximum number of generations to remember
+        :type limit: int
+        :raises: TypeError, ValueError
+        """
+        if not isinstance(limit, int):
+            raise TypeError((type(limit), "history limit is not an integer"))
+        if limit < 1:
+            raise ValueError((limit, "history limit must be at least 1"))
+        self._limit = limit
+        self._fingerprints = deque()
+        self._seen = dict()
+        self._shapes = dict()
+        self._period = None
+        self._translation = None
+        self._stable_count = 0
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def period(self) -> Optional[int]:
+        return self._period
+
+    @property
+    def stable_count(self) -> int:
+        return self._stable_count
+
+    @property
+    def translation(self) -> Optional[AHint.TranslationPeriodType]:
+        return self._translation
+
+    # end of property methods
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def clear(self) -> None:
+        """forget all remembered generations"""
+        self._fingerprints.clear()
+        self._seen.clear()
+        self._shapes.clear()
+        self._period = None
+        self._translation = None
+        self._stable_count = 0
+
+    def record(self, iteration: int, cells: AHint.CellGroupType,
+            shape: Optional[tuple[AHint.CellGroupType, AHint.CellAddressType]] = None) \
+            -> Optional[int]:
+        """remember a generation, and check if it repeats a remembered generation
+
+        When the translation normalized shape of the generation is supplied, also check if
+        the generation is a translated copy of a remembered generation.
+
+        :param iteration: generation sequence number for the cells
+        :type iteration: int
+        :param cells: living cells
+        :type cells: «frozen»set of cell address tuples
+        :param shape: cells shifted against all axes, and the minimum corner of the cells
+        :type shape: tuple containing set of cell address tuples and a cell address tuple
+        :returns: cycle length when the generation matches a remembered generation
+        :rtype: int or None
+        """
+        fingerprint = generation_fingerprint(cells)
+        if self._fingerprints and self._fingerprints[-1][1][0] == fingerprint[0]:
+            self._stable_count += 1
+        else:
+            self._stable_count = 0
+        previous = self._seen.get(fingerprint)
+        self._period = None if previous is None else iteration - previous
+        shape_fingerprint = None
+        self._translation = None
+        if shape is not None:
+            (normalized, corner) = shape
+            shape_fingerprint = generation_fingerprint(normalized)
+            previous = self._shapes.get(shape_fingerprint)
+            if previous is not None:
+                self._translation = (iteration - previous[0],
+                    tuple(now - then for now, then in zip(corner, previous[1])))
+        if len(self._fingerprints) == self._limit:
+            (old_iteration, old_fingerprint, old_shape) = self._fingerprints.popleft()
+            if self._seen.get(old_fingerprint) == old_iteration:
+                del self._seen[old_fingerprint]
+            if old_shape is not None and self._shapes[old_shape][0] == old_iteration:
+                del self._shapes[old_shape]
+        self._fingerprints.append((iteration, fingerprint, shape_fingerprint))
+        self._seen[fingerprint] = iteration
+        if shape_fingerprint is not None:
+            self._shapes[shape_fingerprint] = (iteration, shape[1])
+        return self._period
+    # end def record()
+
+    def check(self, conditions: StopConditions, cells: AHint.CellGroupType,
+            extent: AHint.BoundingBoxType) -> Optional[str]:
+        """check the most recently recorded generation against stop conditions
+
+        :param conditions: the stop conditions to check
+        :type conditions: StopConditions
+        :param cells: the most recently recorded living cells
+        :type cells: «frozen»set of cell address tuples
+        :param extent: bounding box for cells
+        :type extent: tuple of 2 cell address tuples
+        :returns: reason to stop, or None to continue
+        :rtype: str or None
+        """
+        if len(cells) == 0:
+            return STOP_EXTINCT
+        if conditions.cycle and self._period is not None:
+            return STOP_STILL_LIFE if self._period == 1 else STOP_CYCLE
+        if conditions.population is not None and len(cells) > conditions.population:
+            return STOP_POPULATION
+        if conditions.extent is not None and max(high - low + 1
+                for low, high in zip(*extent)) > conditions.extent:
+            return STOP_EXTENT
+        if conditions.stable is not None and self._stable_count >= conditions.stable:
+            return STOP_STABLE
+        return None
+    # end def check()
+# end class AutomataHistory
@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+step separated clusters (islands) of a generation independently, using a worker pool
+"""
+
+# pipenv shell
+
+# standard library imports
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
+# local application/library specific imports
+import automata_typehints as AHint
+from automata_universe import AutomataUniverse
+from automata_engine import AutomataEngine
+from automata_clusters import cluster_cells, normalize_cells
+from automata_object_cache import ObjectEvolutionCache
+
+def _step_islands(universe: AutomataUniverse, islands: list[AHint.CellGroupSnapshotType],
+        generations: int) -> list[AHint.CellGroupWorkingType]:
+    """step each island on its own for a number of generations
+
+    Module level function, so that it can be sent to worker processes.
+
+    :param universe: cellular automata universe configuration
+    :type universe: AutomataUniverse
+    :param islands: groups of cells that do not interact with each other
+    :type islands: list of frozensets of cell address tuples
+    :param generations: the number of generations to step
+    :type generations: int
+    :returns: each island after the final step
+    :rtype: list of sets of cell address tuples
+    """
+    results = []
+    for cells in islands:
+        working = cells
+        for _count in range(generations):
+            if not working:
+                break
+            working = universe.step(working)
+        results.append(working)
+    return results
+# end def _step_islands()
+
+# the universe of the pool a worker process belongs to, set once when the worker starts
+_WORKER_UNIVERSE = None
+
+def _set_worker_universe(universe: AutomataUniverse) -> None:
+    """worker process initializer: keep the universe, instead of receiving it with every batch"""
+    global _WORKER_UNIVERSE # pylint: disable=W0603
+    _WORKER_UNIVERSE = universe
+
+def _step_worker_islands(islands: list[AHint.CellGroupSnapshotType], generations: int) \
+        -> list[AHint.CellGroupWorkingType]:
+    """step islands in the universe of an engine owned worker pool"""
+    return _step_islands(_WORKER_UNIVERSE, islands, generations)
+
+class IslandEngine(AutomataEngine):
+    """step clusters of cells that can not interact independently in a worker pool
+
+    A generation is split into clusters that are far enough apart to not affect each other
+    for the next `lookahead` generations. Each cluster is stepped on its own for those
+    generations, then the generation is split again, so clusters that have grown (or moved)
+    close together are regrouped.
+
+    Clusters are found by checking every separation offset of each cell: (4 · lookahead +
+    1)^dimensions - 1 of them for a Moore neighbourhood, so a longer lookahead only pays off
+    in low dimensions. step always looks one generation ahead; advance uses the lookahead.
+
+    The worker pool is created on first use and kept for every later call, until close. Its
+    workers receive the universe once, when they start.
+
+    :property lookahead: the number of generations clusters are stepped between regrouping
+    :type lookahead: int
+    :property workers: the maximum number of worker processes
+    :type workers: int
+    :property cache: evolution cache for isolated objects, or None
+    :type cache: ObjectEvolutionCache
+    """
+
+    def __init__(self, universe: AutomataUniverse, lookahead: int = 1,
+            workers: Optional[int] = None, executor: Optional[Executor] = None,
+            cache: Optional[ObjectEvolutionCache] = None) -> None:
+        """constructor
+
+        :param universe: cellular automata universe configuration to step cells in
+        :type universe: AutomataUniverse
+        :param lookahead: the number of generations to step clusters between regrouping
+        :type lookahead: int
+        :param workers: the maximum number of worker processes, default one per cpu
+        :type workers: int
+        :param executor: externally managed worker pool to use instead of a process pool
+        :type executor: concurrent.futures.Executor
+        :param cache: evolution cache used to skip stepping objects seen before
+        :type cache: ObjectEvolutionCache
+        :raises: TypeError, ValueError
+        """
+        super().__init__(universe)
+        if not isinstance(lookahead, int):
+            raise TypeError((type(lookahead), "island lookahead is not an integer"))
+        if lookahead < 1:
+            raise ValueError((lookahead, "island lookahead must be at least 1"))
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if not isinstance(workers, int):
+            raise TypeError((type(workers), "number of workers is not an integer"))
+        if workers < 1:
+            raise ValueError((workers, "number of workers must be at least 1"))
+        if cache is not None and cache.universe != universe:
+            raise ValueError("cache universe does not match the engine universe")
+        self._cache = cache
+        self._lookahead = lookahead
+        self._workers = workers
+        self._executor = executor
+        self._own_executor = False
+        self._separations = dict()
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def lookahead(self) -> int:
+        return self._lookahead
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    @property
+    def cache(self) -> Optional[ObjectEvolutionCache]:
+        return self._cache
+
+    # end of property methods
+
+    def __enter__(self) -> 'IslandEngine':
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """shut down the worker pool, when the engine created it"""
+        if self._own_executor:
+            self._executor.shutdown()
+            self._executor = None
+            self._own_executor = False
+
+    def _separation(self, generations: int) -> AHint.NeighbourhoodType:
+        """relative addresses of cells that could interact within a number of generations
+
+        The state of a cell after g generations depends only on the cells within g
+        neighbourhood steps. Two cells can only affect a common cell in that time when they
+        are within 2·g neighbourhood steps of each other.
+
+        :param generations: the number of generations
+        :type generations: int
+        :returns: offsets reachable with 2·generations neighbourhood steps, except the origin
+        :rtype: frozenset of cell address tuples
+        """
+        if generations not in self._separations:
+            origin = tuple([0] * self._universe.dimensions)
+            steps = self._universe.neighbourhood | {origin}
+            reach = {origin}
+            for _count in range(2 * generations):
+                reach = {tuple(base + delta for base, delta in zip(cell, step))
+                    for cell in reach for step in steps}
+            reach.discard(origin)
+            self._separations[generations] = frozenset(reach)
+        return self._separations[generations]
+    # end def _separation()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers,
+                initializer=_set_worker_universe, initargs=(self._universe,))
+            self._own_executor = True
+        return self._executor
+
+    def _step_independent(self, cells: AHint.CellGroupType, generations: int) \
+            -> AHint.CellGroupWorkingType:
+        """step non-interacting clusters for a number of generations
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :param generations: the number of generations (no more than lookahead)
+        :type generations: int
+        :returns: generation of cells after the final step
+        :rtype: set of universe cell address tuples
+        """
+        islands = [cluster.cells for cluster in
+            cluster_cells(cells, self._separation(generations))]
+        if self._cache is None:
+            return set().union(*self._run_islands(islands, generations))
+        return self._step_cached(islands, generations)
+    # end def _step_independent()
+
+    def _step_cached(self, islands: list[AHint.CellGroupSnapshotType], generations: int) \
+            -> AHint.CellGroupWorkingType:
+        """step islands, only computing objects that are not in the evolution cache
+
+        Identical (translated) objects in the same generation are computed once.
+
+        :param islands: groups of cells that do not interact with each other
+        :type islands: list of frozensets of cell address tuples
+        :param generations: the number of generations to step
+        :type generations: int
+        :returns: generation of cells after the final step
+        :rtype: set of universe cell address tuples
+        """
+        placed = [normalize_cells(island) for island in islands]
+        futures = dict()
+        for (shape, _extent) in placed:
+            if shape not in futures:
+                futures[shape] = self._cache.lookup(shape, generations)
+        missing = [shape for shape, result in futures.items() if result is None]
+        for shape, result in zip(missing, self._run_islands(missing, generations)):
+            futures[shape] = frozenset(result)
+            self._cache.store(shape, generations, result)
+        next_generation = set()
+        for (shape, extent) in placed:
+            corner = extent[0]
+            next_generation.update(tuple(coord + base for coord, base in zip(cell, corner))
+                for cell in futures[shape])
+        return next_generation
+    # end def _step_cached()
+
+    def _run_islands(self, islands: list[AHint.CellGroupSnapshotType], generations: int) \
+            -> list[AHint.CellGroupWorkingType]:
+        """step islands, in the worker pool when there is more than one worker
+
+        :param islands: groups of cells that do not interact with each other
+        :type islands: list of frozensets of cell address tuples
+        :param generations: the number of generations to step
+        :type generations: int
+        :returns: each island after the final step, in the same order
+        :rtype: list of sets of cell address tuples
+        """
+        if self._workers == 1 or len(islands) < 2:
+            return _step_islands(self._universe, islands, generations)
+        # a few batches per worker, balanced by population, to limit transfer overhead
+        batch_count = min(len(islands), 4 * self._workers)
+        batches = [[] for _batch in range(batch_count)]
+        positions = [[] for _batch in range(batch_count)]
+        loads = [0] * batch_count
+        for index in sorted(range(len(islands)), key=lambda i: len(islands[i]), reverse=True):
+            lightest = loads.index(min(loads))
+            batches[lightest].append(islands[index])
+            positions[lightest].append(index)
+            loads[lightest] += len(islands[index])
+        executor = self._get_executor()
+        if self._own_executor:
+            futures = [executor.submit(_step_worker_islands, batch, generations)
+                for batch in batches]
+        else:
+            futures = [executor.submit(_step_islands, self._universe, batch, generations)
+                for batch in batches]
+        results = [None] * len(islands)
+        for future, batch_positions in zip(futures, positions):
+            for index, cells in zip(batch_positions, future.result()):
+                results[index] = cells
+        return results
+    # end def _run_islands()
+
+    def step(self, cells: AHint.CellGroupType) -> AHint.CellGroupWorkingType:
+        """iterate from a generation to the next
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :returns: next generation of cells
+        :rtype: set of universe cell address tuples
+        """
+        self._universe._check_cell_group(cells) # pylint: disable=W0212
+        return self._step_independent(cells, 1)
+
+    def advance(self, cells: AHint.CellGroupType, generations: int) \
+            -> AHint.CellGroupWorkingType:
+        """iterate forward a number of generations, regrouping every lookahead generations
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :param generations: the number of generations to step
+        :type generations: int
+        :returns: generation of cells after the final step
+        :rtype: set of universe cell address tuples
+        """
+        self._universe._check_cell_group(cells) # pylint: disable=W0212
+        working = set(cells)
+        remaining = generations
+        while remaining > 0 and working:
+            block = min(remaining, self._lookahead)
+            working = self._step_independent(working, block)
+            remaining -= block
+        return working
+    # end def advance()
+# end class IslandEngine
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+memoised evolution of isolated cellular automata objects
+"""
+
+# pipenv shell
+
+# standard library imports
+from collections import OrderedDict, namedtuple
+from typing import Optional
+
+# local application/library specific imports
+import automata_typehints as AHint
+from automata_universe import AutomataUniverse
+from automata_clusters import normalize_cells
+
+CacheStatistics = namedtuple('CacheStatistics', 'hits misses evictions size capacity')
+CacheStatistics.__doc__ = """usage counts for an object evolution cache
+
+:field hits: lookups answered from the cache
+:field misses: lookups that were not in the cache
+:field evictions: least recently used entries dropped to stay within capacity
+:field size: the current number of entries
+:field capacity: the maximum number of entries
+"""
+
+class ObjectEvolutionCache:
+    """least recently used cache of the future of translation normalized objects
+
+    Entries map (normalized cells, generations) to the normalized cells after that many
+    generations of the object on its own. The result is only valid for the whole universe
+    when nothing else is close enough to the object to interact with it.
+
+    :property universe: the automata universe configuration the entries belong to
+    :type universe: AutomataUniverse
+    :property capacity: the maximum number of entries
+    :type capacity: int
+    """
+
+    def __init__(self, universe: AutomataUniverse, capacity: int = 4096) -> None:
+        """constructor
+
+        :param universe: cellular automata universe configuration
+        :type universe: AutomataUniverse
+        :param capacity: the maximum number of entries to keep
+        :type capacity: int
+        :raises: TypeError, ValueError
+        """
+        if not isinstance(capacity, int):
+            raise TypeError((type(capacity), "cache capacity is not an integer"))
+        if capacity < 1:
+            raise ValueError((capacity, "cache capacity must be at least 1"))
+        self._universe = universe
+        self._capacity = capacity
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def universe(self) -> AutomataUniverse:
+        return self._universe
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    # end of property methods
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def statistics(self) -> CacheStatistics:
+        """current usage counts for the cache"""
+        return CacheStatistics(self._hits, self._misses, self._evictions, len(self._entries),
+            self._capacity)
+
+    def clear(self) -> None:
+        """drop all entries and reset the usage counts"""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def lookup(self, shape: AHint.CellGroupSnapshotType, generations: int = 1) \
+            -> Optional[AHint.CellGroupSnapshotType]:
+        """future of a normalized object, when it is in the cache
+
+        :param shape: translation normalized cells
+        :type shape: frozenset of cell address tuples
+        :param generations: the number of generations stepped
+        :type generations: int
+        :returns: normalized cells after the generations, or None when not cached
+        :rtype: frozenset of cell address tuples
+        """
+        key = (shape, generations)
+        result = self._entries.get(key)
+        if result is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return result
+    # end def lookup()
+
+    def store(self, shape: AHint.CellGroupSnapshotType, generations: int,
+            result: AHint.CellGroupType) -> None:
+        """add the future of a normalized object to the cache
+
+        :param shape: translation normalized cells
+        :type shape: frozenset of cell address tuples
+        :param generations: the number of generations stepped
+        :type generations: int
+        :param result: cells after the generations, in the normalized coordinates of shape
+        :type result: «frozen»set of cell address tuples
+        """
+        key = (shape, generations)
+        self._entries[key] = frozenset(result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+    # end def store()
+
+    def advance(self, cells: AHint.CellGroupType, generations: int = 1) \
+            -> AHint.CellGroupWorkingType:
+        """future of an isolated object, computed only when not already cached
+
+        :param cells: universe cell addresses of the object
+        :type cells: «frozen»set of cell address tuples
+        :param generations: the number of generations to step
+        :type generations: int
+        :returns: object cells after the generations
+        :rtype: set of cell address tuples
+        """
+        if not cells:
+            return set()
+        (shape, extent) = normalize_cells(cells)
+        result = self.lookup(shape, generations)
+        if result is None:
+            working = shape
+            for _count in range(generations):
+                if not working:
+                    break
+                working = self._universe.step(working)
+            result = frozenset(working)
+            self.store(shape, generations, result)
+        return set(tuple(coord + base for coord, base in zip(cell, extent[0]))
+            for cell in result)
+    # end def advance()
+# end class ObjectEvolutionCache
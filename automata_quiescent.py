@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+step only the parts of a generation that can change, skipping frozen regions
+"""
+
+# pipenv shell
+
+# standard library imports
+from typing import Optional
+
+# local application/library specific imports
+import automata_typehints as AHint
+from automata_universe import AutomataUniverse
+from automata_engine import AutomataEngine
+
+class QuiescentEngine(AutomataEngine):
+    """engine that evaluates only the neighbourhood of the latest births and deaths
+
+    The next state of a cell depends only on its neighbourhood. When nothing changed in that
+    neighbourhood (or the cell itself) during the previous step, the cell keeps its state.
+    After a step, the engine remembers the result and every cell address that a birth or death
+    can influence. When the following step starts from that same generation, only those
+    addresses are evaluated; everything else is frozen until a change reaches its border.
+
+    Any other generation is evaluated in full, so the engine gives the same generations as the
+    reference engine whatever sequence of generations it is handed.
+
+    :property active: cell addresses to evaluate when stepping from the previous result
+    :type active: frozenset of cell address tuples, or None before the first step
+    :property evaluated: the number of cell addresses evaluated by the last step
+    :type evaluated: int
+    :property quiet_generations: consecutive steps since a full evaluation
+    :type quiet_generations: int
+    """
+
+    def __init__(self, universe: AutomataUniverse) -> None:
+        """constructor
+
+        :param universe: cellular automata universe configuration to step cells in
+        :type universe: AutomataUniverse
+        :raises: TypeError
+        """
+        super().__init__(universe)
+        origin = tuple([0] * universe.dimensions)
+        # addresses whose neighbourhood contains the origin, and the origin itself
+        self._influence = frozenset(tuple(-coord for coord in offset)
+            for offset in universe.neighbourhood) | {origin}
+        self._previous = None
+        self._active = None
+        self._evaluated = 0
+        self._quiet = 0
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def active(self) -> Optional[AHint.CellGroupSnapshotType]:
+        return self._active
+
+    @property
+    def evaluated(self) -> int:
+        return self._evaluated
+
+    @property
+    def quiet_generations(self) -> int:
+        return self._quiet
+
+    # end of property methods
+
+    def reset(self) -> None:
+        """forget the previous result, so the next step evaluates the whole generation"""
+        self._previous = None
+        self._active = None
+        self._quiet = 0
+
+    def _influenced(self, cells: AHint.CellGroupType) -> AHint.CellGroupSnapshotType:
+        """cell addresses whose next state can depend on any of the cells"""
+        return frozenset(tuple(base + delta for base, delta in zip(cell, offset))
+            for cell in cells for offset in self._influence)
+
+    def step(self, cells: AHint.CellGroupType) -> AHint.CellGroupWorkingType:
+        """iterate from a generation to the next
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :returns: next generation of cells
+        :rtype: set of universe cell address tuples
+        """
+        if self._previous is not None and cells == self._previous:
+            candidates = self._active
+            self._quiet += 1
+        else:
+            candidates = self._influenced(cells)
+            self._quiet = 0
+        (births, deaths) = self._universe.step_changes(cells, candidates)
+        self._evaluated = len(candidates)
+        next_generation = set(cells)
+        next_generation.difference_update(deaths)
+        next_generation.update(births)
+        self._active = self._influenced(births | deaths)
+        self._previous = frozenset(next_generation)
+        return next_generation
+    # end def step()
+# end class QuiescentEngine
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+find the occurrences of a pattern, in any orientation, inside a generation
+"""
+
+# pipenv shell
+
+# standard library imports
+from collections import namedtuple
+
+# related third party imports
+import numpy as np
+
+# local application/library specific imports
+import automata_typehints as AHint
+from automata_transforms import AutomataTransforms
+from automata_clusters import CellPacking, normalize_cells
+
+PatternMatch = namedtuple('PatternMatch', 'offset transform cells')
+PatternMatch.__doc__ = """single occurrence of a pattern
+
+:field offset: translation from the normalized transformed pattern to the occurrence
+:field transform: group index of the transform applied to the pattern
+:field cells: universe cell addresses of the occurrence
+"""
+
+def _member(keys: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """which query keys are in a sorted key array"""
+    found = np.searchsorted(keys, queries)
+    found[found == len(keys)] = 0
+    return keys[found] == queries
+
+class PatternFinder:
+    """locate every translated, rotated or reflected copy of a pattern in a generation
+
+    Each distinct orientation of the pattern is anchored on its first cell (in address
+    order). Every living cell is a candidate position for the anchor; the candidates are
+    then filtered against one pattern cell at a time, using packed integer cell keys, so a
+    candidate costs at most one lookup per pattern cell and most drop out after the first.
+
+    :property pattern: the normalized pattern cells
+    :type pattern: frozenset of cell address tuples
+    :property orientations: the number of distinct transformed copies of the pattern
+    :type orientations: int
+    :property isolated: only match copies with no living cell next to them
+    :type isolated: bool
+    """
+
+    def __init__(self, transforms: AutomataTransforms, pattern: AHint.CellGroupType,
+            isolated: bool = False) -> None:
+        """constructor
+
+        :param transforms: transform group, and the universe, for the search
+        :type transforms: AutomataTransforms
+        :param pattern: the cells to look for
+        :type pattern: «frozen»set of cell address tuples
+        :param isolated: require that no neighbour of the copy, outside it, is alive
+        :type isolated: bool
+        :raises: TypeError, ValueError
+        """
+        if not isinstance(transforms, AutomataTransforms):
+            raise TypeError((type(transforms), "transforms is not an AutomataTransforms"))
+        universe = transforms._universe # pylint: disable=W0212
+        universe._check_cell_group(pattern) # pylint: disable=W0212
+        if not pattern:
+            raise ValueError("can not search for an empty pattern")
+        self._universe = universe
+        self._isolated = isolated
+        (self._pattern, _extent) = normalize_cells(pattern)
+        orientations = dict()
+        for index, matrix in enumerate(transforms.group_transforms()):
+            (image, _extent) = normalize_cells(universe.cell_group_transform(
+                self._pattern, matrix))
+            orientations.setdefault(image, index)
+        self._orientations = []
+        reach = 0
+        for image, index in orientations.items():
+            cells = sorted(image)
+            anchor = cells[0]
+            offsets = [tuple(coord - base for coord, base in zip(cell, anchor))
+                for cell in cells[1:]]
+            border = []
+            if isolated:
+                border = [tuple(coord - base for coord, base in zip(cell, anchor))
+                    for cell in frozenset().union(*(universe.neighbours(cell)
+                        for cell in image)) - image]
+            reach = max([reach] + [abs(coord) for offset in offsets + border
+                for coord in offset])
+            self._orientations.append((index, anchor, offsets, border))
+        self._reach = reach
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def pattern(self) -> AHint.CellGroupSnapshotType:
+        return self._pattern
+
+    @property
+    def orientations(self) -> int:
+        return len(self._orientations)
+
+    @property
+    def isolated(self) -> bool:
+        return self._isolated
+
+    # end of property methods
+
+    def find(self, cells: AHint.CellGroupType) -> list[PatternMatch]:
+        """every occurrence of the pattern in a generation
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :returns: occurrences, ordered by offset then transform
+        :rtype: list of PatternMatch
+        :raises: TypeError
+        """
+        points = self._universe.cell_array(cells)
+        if len(points) == 0:
+            return []
+        packing = CellPacking((tuple(points.min(axis=0).tolist()),
+            tuple(points.max(axis=0).tolist())), self._reach)
+        keys = np.sort(packing.pack_array(points))
+        matches = []
+        for (index, anchor, offsets, border) in self._orientations:
+            candidates = keys
+            for offset in offsets:
+                candidates = candidates[_member(keys, candidates + packing.pack_offset(offset))]
+            for offset in border:
+                candidates = candidates[~_member(keys, candidates + packing.pack_offset(offset))]
+            for key in candidates.tolist():
+                position = packing.unpack(key)
+                matches.append(PatternMatch(
+                    tuple(coord - base for coord, base in zip(position, anchor)), index,
+                    frozenset([position] + [tuple(coord + delta for coord, delta
+                        in zip(position, offset)) for offset in offsets])))
+        matches.sort(key=lambda match: (match.offset, match.transform))
+        return matches
+    # end def find()
+# end class PatternFinder
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+sparse neighbour counting for product neighbourhoods, one axis at a time
+"""
+
+# pipenv shell
+
+# standard library imports
+import math
+from typing import Optional
+
+# related third party imports
+import numpy as np
+
+# local application/library specific imports
+import automata_typehints as AHint
+from automata_universe import AutomataUniverse, array_cells
+from automata_engine import AutomataEngine
+from automata_clusters import CellPacking
+
+def neighbourhood_factors(universe: AutomataUniverse) \
+        -> Optional[tuple[tuple[tuple[int, ...], ...], bool]]:
+    """split a neighbourhood into the per axis offsets it is the cartesian product of
+
+    Moore neighbourhoods, and boxes of any range, are the product of one interval per axis
+    with the origin taken out. A neighbourhood that is a product by itself, such as the four
+    diagonal neighbours in 2 dimensions, also factors.
+
+    :param universe: cellular automata universe configuration
+    :type universe: AutomataUniverse
+    :returns: None when the neighbourhood does not factor. Otherwise the sorted offsets along
+        each axis, and whether the origin has to be taken out of the product
+    :rtype: tuple of (tuple of integer tuples), bool
+    """
+    neighbourhood = universe.neighbourhood
+    population = universe.neighbourhood_population
+    axes = tuple(tuple(sorted(set(coords))) for coords in zip(*neighbourhood))
+    # every neighbour is in the product, so a matching size means the product is complete
+    if math.prod(map(len, axes)) == population:
+        return (axes, False)
+    with_origin = tuple(tuple(sorted(set(coords) | {0})) for coords in axes)
+    if math.prod(map(len, with_origin)) == population + 1:
+        return (with_origin, True)
+    return None
+# end def neighbourhood_factors()
+
+class SparseSeparableEngine(AutomataEngine):
+    """engine for sparse generations in product neighbourhoods, in any number of dimensions
+
+    Scattering a count to every neighbour of each living cell costs the neighbourhood
+    population, 3^dimensions - 1 for Moore, per cell. When the neighbourhood is a product of
+    per axis offsets (see neighbourhood_factors), the counts are instead built in one pass
+    per axis: every (packed cell key, partial count) entry is spread to its offsets along
+    that axis, and entries with the same key are summed. Only cells near living cells ever
+    get an entry, so nothing is spent on empty space. For a Moore neighbourhood a pass
+    triples the entries at most, and the work grows with 3 · dimensions instead of
+    3^dimensions.
+
+    Neighbourhoods that do not factor, and generations too spread out for 64 bit keys, are
+    stepped with the reference neighbour counting.
+
+    :property factors: the offsets along each axis, or None when the neighbourhood does not
+        factor
+    :type factors: tuple of integer tuples
+    """
+
+    def __init__(self, universe: AutomataUniverse) -> None:
+        """constructor
+
+        :param universe: cellular automata universe configuration to step cells in
+        :type universe: AutomataUniverse
+        :raises: TypeError
+        """
+        super().__init__(universe)
+        factored = neighbourhood_factors(universe)
+        (self._factors, self._with_origin) = (None, False) if factored is None else factored
+        self._reach = max(abs(coord) for offset in universe.neighbourhood for coord in offset)
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def factors(self) -> Optional[tuple[tuple[int, ...], ...]]:
+        return self._factors
+
+    # end of property methods
+
+    def step(self, cells: AHint.CellGroupType) -> AHint.CellGroupWorkingType:
+        """iterate from a generation to the next
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :returns: next generation of cells
+        :rtype: set of universe cell address tuples
+        """
+        if self._factors is None or not cells:
+            return super().step(cells)
+        points = self._universe.cell_array(cells)
+        packing = CellPacking.for_arrays((tuple(points.min(axis=0).tolist()),
+            tuple(points.max(axis=0).tolist())), self._reach)
+        if packing is None:
+            return super().step(cells)
+        living = np.sort(packing.pack_array(points))
+        (keys, counts) = (living, np.ones(len(living), dtype=np.int64))
+        for axis_offsets, stride in zip(self._factors, packing.strides):
+            spread = (keys[:, np.newaxis] + np.array(axis_offsets, dtype=np.int64)
+                * stride).ravel()
+            (keys, inverse) = np.unique(spread, return_inverse=True)
+            counts = np.bincount(inverse.ravel(), weights=np.repeat(counts,
+                len(axis_offsets)), minlength=len(keys)).astype(np.int64)
+        if not self._with_origin:
+            # a living cell with no living neighbours may have no entry yet
+            (keys, inverse) = np.unique(np.concatenate((keys, living)), return_inverse=True)
+            counts = np.bincount(inverse.ravel(), weights=np.concatenate((counts,
+                np.zeros(len(living), dtype=np.int64))), minlength=len(keys)).astype(np.int64)
+        alive = np.isin(keys, living, assume_unique=True)
+        if self._with_origin:
+            counts -= alive
+        born = keys[self._universe.geometry.rules[alive.astype(np.int64), counts]]
+        return array_cells(packing.unpack_array(born))
+    # end def step()
+# end class SparseSeparableEngine
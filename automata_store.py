@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+opt-in on-disk cache of universe geometry and completed transform groups
+"""
+
+# pipenv shell
+
+# standard library imports
+import json
+import os
+from hashlib import blake2b
+from typing import Optional
+
+# related third party imports
+import numpy as np
+
+# local application/library specific imports
+from automata_universe import AutomataUniverse
+from automata_transforms import AutomataTransforms
+
+# the name used for the full universe symmetry group, instead of a generators digest
+SYMMETRY_GROUP = 'symmetry'
+
+class AutomataStore:
+    """directory of precomputed universe data, shared between processes and jobs
+
+    Each universe configuration gets a subdirectory, named by a digest of its sorted
+    neighbourhood offsets and rule table. It holds a small json header with the format
+    version, and plain .npy arrays: the offsets, the rule table, the neighbourhood symmetry
+    group, and the elements and Cayley table of each completed transform group. Arrays are
+    opened memory mapped, so a warm start reads only the pages that are used.
+
+    Entries are checked against the universe before use: a different format version, or
+    offsets and rules that do not match, count as a miss and are rewritten. Files are written
+    to a temporary name first, then renamed, so concurrent workers never read partial files.
+
+    :property directory: the root directory of the store
+    :type directory: str
+    :property hits: entries read from disk
+    :type hits: int
+    :property misses: entries that had to be calculated and written
+    :type misses: int
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, directory: str) -> None:
+        """constructor
+
+        :param directory: root directory for the stored files, created when missing
+        :type directory: str
+        :raises: TypeError
+        """
+        if not isinstance(directory, (str, os.PathLike)):
+            raise TypeError((type(directory), "store directory is not a path"))
+        self._directory = os.fspath(directory)
+        os.makedirs(self._directory, exist_ok=True)
+        self._hits = 0
+        self._misses = 0
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    # end of property methods
+
+    @staticmethod
+    def universe_key(universe: AutomataUniverse) -> str:
+        """stable name for a universe configuration, the same in every process
+
+        The built in hash of a universe is only 64 bits. The digest of the geometry arrays is
+        used instead, so different configurations never share an entry.
+
+        :param universe: cellular automata universe configuration
+        :type universe: AutomataUniverse
+        :returns: hex digest
+        :rtype: str
+        """
+        geometry = universe.geometry
+        digest = blake2b(digest_size=16)
+        digest.update(np.ascontiguousarray(geometry.offsets, dtype='<i8').tobytes())
+        digest.update(np.ascontiguousarray(geometry.rules, dtype='u1').tobytes())
+        return digest.hexdigest()
+
+    def _path(self, universe: AutomataUniverse, name: str) -> str:
+        return os.path.join(self._directory, self.universe_key(universe), name)
+
+    def _save_array(self, path: str, array: np.ndarray) -> None:
+        """write an array under a temporary name, then rename it into place"""
+        temporary = '{}.{}.tmp'.format(path, os.getpid())
+        with open(temporary, 'wb') as array_file:
+            np.save(array_file, np.ascontiguousarray(array))
+        os.replace(temporary, path)
+
+    @staticmethod
+    def _load_array(path: str) -> Optional[np.ndarray]:
+        try:
+            return np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+
+    def _entry_valid(self, universe: AutomataUniverse) -> bool:
+        """check the stored header and geometry against a universe
+
+        :param universe: cellular automata universe configuration
+        :type universe: AutomataUniverse
+        :returns: the universe subdirectory holds data for exactly this configuration
+        :rtype: bool
+        """
+        try:
+            with open(self._path(universe, 'universe.json'), 'r', encoding='utf-8') \
+                    as header_file:
+                header = json.load(header_file)
+        except (OSError, ValueError):
+            return False
+        if header.get('version') != self.FORMAT_VERSION:
+            return False
+        geometry = universe.geometry
+        offsets = self._load_array(self._path(universe, 'offsets.npy'))
+        rules = self._load_array(self._path(universe, 'rules.npy'))
+        return offsets is not None and rules is not None and \
+            np.array_equal(offsets, geometry.offsets) and np.array_equal(rules, geometry.rules)
+    # end def _entry_valid()
+
+    def _write_entry(self, universe: AutomataUniverse) -> None:
+        """start a fresh subdirectory for a universe, replacing any stale data"""
+        folder = os.path.join(self._directory, self.universe_key(universe))
+        os.makedirs(folder, exist_ok=True)
+        for name in os.listdir(folder):
+            if name.endswith('.npy'):
+                os.remove(os.path.join(folder, name))
+        geometry = universe.geometry
+        self._save_array(os.path.join(folder, 'offsets.npy'), geometry.offsets)
+        self._save_array(os.path.join(folder, 'rules.npy'), geometry.rules)
+        header = os.path.join(folder, 'universe.json')
+        temporary = '{}.{}.tmp'.format(header, os.getpid())
+        with open(temporary, 'w', encoding='utf-8') as header_file:
+            json.dump({'version': self.FORMAT_VERSION, 'dimensions': universe.dimensions,
+                'neighbourhood_population': universe.neighbourhood_population}, header_file)
+        os.replace(temporary, header)
+    # end def _write_entry()
+
+    @staticmethod
+    def _group_valid(universe: AutomataUniverse, matrices: np.ndarray) -> bool:
+        """check that loaded matrices can be a transform group of a universe
+
+        The first matrix must be the identity, and every matrix must map the neighbourhood
+        onto itself. This catches truncated or damaged files, and files copied in from
+        another configuration, before they are used.
+
+        :param universe: cellular automata universe configuration
+        :type universe: AutomataUniverse
+        :param matrices: transform matrices, read from the store
+        :type matrices: numpy (order, dimensions, dimensions) integer array
+        :returns: the matrices pass the checks
+        :rtype: bool
+        """
+        dimensions = universe.dimensions
+        if matrices.ndim != 3 or matrices.shape[1:] != (dimensions, dimensions) or \
+                len(matrices) == 0:
+            return False
+        if not np.array_equal(matrices[0], np.identity(dimensions, dtype=np.int64)):
+            return False
+        offsets = universe.geometry.offsets
+        expected = offsets[np.lexsort(offsets.T[::-1])]
+        # each matrix transforms cell address column vectors
+        for images in np.asarray(matrices) @ offsets.T:
+            if not np.array_equal(images.T[np.lexsort(images[::-1])], expected):
+                return False
+        return True
+    # end def _group_valid()
+
+    def load_symmetry_group(self, universe: AutomataUniverse) -> bool:
+        """give a universe its stored neighbourhood symmetry group, when there is one
+
+        :param universe: cellular automata universe configuration
+        :type universe: AutomataUniverse
+        :returns: the universe has its symmetry group without a search: it was already found
+            in this process, or read from the store
+        :rtype: bool
+        :raises: TypeError
+        """
+        if not isinstance(universe, AutomataUniverse):
+            raise TypeError((type(universe), "universe is not an AutomataUniverse"))
+        geometry = universe.geometry
+        if geometry._symmetry_group is not None: # pylint: disable=W0212
+            return True
+        if not self._entry_valid(universe):
+            return False
+        matrices = self._load_array(self._path(universe, 'symmetry.npy'))
+        if matrices is None or not self._group_valid(universe, matrices):
+            return False
+        geometry._symmetry_group = tuple(tuple(tuple(row) for row in matrix) # pylint: disable=W0212
+            for matrix in matrices.tolist())
+        return True
+    # end def load_symmetry_group()
+
+    @staticmethod
+    def _group_name(transforms: AutomataTransforms) -> str:
+        """file name stem for the group generated from the stored transforms"""
+        generators = sorted(set(transforms._index_to_transform.values())) # pylint: disable=W0212
+        digest = blake2b(np.array(generators, dtype='<i8').tobytes(), digest_size=16)
+        return 'group-' + digest.hexdigest()
+
+    def _load_group(self, transforms: AutomataTransforms, name: str) -> bool:
+        universe = transforms._universe # pylint: disable=W0212
+        if not self._entry_valid(universe):
+            return False
+        matrices = self._load_array(self._path(universe, name + '.npy'))
+        cayley = self._load_array(self._path(universe, name + '-cayley.npy'))
+        if matrices is None or cayley is None or cayley.shape != (len(matrices),) * 2 or \
+                not self._group_valid(universe, matrices):
+            return False
+        transforms._set_group(np.asarray(matrices), cayley) # pylint: disable=W0212
+        return True
+
+    def _save_group(self, transforms: AutomataTransforms, name: str) -> None:
+        universe = transforms._universe # pylint: disable=W0212
+        if not self._entry_valid(universe):
+            self._write_entry(universe)
+        self._save_array(self._path(universe, name + '.npy'),
+            np.array(transforms.group_transforms(), dtype=np.int64))
+        self._save_array(self._path(universe, name + '-cayley.npy'), transforms.cayley_table)
+
+    def symmetry_transforms(self, universe: AutomataUniverse) -> AutomataTransforms:
+        """transforms holding the full neighbourhood symmetry group of a universe
+
+        Same result as AutomataTransforms.load_symmetry_group, but the group and its Cayley
+        table come from the store when they are there, and are written to it when not.
+
+        :param universe: cellular automata universe configuration
+        :type universe: AutomataUniverse
+        :returns: transforms with the symmetry group loaded
+        :rtype: AutomataTransforms
+        :raises: TypeError
+        """
+        if not isinstance(universe, AutomataUniverse):
+            raise TypeError((type(universe), "universe is not an AutomataUniverse"))
+        transforms = AutomataTransforms(universe)
+        if self._load_group(transforms, SYMMETRY_GROUP):
+            self.load_symmetry_group(universe)
+            self._hits += 1
+            return transforms
+        self._misses += 1
+        transforms.load_symmetry_group()
+        self._save_group(transforms, SYMMETRY_GROUP)
+        self._save_array(self._path(universe, 'symmetry.npy'),
+            np.array(universe.symmetry_group, dtype=np.int64))
+        return transforms
+    # end def symmetry_transforms()
+
+    def transform_group(self, transforms: AutomataTransforms) -> int:
+        """complete the group of the stored transforms, reading it from the store when possible
+
+        Same result as AutomataTransforms.generate_transform_group, keyed by the universe and
+        the distinct stored transform matrices.
+
+        :param transforms: transforms with at least one cycle added
+        :type transforms: AutomataTransforms
+        :returns: the number of transforms in the group
+        :rtype: int
+        :raises: TypeError, ValueError
+        """
+        if not isinstance(transforms, AutomataTransforms):
+            raise TypeError((type(transforms), "transforms is not an AutomataTransforms"))
+        transforms._check_not_frozen() # pylint: disable=W0212
+        if transforms.transform_count == 0:
+            raise ValueError(
+                "No transforms have been added yet. Nothing to generate a group from")
+        name = self._group_name(transforms)
+        if self._load_group(transforms, name):
+            self._hits += 1
+            return transforms.group_order
+        self._misses += 1
+        order = transforms.generate_transform_group()
+        self._save_group(transforms, name)
+        return order
+    # end def transform_group()
+# end class AutomataStore
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+sparse neighbour counting by merging sorted rows, with no hashing of cells
+"""
+
+# pipenv shell
+
+# standard library imports
+# related third party imports
+import numpy as np
+
+# local application/library specific imports
+import automata_typehints as AHint
+from automata_universe import AutomataUniverse, array_cells
+from automata_engine import AutomataEngine
+from automata_clusters import CellPacking
+
+class SweepEngine(AutomataEngine):
+    """engine for sparse 2 and 3 dimensional generations, in neighbourhoods of any shape
+
+    A generation is kept as a cell array sorted in row order: the leading axes select a row
+    (or, in 3 dimensions, a row of a plane), and the cells of each row follow in order along
+    the last axis. Packed to integer keys, with the last axis varying fastest, that is one
+    sorted key array: the sorted rows laid end to end.
+
+    Adding the packed key of a neighbourhood offset keeps the array sorted, so each offset
+    gives one more sorted run, and the neighbour counts come from a merge of the runs
+    followed by counting equal keys. The living cells are found in the merged keys with a
+    sorted search. Cells are never hashed, and the rows near each other in space are near
+    each other in memory, which sits between hashing very sparse soups and stepping dense
+    grids.
+
+    advance keeps the sorted cell array between generations, so long runs only convert cells
+    at the start and the end.
+    """
+
+    def __init__(self, universe: AutomataUniverse) -> None:
+        """constructor
+
+        :param universe: cellular automata universe configuration to step cells in
+        :type universe: AutomataUniverse
+        :raises: TypeError
+        """
+        super().__init__(universe)
+        geometry = universe.geometry
+        self._offsets = geometry.offsets
+        self._reach = max(geometry.radius)
+
+    def _step_points(self, points: np.ndarray) -> np.ndarray:
+        """next generation of a cell array
+
+        :param points: living cells, in row order
+        :type points: numpy (N, dimensions) integer array
+        :returns: next generation cells, in row order
+        :rtype: numpy (M, dimensions) integer array
+        """
+        packing = CellPacking.for_arrays((tuple(points.min(axis=0).tolist()),
+            tuple(points.max(axis=0).tolist())), self._reach)
+        if packing is None:
+            return self._sorted_points(self._universe.step(array_cells(points)))
+        living = packing.pack_array(points)
+        deltas = self._offsets @ np.array(packing.strides, dtype=np.int64)
+        # a cell counts a living neighbour when the neighbour, less the offset, is the cell
+        merged = np.sort((living[np.newaxis, :] - deltas[:, np.newaxis]).ravel(),
+            kind='stable')
+        starts = np.flatnonzero(np.concatenate(([True], merged[1:] != merged[:-1])))
+        keys = merged[starts]
+        counts = np.diff(np.append(starts, len(merged)))
+        found = np.searchsorted(living, keys)
+        found[found == len(living)] = 0
+        alive = living[found] == keys
+        born = keys[self._universe.geometry.rules[alive.astype(np.int64), counts]]
+        # living cells with no living neighbours are not in the merged keys
+        if self._universe.geometry.rules[1, 0]:
+            born = np.union1d(born, np.setdiff1d(living, keys, assume_unique=True))
+        return packing.unpack_array(born)
+    # end def _step_points()
+
+    def _sorted_points(self, cells: AHint.CellGroupType) -> np.ndarray:
+        """cell array of a generation, in row order"""
+        points = self._universe.cell_array(cells)
+        return points[np.lexsort(points.T[::-1])]
+
+    def step(self, cells: AHint.CellGroupType) -> AHint.CellGroupWorkingType:
+        """iterate from a generation to the next
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :returns: next generation of cells
+        :rtype: set of universe cell address tuples
+        """
+        if not cells:
+            return set()
+        return array_cells(self._step_points(self._sorted_points(cells)))
+
+    def advance(self, cells: AHint.CellGroupType, generations: int) \
+            -> AHint.CellGroupWorkingType:
+        """iterate forward a number of generations
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :param generations: the number of generations to step
+        :type generations: int
+        :returns: generation of cells after the final step
+        :rtype: set of universe cell address tuples
+        """
+        if not cells:
+            return set()
+        points = self._sorted_points(cells)
+        for _count in range(generations):
+            if len(points) == 0:
+                break
+            points = self._step_points(points)
+        return array_cells(points)
+    # end def advance()
+# end class SweepEngine
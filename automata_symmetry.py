@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+symmetry reduced generations: store and step only a fundamental domain of a symmetric pattern
+"""
+
+# pipenv shell
+
+# standard library imports
+from typing import Iterable, Optional
+
+# related third party imports
+import numpy as np
+
+# local application/library specific imports
+import automata_typehints as AHint
+from automata_universe import AutomataUniverse
+from automata_engine import AutomataEngine
+
+def _row_keys(points: np.ndarray) -> np.ndarray:
+    """byte key for each row of an integer array, usable with sort and searchsorted"""
+    points = np.ascontiguousarray(points)
+    return points.view(np.dtype((np.void, points.itemsize * points.shape[1]))).ravel()
+
+def _unique_rows(points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """distinct rows of an integer array, and their byte keys, in key order"""
+    (keys, first) = np.unique(_row_keys(points), return_index=True)
+    return (points[first], keys)
+
+class SymmetricPattern:
+    """generation of a symmetric pattern, kept as one representative cell for each orbit
+
+    The stabiliser is the set of universe symmetries that map the pattern onto itself, about
+    the centre of its bounding box. Every universe symmetry also maps the universe rules onto
+    themselves, so later generations keep the same stabiliser and centre. Only the
+    fundamental domain (the lexicographically smallest cell of each orbit) is stored and
+    stepped. Neighbour counts look up the representative of each neighbour address, so the
+    rest of the pattern is never built until the full generation is asked for.
+
+    Addresses are held in doubled coordinates, relative to the centre: 2·cell - centre_sum.
+    A centre between cells then still has integer coordinates.
+
+    :property universe: cellular automata universe configuration
+    :type universe: AutomataUniverse
+    :property stabiliser: symmetry transforms that map the pattern onto itself
+    :type stabiliser: tuple of transformation matrices, starting with the identity
+    :property domain_population: the number of stored representative cells
+    :type domain_population: int
+    :property iteration: the number of generations stepped
+    :type iteration: int
+    :property generation: living cells, rebuilt from the fundamental domain
+    :type generation: set of universe cell address tuples
+    """
+
+    def __init__(self, universe: AutomataUniverse, cells: AHint.CellGroupType,
+            transforms: Optional[Iterable[AHint.TransformInputType]] = None) -> None:
+        """constructor
+
+        :param universe: cellular automata universe configuration
+        :type universe: AutomataUniverse
+        :param cells: living cells of the starting generation
+        :type cells: «frozen»set of universe cell address tuples
+        :param transforms: candidate symmetries, default all universe neighbourhood symmetries
+        :type transforms: iterable of transformation matrices
+        :raises: TypeError, ValueError
+        """
+        if not isinstance(universe, AutomataUniverse):
+            raise TypeError((type(universe), "universe is not an AutomataUniverse"))
+        universe._check_cell_group(cells) # pylint: disable=W0212
+        symmetries = universe.symmetry_group
+        if transforms is not None:
+            transforms = tuple(tuple(tuple(row) for row in matrix) for matrix in transforms)
+            for matrix in transforms:
+                if matrix not in symmetries:
+                    raise ValueError((matrix, "transform is not a universe symmetry"))
+        else:
+            transforms = symmetries
+        self._universe = universe
+        dimensions = universe.dimensions
+        self._offsets = 2 * universe.geometry.offsets
+        self._rules = universe.geometry.rules
+        self._iteration = 0
+        points = universe.cell_array(cells)
+        if len(points) == 0:
+            self._centre = np.zeros(dimensions, dtype=np.int64)
+        else:
+            self._centre = points.min(axis=0) + points.max(axis=0)
+        points = 2 * points - self._centre
+        pattern = np.sort(_row_keys(points))
+        identity = universe.identity_matrix
+        stabiliser = [identity]
+        for matrix in transforms:
+            if matrix == identity:
+                continue
+            image = points @ np.array(matrix, dtype=np.int64).T
+            if np.array_equal(np.sort(_row_keys(image)), pattern):
+                stabiliser.append(matrix)
+        self._stabiliser = tuple(stabiliser)
+        self._matrices = np.array(stabiliser, dtype=np.int64)
+        (self._domain, self._domain_keys) = _unique_rows(self._representatives(points))
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def universe(self) -> AutomataUniverse:
+        return self._universe
+
+    @property
+    def stabiliser(self) -> tuple[AHint.TransformType, ...]:
+        return self._stabiliser
+
+    @property
+    def domain_population(self) -> int:
+        return len(self._domain)
+
+    @property
+    def iteration(self) -> int:
+        return self._iteration
+
+    @property
+    def generation(self) -> AHint.CellGroupWorkingType:
+        """rebuild the full generation from the fundamental domain
+
+        :returns: living cells
+        :rtype: set of universe cell address tuples
+        """
+        if len(self._domain) == 0:
+            return set()
+        (images, _keys) = _unique_rows(np.concatenate([self._domain @ matrix.T
+            for matrix in self._matrices]))
+        return set(map(tuple, ((images + self._centre) // 2).tolist()))
+    # end generation property getter
+
+    # end of property methods
+
+    def _representatives(self, points: np.ndarray) -> np.ndarray:
+        """the lexicographically smallest stabiliser image of each point
+
+        :param points: doubled centred cell addresses
+        :type points: numpy (N, dimensions) integer array
+        :returns: orbit representative for each point
+        :rtype: numpy (N, dimensions) integer array
+        """
+        best = points
+        for matrix in self._matrices[1:]:
+            image = points @ matrix.T
+            difference = image - best
+            first = np.argmax(difference != 0, axis=1)
+            smaller = difference[np.arange(len(points)), first] < 0
+            best = np.where(smaller[:, np.newaxis], image, best)
+        return best
+
+    def _in_domain(self, points: np.ndarray) -> np.ndarray:
+        """which representative points are living cells
+
+        :param points: doubled centred orbit representatives
+        :type points: numpy (N, dimensions) integer array
+        :returns: True for each living point
+        :rtype: numpy boolean array
+        """
+        if len(self._domain) == 0:
+            return np.zeros(len(points), dtype=bool)
+        domain_keys = self._domain_keys
+        keys = _row_keys(points)
+        found = np.searchsorted(domain_keys, keys)
+        found[found == len(domain_keys)] = 0
+        return domain_keys[found] == keys
+
+    def step(self) -> None:
+        """iterate the fundamental domain from the current generation to the next"""
+        if len(self._domain) == 0:
+            self._iteration += 1
+            return
+        dimensions = self._domain.shape[1]
+        reach = np.concatenate((np.zeros((1, dimensions), dtype=np.int64), self._offsets))
+        (candidates, candidate_keys) = _unique_rows(self._representatives(
+            (self._domain[:, np.newaxis] + reach).reshape(-1, dimensions)))
+        neighbours = (candidates[:, np.newaxis] + self._offsets).reshape(-1, dimensions)
+        counts = self._in_domain(self._representatives(neighbours)).reshape(
+            len(candidates), len(self._offsets)).sum(axis=1)
+        living = self._in_domain(candidates)
+        keep = self._rules[living.astype(np.intp), counts]
+        (self._domain, self._domain_keys) = (candidates[keep], candidate_keys[keep])
+        self._iteration += 1
+    # end def step()
+
+    def advance(self, generations: int) -> None:
+        """iterate the fundamental domain forward a number of generations"""
+        for _count in range(generations):
+            self.step()
+# end class SymmetricPattern
+
+class SymmetricEngine(AutomataEngine):
+    """engine that steps symmetric generations through their fundamental domain
+
+    Detecting the stabiliser looks at every cell, so the engine keeps the reduced pattern
+    between steps: when a step starts from the previous result, the stored domain is stepped
+    directly. Any other generation starts a new reduced pattern.
+    """
+
+    def __init__(self, universe: AutomataUniverse) -> None:
+        """constructor
+
+        :param universe: cellular automata universe configuration to step cells in
+        :type universe: AutomataUniverse
+        :raises: TypeError
+        """
+        super().__init__(universe)
+        self._pattern = None
+        self._previous = None
+
+    def _reduced(self, cells: AHint.CellGroupType) -> SymmetricPattern:
+        """reduced pattern for a generation, reusing the previous one when possible"""
+        if self._pattern is None or cells != self._previous:
+            self._pattern = SymmetricPattern(self._universe, cells)
+        return self._pattern
+
+    def step(self, cells: AHint.CellGroupType) -> AHint.CellGroupWorkingType:
+        """iterate from a generation to the next
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :returns: next generation of cells
+        :rtype: set of universe cell address tuples
+        """
+        return self.advance(cells, 1)
+
+    def advance(self, cells: AHint.CellGroupType, generations: int) \
+            -> AHint.CellGroupWorkingType:
+        """iterate forward a number of generations, only rebuilding the final generation
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :param generations: the number of generations to step
+        :type generations: int
+        :returns: generation of cells after the final step
+        :rtype: set of universe cell address tuples
+        """
+        pattern = self._reduced(cells)
+        pattern.advance(generations)
+        next_generation = pattern.generation
+        self._previous = frozenset(next_generation)
+        return next_generation
+    # end def advance()
+# end class SymmetricEngine
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+dense tile stepping: split a generation into fixed size arrays that are stepped one at a time
+"""
+
+# pipenv shell
+
+# standard library imports
+import itertools
+
+# related third party imports
+import numpy as np
+
+# local application/library specific imports
+import automata_typehints as AHint
+from automata_universe import AutomataUniverse, array_cells
+from automata_engine import AutomataEngine
+
+class TiledEngine(AutomataEngine):
+    """base for engines that count neighbours with whole array operations on dense tiles
+
+    Space is split into cubic tiles. Every tile that holds a living cell, or is close enough
+    to one to have a birth, is stepped on its own: the living cells within the neighbourhood
+    radius of the tile are copied to a dense array, padded by the radius on every side.
+    Subclasses supply _step_tile, which finds the next generation inside one tile.
+
+    :property radius: the neighbourhood reach along each axis
+    :type radius: tuple of integers
+    :property tile: the size of a tile along each axis
+    :type tile: int
+    """
+
+    def __init__(self, universe: AutomataUniverse, tile: int = 64) -> None:
+        """constructor
+
+        :param universe: cellular automata universe configuration to step cells in
+        :type universe: AutomataUniverse
+        :param tile: the size of the dense tiles along each axis
+        :type tile: int
+        :raises: TypeError, ValueError
+        """
+        super().__init__(universe)
+        if not isinstance(tile, int):
+            raise TypeError((type(tile), "tile size is not an integer"))
+        if tile < 1:
+            raise ValueError((tile, "tile size must be greater than zero"))
+        self._radius = universe.geometry.radius
+        self._tile = tile
+        # tiles on each side of an occupied tile that a birth can reach
+        reach = max(-(-radius // tile) for radius in self._radius)
+        self._near = tuple(itertools.product(range(-reach, reach + 1),
+            repeat=universe.dimensions))
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def radius(self) -> tuple[int, ...]:
+        return self._radius
+
+    @property
+    def tile(self) -> int:
+        return self._tile
+
+    # end of property methods
+
+    def _tile_grid(self, corner: np.ndarray, points: np.ndarray) -> np.ndarray:
+        """dense array of the living cells around one tile
+
+        :param corner: minimum cell address of the tile
+        :type corner: numpy (dimensions,) integer array
+        :param points: living cells, including every one within the radius of the tile
+        :type points: numpy (N, dimensions) integer array
+        :returns: 1 for living cells, over the tile extended by the radius on each side
+        :rtype: numpy integer array, tile + 2 · radius along each axis
+        """
+        radius = np.array(self._radius, dtype=np.int64)
+        shape = self._tile + 2 * radius
+        local = points - (corner - radius)
+        inside = np.all((local >= 0) & (local < shape), axis=1)
+        grid = np.zeros(tuple(shape.tolist()), dtype=np.int32)
+        grid[tuple(local[inside].T)] = 1
+        return grid
+
+    def _next_states(self, corner: np.ndarray, grid: np.ndarray,
+            counts: np.ndarray) -> np.ndarray:
+        """living cells of a tile in the next generation, from the rule lookup table
+
+        :param corner: minimum cell address of the tile
+        :type corner: numpy (dimensions,) integer array
+        :param grid: the tile grid from _tile_grid
+        :type grid: numpy integer array
+        :param counts: living neighbour count for each cell of the tile
+        :type counts: numpy integer array, tile along each axis
+        :returns: cell coordinates
+        :rtype: numpy (M, dimensions) integer array
+        """
+        alive = grid[tuple(slice(reach, reach + self._tile) for reach in self._radius)]
+        return np.argwhere(self._universe.geometry.rules[alive, counts]) + corner
+
+    def _step_tile(self, corner: np.ndarray, points: np.ndarray) -> np.ndarray:
+        """next generation cells inside one tile
+
+        :param corner: minimum cell address of the tile
+        :type corner: numpy (dimensions,) integer array
+        :param points: living cells, including every one within the radius of the tile
+        :type points: numpy (N, dimensions) integer array
+        :returns: living cells of the tile in the next generation
+        :rtype: numpy (M, dimensions) integer array
+        """
+        raise NotImplementedError("tiled engines must supply _step_tile")
+
+    def step(self, cells: AHint.CellGroupType) -> AHint.CellGroupWorkingType:
+        """iterate from a generation to the next
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :returns: next generation of cells
+        :rtype: set of universe cell address tuples
+        """
+        points = self._universe.cell_array(cells)
+        if len(points) == 0:
+            return set()
+        tiles = points // self._tile
+        order = np.lexsort(tiles.T[::-1])
+        (points, tiles) = (points[order], tiles[order])
+        starts = np.flatnonzero(np.any(tiles[1:] != tiles[:-1], axis=1)) + 1
+        occupied = {tuple(tiles[start].tolist()): members for start, members in
+            zip(np.concatenate(([0], starts)).tolist(), np.split(points, starts))}
+        active = {tuple(base + delta for base, delta in zip(tile, offset))
+            for tile in occupied for offset in self._near}
+        next_generation = []
+        for tile in active:
+            nearby = [occupied[near] for near in (tuple(base + delta
+                for base, delta in zip(tile, offset)) for offset in self._near)
+                if near in occupied]
+            born = self._step_tile(np.array(tile, dtype=np.int64) * self._tile,
+                np.concatenate(nearby))
+            if len(born) > 0:
+                next_generation.append(born)
+        if not next_generation:
+            return set()
+        return array_cells(np.concatenate(next_generation))
+    # end def step()
+# end class TiledEngine
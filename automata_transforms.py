@@ -8,12 +8,19 @@ rotation and reflection transformation matrix management for cellular automata
 # pipenv shell
 
 # standard library imports
+import copy
+import weakref
 from collections import namedtuple
 from typing import Hashable, Iterable
 
+# related third party imports
+import numpy as np
+
 # local application/library specific imports
 import automata_typehints as AHint
 from automata_universe import AutomataUniverse
+from math_tools import (matrix_determinant, matrix_products, matrix_order,
+    integer_matrix_exponent)
 
 XformSequence = namedtuple('TransformSequence', 'key seq')
 
@@ -54,7 +61,18 @@ def _check_transform_key(key: Hashable) -> None:
 # end def _check_transform_key()
 
 class AutomataTransforms:
-    """Storage for cellular automata transforms"""
+    """Storage for cellular automata transforms
+
+    :property group_order: the number of transforms in the generated group, 0 before
+        generate_transform_group has been run
+    :type group_order: int
+    :property cayley_table: (read only) group multiplication table, by group element index
+    :type cayley_table: numpy (group_order, group_order) integer array
+    :property frozen: the transforms can not be changed, because they are shared
+    :type frozen: bool
+    :property transform_count: the number of stored transforms, excluding the identity
+    :type transform_count: int
+    """
     WorkArea = namedtuple('WorkArea', 'primes cycles combinations')
 
     def __init__(self, universe: AutomataUniverse) -> None:
@@ -70,12 +88,78 @@ class AutomataTransforms:
         self._scratch.primes[self._prime_cells] = TransformSequence(None, 0)
         self._scratch.cycles[None] = 0
         self._scratch.combinations.clear()
+        self._group = ()
+        self._group_index = dict()
+        self._cayley = None
+        self._inverse = None
+        self._frozen = False
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def group_order(self) -> int:
+        return len(self._group)
+
+    @property
+    def cayley_table(self) -> np.ndarray:
+        return self._cayley
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    @property
+    def transform_count(self) -> int:
+        return len(self._index_to_transform)
+
+    # end of property methods
 
     def __hash__(self) -> int:
         # hash of the set of all stored transforms, without key information
         # The transformation matrices themselves matter, not the lookup or count details
         return hash(frozenset(self._index_to_transform.values()))
 
+    def freeze(self) -> None:
+        """stop any further changes, so the transforms can be shared
+
+        The transform group is generated first, when there are stored transforms but no
+        group yet, so that lookups on the frozen instance never need to change it.
+        """
+        if self._frozen:
+            return
+        if len(self._group) == 0 and len(self._index_to_transform) > 0:
+            self.generate_transform_group()
+        if self._cayley is not None:
+            self._cayley.flags.writeable = False
+            self._inverse.flags.writeable = False
+        self._frozen = True
+    # end def freeze()
+
+    def fork(self) -> 'AutomataTransforms':
+        """private copy that can be changed, without touching this (possibly shared) instance
+
+        The stored matrices, patterns and group tables are immutable and are shared with the
+        copy. Only the lookup tables that adding transforms changes are copied.
+
+        :returns: unfrozen copy of the transforms
+        :rtype: AutomataTransforms
+        """
+        forked = copy.copy(self)
+        forked._transform_cycles = dict(self._transform_cycles)
+        forked._index_to_transform = dict(self._index_to_transform)
+        forked._transform_to_index = dict(self._transform_to_index)
+        forked._scratch = self.WorkArea(dict(self._scratch.primes),
+            dict(self._scratch.cycles), dict(self._scratch.combinations))
+        forked._frozen = False
+        return forked
+    # end def fork()
+
+    def _check_not_frozen(self) -> None:
+        """make sure that a shared instance is not changed"""
+        if self._frozen:
+            raise ValueError("transforms are frozen and shared: fork() a private copy to "
+                "change them")
+
     def _build_transform_test_set(self) -> AHint.CellGroupSnapshotType:
         some_prime_numbers = frozenset((2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53))
         prime_iter = iter(some_prime_numbers)
@@ -138,6 +222,7 @@ class AutomataTransforms:
         :type requested_transform: sequence of «dimension» universe address tuples
         :raises: TypeError, ValueError
         """
+        self._check_not_frozen()
         _check_transform_key(key)
         transform = self._make_transform_hashable(requested_transform)
         # print("hashable transform", transform, hash(transform),
@@ -156,64 +241,57 @@ class AutomataTransforms:
             requested_transform: AHint.TransformInputType) -> None:
         """add transform cycle to automaton
 
+        The cycle length is the order of the transform matrix, found directly from its powers
+        (math_tools.matrix_order). Every power in the cycle, and its transformed test pattern,
+        is then generated together.
+
         :param key: lookup key for cycle of transformation matrices
         :type key: any Hashable
         :param requested_transform: square rotation or reflection matrix operation
         :type requested_transform: sequence of «dimension» universe address tuples
-        :raises: TypeError, ValueError, ReferenceError
+        :raises: TypeError, ValueError, RecursionError
         """
         (cycle_index, transform) = self._add_transform_setup(key, requested_transform)
+        self._clear_group()
+        order = matrix_order(transform, integer_matrix_exponent(self._universe.dimensions))
+        if order is None:
+            # Should be impossible to get here. A transform that maps the neighbourhood onto
+            # itself permutes a finite set of cells, so some power is the identity
+            raise RecursionError("cycle {} does not wrap to the beginning, starting from "
+                "{}".format(key, transform))
+        # every power of the transform, by doubling: powers[k] is transform^(k + 1)
+        powers = np.array((transform,), dtype=np.int64)
+        while len(powers) < order - 1:
+            powers = np.concatenate((powers, matrix_products(powers[-1], powers)))
+        powers = powers[:order - 1]
+        primes = np.array(sorted(self._prime_cells), dtype=np.int64)
+        patterns = [frozenset(map(tuple, image)) for image in
+            matrix_products(primes, np.swapaxes(powers, 1, 2)).tolist()]
         new_transforms = 0
         new_patterns = 0
-        transform_cycle = self._universe.identity_matrix
-        transformed_pattern = self._universe.cell_group_transform(self._prime_cells, transform)
-        while True: # tail recursion equivalent
+        for transform_cycle, transformed_pattern in zip(powers.tolist(), patterns):
+            transform_cycle = tuple(tuple(row) for row in transform_cycle)
             if transformed_pattern == self._prime_cells:
-                self._end_cycle_reached((cycle_index, new_transforms, new_patterns),
-                    transform_cycle, transform)
-                break
+                raise ValueError("pattern ended at {} before transform cycled: {}".format(
+                    cycle_index, transform_cycle))
             if transformed_pattern not in self._scratch.primes:
                 self._scratch.primes[transformed_pattern] = cycle_index
                 new_patterns += 1
             else: # DEBUG normal should just continue
                 raise ValueError("{} pattern for {} matches {}".format(transformed_pattern,
                     cycle_index, self._scratch.primes[transformed_pattern]))
-
-            transform_cycle = self._universe.matrix_transform(transform, transform_cycle)
-            if transform_cycle == self._universe.identity_matrix:
-                raise ValueError("transformation for {} matches the identity matrix".format(
-                    cycle_index))
-            test_pattern = self._universe.cell_group_transform(self._prime_cells, transform_cycle)
-            if transformed_pattern != test_pattern:
-                # transform_cycle is supposed to be a one step operation creating
-                # transformed_pattern from self._prime_cells
-                cycle_start = _base_index(cycle_index.key)
-                # this is really a code logic error. Code is broken to get here
-                raise ReferenceError((transformed_pattern, test_pattern, "{} transform {} does not "
-                    "produce the same result as multiple operations of the {} transform {}".format(
-                    cycle_index, transform_cycle, cycle_start,
-                    self._index_to_transform[cycle_start])))
-
             if transform_cycle not in self._transform_to_index:
                 self._transform_to_index[transform_cycle] = cycle_index
                 new_transforms += 1
             else: # DEBUG normally should just continue
                 raise ValueError("index {} already matches transform {}".format(
                     self._transform_to_index[transform_cycle], transform_cycle))
-
-            self._index_to_transform[cycle_index] = transform_cycle
-            transformed_pattern = self._universe.cell_group_transform(
-                transformed_pattern, transform)
-            cycle_index = TransformSequence(key, cycle_index.seq + 1)
             if cycle_index in self._index_to_transform:
                 raise ValueError("cycle index {} already in use".format(cycle_index))
-            if cycle_index.seq > 10:
-                # Should be impossible to get here. The initial validation of a transformation
-                # matrix should guarantee that it cycles in a few iterations. At least for a
-                # small number of dimensions
-                raise RecursionError("cycle {} did not wrap to the beginning before {} steps "
-                    "starting from {}".format(cycle_index.key, cycle_index.seq, transform))
-        # end while True
+            self._index_to_transform[cycle_index] = transform_cycle
+            cycle_index = TransformSequence(key, cycle_index.seq + 1)
+        self._end_cycle_reached((cycle_index, new_transforms, new_patterns),
+            transform_cycle, transform)
     # end def add_transform_cycle()
     def _end_cycle_reached(self, context: tuple[TransformSequence, int, int],
             cycle_result: AHint.TransformType, operation: AHint.TransformType) -> None:
@@ -370,6 +448,7 @@ class AutomataTransforms:
 
         :raises: ValueError, TypeError, ReferenceError
         """
+        self._check_not_frozen()
         if len(self._index_to_transform) == 0:
             raise ValueError(
                 "No transforms have been added yet. Nothing to base generated transforms on")
@@ -383,8 +462,257 @@ class AutomataTransforms:
         self._find_combination_targets()
         self._add_unique_combinations()
     # end def generate_combination_transforms()
+
+    def _clear_group(self) -> None:
+        """forget the generated group, after the transforms it was generated from change"""
+        self._group = ()
+        self._group_index = dict()
+        self._cayley = None
+        self._inverse = None
+
+    def generate_transform_group(self, limit: int = 100000) -> int:
+        """close the stored transforms under composition, and build the multiplication table
+
+        Every product of stored transforms is interned once, with the identity matrix as
+        element 0. The Cayley table then holds the element index for each product, so
+        composing transforms is an index lookup instead of a matrix_transform call.
+
+        :param limit: the maximum group order to accept
+        :type limit: int
+        :returns: the number of transforms in the group
+        :rtype: int
+        :raises: ValueError, RecursionError, ReferenceError
+        """
+        self._check_not_frozen()
+        if len(self._index_to_transform) == 0:
+            raise ValueError(
+                "No transforms have been added yet. Nothing to generate a group from")
+        generators = list(dict.fromkeys(self._index_to_transform.values()))
+        for generator in generators:
+            if abs(matrix_determinant(generator)) != 1:
+                # the powers of the matrix never return to the identity
+                raise ValueError((generator, "transform does not have an integer inverse"))
+        generators = np.array(generators, dtype=np.int64)
+        identity = np.array(self._universe.identity_matrix, dtype=np.int64)
+        elements = [identity]
+        seen = {identity.tobytes()}
+        frontier = identity[np.newaxis]
+        while len(frontier) > 0:
+            # breadth first: every generator applied to every element found in the last pass
+            found = []
+            for products in matrix_products(generators[:, np.newaxis], frontier):
+                for product in products:
+                    key = product.tobytes()
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    found.append(product)
+            if len(elements) + len(found) > limit:
+                raise RecursionError("transform group is larger than {} elements".format(limit))
+            elements.extend(found)
+            frontier = np.array(found, dtype=np.int64).reshape(-1, *identity.shape)
+        return self._set_group(np.array(elements, dtype=np.int64))
+    # end def generate_transform_group()
+
+    def load_symmetry_group(self) -> int:
+        """use the full symmetry group of the universe neighbourhood as the transform group
+
+        No transforms need to be added first: the universe finds every signed permutation
+        matrix that maps its neighbourhood onto itself.
+
+        :returns: the number of transforms in the group
+        :rtype: int
+        :raises: ValueError
+        """
+        self._check_not_frozen()
+        return self._set_group(np.array(self._universe.symmetry_group, dtype=np.int64))
+    # end def load_symmetry_group()
+
+    def _set_group(self, matrices: np.ndarray, cayley: np.ndarray = None) -> int:
+        """intern a closed group of transforms, with the identity first, and build its tables
+
+        :param matrices: group elements
+        :type matrices: numpy (order, dimensions, dimensions) integer array
+        :param cayley: multiplication table already built for the same matrices, such as one
+            read back from an AutomataStore
+        :type cayley: numpy (order, order) integer array
+        :returns: the number of transforms in the group
+        :rtype: int
+        """
+        self._group = tuple(tuple(tuple(row) for row in matrix) for matrix in matrices.tolist())
+        self._group_index = {matrix: index for index, matrix in enumerate(self._group)}
+        self._cayley = self._build_cayley_table(matrices) if cayley is None else cayley
+        (_rows, columns) = np.nonzero(self._cayley == 0)
+        self._inverse = columns
+        return len(self._group)
+    # end def _set_group()
+
+    @staticmethod
+    def _build_cayley_table(matrices: np.ndarray) -> np.ndarray:
+        """multiplication table for a closed group of matrices
+
+        Each matrix is packed to a single integer key: the entries are digits, weighted by
+        powers of the entry range. The key of A · M is linear in the entries of M, so the keys
+        for the products of A with every element come from a single matrix-vector product,
+        without forming the product matrices. Groups with entries too large to pack into an
+        integer fall back to multiplying the matrices and comparing their bytes. Rows are
+        processed in blocks, to keep the working arrays to about a million keys.
+
+        :param matrices: group elements
+        :type matrices: numpy (order, dimensions, dimensions) integer array
+        :returns: table[left, right] is the index of matrices[left] · matrices[right]
+        :rtype: numpy (order, order) integer array
+        :raises: ReferenceError
+        """
+        (order, dimensions, _columns) = matrices.shape
+        flat = matrices.reshape(order, -1)
+        low = int(flat.min())
+        base = int(flat.max()) - low + 1
+        if base ** flat.shape[1] < 2 ** 62:
+            # every entry of a product is an entry value of some element: a digit in base
+            weights = (base ** np.arange(flat.shape[1], dtype=np.int64)).reshape(
+                dimensions, dimensions)
+            element_keys = flat @ weights.ravel()
+
+            def product_keys(left: np.ndarray) -> np.ndarray:
+                # Σ w[a,b]·(A·M)[a,b] == Σ (Aᵀ·w)[c,b]·M[c,b]
+                return (np.matmul(left.transpose(0, 2, 1), weights).reshape(len(left), -1)
+                    @ flat.T)
+        else:
+            key_type = np.dtype((np.void, matrices.itemsize * dimensions * dimensions))
+
+            def packed(block: np.ndarray) -> np.ndarray:
+                return np.ascontiguousarray(block).reshape(-1, dimensions * dimensions).view(
+                    key_type).reshape(block.shape[:-2])
+            element_keys = packed(matrices)
+
+            def product_keys(left: np.ndarray) -> np.ndarray:
+                return packed(np.matmul(left[:, np.newaxis], matrices))
+        key_order = np.argsort(element_keys)
+        sorted_keys = element_keys[key_order]
+        table = np.empty((order, order), dtype=np.int32)
+        block = max(1, 2 ** 20 // order)
+        for start in range(0, order, block):
+            # product keys for a block of rows: left elements by every right element
+            keys = product_keys(matrices[start:start + block])
+            found = np.searchsorted(sorted_keys, keys)
+            found[found == order] = 0
+            if not np.array_equal(sorted_keys[found], keys):
+                # code logic error: the products of a closed group are all elements
+                raise ReferenceError("transform group is not closed under composition")
+            table[start:start + block] = key_order[found]
+        table.flags.writeable = False
+        return table
+    # end def _build_cayley_table()
+
+    def _check_group_index(self, index: int) -> None:
+        """check that an integer is the index of a generated group element
+
+        :raises: TypeError, ValueError
+        """
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise TypeError((type(index), "group index is not an integer"))
+        if not 0 <= index < len(self._group):
+            raise ValueError((index, "group index is not in the generated transform group"))
+
+    def group_transform(self, index: int) -> AHint.TransformType:
+        """the transformation matrix for a group element index
+
+        :raises: TypeError, ValueError
+        """
+        self._check_group_index(index)
+        return self._group[index]
+
+    def group_transforms(self) -> tuple[AHint.TransformType, ...]:
+        """every transform in the group, by group index
+
+        The group is generated from the stored transforms when that has not been done yet.
+        Without any stored transforms, the group only holds the identity matrix.
+
+        :returns: transformation matrices, starting with the identity
+        :rtype: tuple of transformation matrices
+        """
+        if len(self._group) == 0 and len(self._index_to_transform) > 0:
+            self.generate_transform_group()
+        if len(self._group) == 0:
+            return (self._universe.identity_matrix,)
+        return self._group
+    # end def group_transforms()
+
+    def group_index(self, transform: AHint.TransformInputType) -> int:
+        """the group element index for a transformation matrix
+
+        :raises: ValueError
+        """
+        hashable = tuple(tuple(row) for row in transform)
+        if hashable not in self._group_index:
+            raise ValueError((hashable, "transform is not in the generated transform group"))
+        return self._group_index[hashable]
+
+    def compose(self, left: int, right: int) -> int:
+        """group index of the transform that applies right, then left
+
+        :param left: group index of the transform applied second
+        :type left: int
+        :param right: group index of the transform applied first
+        :type right: int
+        :returns: group index of group_transform(left) · group_transform(right)
+        :rtype: int
+        :raises: TypeError, ValueError
+        """
+        self._check_group_index(left)
+        self._check_group_index(right)
+        return int(self._cayley[left, right])
+
+    def inverse(self, index: int) -> int:
+        """group index of the transform that undoes the indexed transform
+
+        :raises: TypeError, ValueError
+        """
+        self._check_group_index(index)
+        return int(self._inverse[index])
 # end class AutomataTransforms
 
+# one frozen AutomataTransforms for each universe and transform set, see shared_transforms;
+# an entry is dropped when no caller holds its transforms any more
+_SHARED_TRANSFORMS = weakref.WeakValueDictionary()
+
+def shared_transforms(universe: AutomataUniverse,
+        cycles: Iterable[tuple[Hashable, AHint.TransformInputType]] = (),
+        symmetry: bool = False) -> AutomataTransforms:
+    """frozen transforms, shared by every caller asking for the same universe and transforms
+
+    The first request builds, validates and freezes the transforms. Later requests for an
+    equal universe and the same transform cycles get that same instance back, without any
+    setup, for as long as any caller keeps a reference to it. Use fork() on the result to add
+    more transforms.
+
+    :param universe: cellular automata universe configuration
+    :type universe: AutomataUniverse
+    :param cycles: keys and transformation matrices to add with add_transform_cycle, in order
+    :type cycles: iterable of (Hashable, transformation matrix) tuples
+    :param symmetry: use the full symmetry group of the universe as the transform group
+    :type symmetry: bool
+    :returns: shared, frozen transforms
+    :rtype: AutomataTransforms
+    :raises: TypeError, ValueError
+    """
+    if not isinstance(universe, AutomataUniverse):
+        raise TypeError((type(universe), "universe is not an AutomataUniverse"))
+    cycles = tuple((key, tuple(tuple(row) for row in matrix)) for key, matrix in cycles)
+    lookup = (universe, cycles, bool(symmetry))
+    transforms = _SHARED_TRANSFORMS.get(lookup)
+    if transforms is None:
+        transforms = AutomataTransforms(universe)
+        for key, matrix in cycles:
+            transforms.add_transform_cycle(key, matrix)
+        if symmetry:
+            transforms.load_symmetry_group()
+        transforms.freeze()
+        _SHARED_TRANSFORMS[lookup] = transforms
+    return transforms
+# end def shared_transforms()
+
 
 SQUARE_GRID_NEIGHBORS = [
     (-1,-1), (-1,0), (-1, 1),
@@ -26,6 +26,8 @@ CellorCellsType = Union[Iterable[CellAddressType], CellAddressType]
 TransformInputType = Iterable[CellAddressType]
 TransformType = tuple[CellAddressType, ...]
 RotateReflectInputType = Iterable[TransformInputType]
+FingerprintType = tuple[int, int]
+TranslationPeriodType = tuple[int, CellAddressType]
 
 # def my_main() -> None:
 #     """wrapper for test/start code so that variables do not look like constants"""
@@ -8,11 +8,217 @@ manipulation of cellular automata generations
 # pipenv shell
 
 # standard library imports
+import weakref
+from itertools import chain
+from typing import Union
+
+# related third party imports
+import numpy as np
+
 # local application/library specific imports
 import automata_typehints as AHint
-from math_tools import (identity_matrix, matrix_transform, matrix_transpose,
+from math_tools import (identity_matrix, matrix_transform,
     vector_dot_product, matrix_determinant)
 
+def array_cells(cells: np.ndarray) -> AHint.CellGroupWorkingType:
+    """unpack an integer cell array, one row per cell, to a set of cell address tuples
+
+    :param cells: cell coordinates
+    :type cells: numpy (N, dimensions) integer array
+    :returns: cell addresses
+    :rtype: set of cell address tuples
+    """
+    return set(map(tuple, cells.tolist()))
+# end def array_cells()
+
+def _address_array(cells: AHint.CellGroupType, dimensions: int) -> np.ndarray:
+    """pack validated cell address tuples into an integer array, one row per cell
+
+    :param cells: universe cell addresses
+    :type cells: «frozen»set of cell address tuples
+    :param dimensions: the number of coordinates in each address
+    :type dimensions: int
+    :returns: cell coordinates
+    :rtype: numpy (N, dimensions) integer array
+    :raises: OverflowError when a coordinate does not fit in 64 bits
+    """
+    return np.fromiter(chain.from_iterable(cells), dtype=np.int64,
+        count=len(cells) * dimensions).reshape(len(cells), dimensions)
+
+class UniverseGeometry:
+    """precomputed data for a universe configuration, shared by every equal universe
+
+    Instances are Immutable, and interned: see universe_geometry
+
+    :property dimensions: the number of dimension for the universe
+    :type dimensions: int
+    :property offsets: (read only) neighbourhood addresses, in sorted order
+    :type offsets: numpy (neighbourhood_population, dimensions) integer array
+    :property radius: the largest neighbourhood coordinate magnitude along each axis
+    :type radius: tuple of integers
+    :property rules: (read only) next state lookup table: rules[alive, count]
+    :type rules: numpy (2, neighbourhood_population + 1) boolean array
+    :property identity_matrix: identity transform for the universe dimensions
+    :type identity_matrix: tuple of «dimension» cell address tuples
+    :property symmetry_group: signed permutation matrices that map the neighbourhood onto
+        itself, found on first use
+    :type symmetry_group: tuple of transformation matrices, starting with the identity
+    """
+
+    def __init__(self, neighbourhood: AHint.CellGroupSnapshotType,
+            survival_rules: AHint.PropagationRuleType,
+            birth_rules: AHint.PropagationRuleType) -> None:
+        """constructor
+
+        :param neighbourhood: validated neighbourhood addresses
+        :type neighbourhood: frozenset of cell address tuples
+        :param survival_rules: validated survival counts
+        :type survival_rules: frozenset of integers
+        :param birth_rules: validated birth counts
+        :type birth_rules: frozenset of integers
+        """
+        try:
+            offsets = _address_array(neighbourhood, len(next(iter(neighbourhood))))
+            offsets = offsets[np.lexsort(offsets.T[::-1])] # same order as sorted addresses
+        except OverflowError:
+            offsets = np.array(sorted(neighbourhood), dtype=object)
+        offsets.flags.writeable = False
+        rules = np.zeros((2, len(neighbourhood) + 1), dtype=bool)
+        rules[0, sorted(birth_rules)] = True
+        rules[1, sorted(survival_rules)] = True
+        rules.flags.writeable = False
+        self._dimensions = offsets.shape[1]
+        self._offsets = offsets
+        self._radius = tuple(np.abs(offsets).max(axis=0).tolist())
+        self._rules = rules
+        self._identity = identity_matrix(self._dimensions)
+        self._hash = hash((survival_rules, birth_rules, neighbourhood))
+        self._symmetry_group = None
+
+    # properties : getter, setter, deleter methods
+
+    @property
+    def dimensions(self) -> int:
+        return self._dimensions
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return self._offsets
+
+    @property
+    def radius(self) -> tuple[int, ...]:
+        return self._radius
+
+    @property
+    def rules(self) -> np.ndarray:
+        return self._rules
+
+    @property
+    def identity_matrix(self) -> AHint.TransformType:
+        return self._identity
+
+    @property
+    def symmetry_group(self) -> tuple[AHint.TransformType, ...]:
+        """get the signed permutation matrices that map the neighbourhood onto itself
+
+        :returns: symmetry transforms, starting with the identity matrix
+        :rtype: tuple of tuples of «dimension» cell address tuples
+        """
+        if self._symmetry_group is None:
+            self._symmetry_group = self._find_symmetry_group()
+        return self._symmetry_group
+
+    # end of property methods
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def _find_symmetry_group(self) -> tuple[AHint.TransformType, ...]:
+        """search for the signed permutation matrices that map the neighbourhood onto itself
+
+        A signed permutation sends each source axis to a distinct target axis, possibly
+        reversed. Axes are assigned one at a time. After each assignment, the neighbourhood
+        coordinates on the assigned source axes, moved to their target axes, must give the
+        same collection of partial addresses as the neighbourhood itself has on those target
+        axes; any branch where they differ is dropped without trying the remaining axes.
+
+        :returns: symmetry transforms, starting with the identity matrix
+        :rtype: tuple of tuples of «dimension» cell address tuples
+        """
+        dimensions = self._dimensions
+        cells = self._offsets
+        # partial addresses are packed to integers: a digit per target axis
+        low = int(cells.min())
+        digits = cells - low
+        base = int(digits.max()) + 1
+        place = base ** np.arange(dimensions, dtype=np.int64)
+        fixed_keys = dict()
+        found = []
+
+        def fixed(targets: frozenset) -> np.ndarray:
+            # sorted partial address keys of the neighbourhood itself, on the target axes
+            if targets not in fixed_keys:
+                axes = sorted(targets)
+                fixed_keys[targets] = np.sort(digits[:, axes] @ place[axes])
+            return fixed_keys[targets]
+
+        def assign(targets: list[int], signs: list[int], keys: np.ndarray) -> None:
+            axis = len(targets)
+            if axis == dimensions:
+                found.append(tuple(tuple(signs[source] if targets[source] == row else 0
+                    for source in range(dimensions)) for row in range(dimensions)))
+                return
+            for target in range(dimensions):
+                if target in targets:
+                    continue
+                for sign in (1, -1):
+                    moved = keys + (sign * cells[:, axis] - low) * place[target]
+                    if np.array_equal(np.sort(moved), fixed(frozenset(targets + [target]))):
+                        assign(targets + [target], signs + [sign], moved)
+
+        assign([], [], np.zeros(len(cells), dtype=np.int64))
+        identity = self._identity
+        found.remove(identity)
+        return (identity, *found)
+    # end def _find_symmetry_group()
+
+    def packed_offsets(self, strides: tuple[int, ...]) -> np.ndarray:
+        """packed integer key delta for each neighbourhood offset
+
+        :param strides: key increment for a unit step along each axis (CellPacking.strides)
+        :type strides: tuple of integers
+        :returns: key deltas, in offsets order
+        :rtype: numpy integer array
+        """
+        return self._offsets @ np.array(strides, dtype=np.int64)
+# end class UniverseGeometry
+
+# one UniverseGeometry for each universe configuration, see universe_geometry; an entry is
+# dropped when no universe holds its geometry any more
+_GEOMETRY = weakref.WeakValueDictionary()
+
+def universe_geometry(neighbourhood: AHint.CellGroupSnapshotType,
+        survival_rules: AHint.PropagationRuleType,
+        birth_rules: AHint.PropagationRuleType) -> UniverseGeometry:
+    """the interned geometry for a (validated) universe configuration
+
+    :param neighbourhood: neighbourhood addresses
+    :type neighbourhood: frozenset of cell address tuples
+    :param survival_rules: survival counts
+    :type survival_rules: frozenset of integers
+    :param birth_rules: birth counts
+    :type birth_rules: frozenset of integers
+    :returns: shared geometry
+    :rtype: UniverseGeometry
+    """
+    key = (neighbourhood, survival_rules, birth_rules)
+    geometry = _GEOMETRY.get(key)
+    if geometry is None:
+        geometry = UniverseGeometry(neighbourhood, survival_rules, birth_rules)
+        _GEOMETRY[key] = geometry
+    return geometry
+# end def universe_geometry()
+
 class AutomataUniverse:
     """properties for a cellular automata universe
 
@@ -31,6 +237,9 @@ class AutomataUniverse:
         generation
     :type birth_rules: frozen set of integers
 
+    :property geometry: precomputed data shared by every universe with the same configuration
+    :type geometry: UniverseGeometry
+
     :property rotate_reflect: matrices to generate equivalent cell patterns
     :type: tuple of tuples «of tuples»
     """
@@ -53,6 +262,8 @@ class AutomataUniverse:
             # propagation value. It would fill the whole universe that was not a neighbor of
             # the starting generation at the first iteration
             raise ValueError("zero is not a valid birth propagation rule value")
+        self._geometry = universe_geometry(self._origin_neighbourhood, self._survive,
+            self._birth)
 
     # properties : getter, setter, deleter methods
 
@@ -83,7 +294,22 @@ class AutomataUniverse:
 
     @property
     def identity_matrix(self) -> AHint.TransformType:
-        return identity_matrix(self.dimensions)
+        return self._geometry.identity_matrix
+
+    @property
+    def geometry(self) -> UniverseGeometry:
+        return self._geometry
+
+    @property
+    def symmetry_group(self) -> tuple[AHint.TransformType, ...]:
+        """get the signed permutation matrices that map the neighbourhood onto itself
+
+        Found on first use, then kept with the shared geometry: the neighbourhood never changes
+
+        :returns: symmetry transforms, starting with the identity matrix
+        :rtype: tuple of tuples of «dimension» cell address tuples
+        """
+        return self._geometry.symmetry_group
 
     # end of property methods
 
@@ -91,7 +317,13 @@ class AutomataUniverse:
         # hash of the automata universe configuration
         # return hash((self.survival_rules, self.birth_rules, self.neighbourhood,
         #     self._rotate_reflect))
-        return hash((self.survival_rules, self.birth_rules, self.neighbourhood))
+        return hash(self._geometry)
+
+    def __eq__(self, other: object) -> bool:
+        # universes with the same configuration are interchangeable, and share their geometry
+        if not isinstance(other, AutomataUniverse):
+            return NotImplemented
+        return self._geometry is other._geometry
 
     def is_rotation_matrix(self, matrix: AHint.TransformInputType) -> bool:
         """check if the matrix is a valid pure rotation (about an axis) matrix for the universe
@@ -104,8 +336,14 @@ class AutomataUniverse:
         :rtype: bool
         """
         self.validate_matrix(matrix)
-        transposed = matrix_transpose(matrix)
-        if self.matrix_transform(matrix, transposed) != self.identity_matrix:
+        # an integer matrix with M · M<sup>T</sup> = I is a signed permutation matrix
+        columns = set()
+        for row in matrix:
+            entries = [(column, value) for column, value in enumerate(row) if value != 0]
+            if len(entries) != 1 or entries[0][1] not in (1, -1):
+                return False
+            columns.add(entries[0][0])
+        if len(columns) != len(matrix):
             return False
         return matrix_determinant(matrix) == 1
     # end def is_rotation_matrix()
@@ -149,6 +387,39 @@ class AutomataUniverse:
         return new_generation
     # end def step(self)
 
+    def step_changes(self, cells: AHint.CellGroupType,
+            candidates: AHint.CellGroupType = None) \
+            -> tuple[AHint.CellGroupWorkingType, AHint.CellGroupWorkingType]:
+        """cells that are born and cells that die going from a generation to the next
+
+        Same rules as step. Only the candidate cell addresses are evaluated, so a caller that
+        knows which parts of the universe can not change can skip them. Without candidates,
+        every living cell and every neighbour of a living cell is evaluated.
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :param candidates: cell addresses to evaluate, living or empty
+        :type candidates: «frozen»set of universe cell address tuples
+        :returns: births and deaths
+        :rtype: tuple of 2 sets of universe cell address tuples
+        """
+        self._check_cell_group(cells)
+        if candidates is None:
+            candidates = set(cells)
+            for living_cell in cells:
+                candidates.update(self.neighbours(living_cell))
+        births = set()
+        deaths = set()
+        for candidate in candidates:
+            neighbour_count = len(self.neighbours(candidate).intersection(cells))
+            if candidate in cells:
+                if neighbour_count not in self.survival_rules:
+                    deaths.add(candidate)
+            elif neighbour_count in self.birth_rules:
+                births.add(candidate)
+        return (births, deaths)
+    # end def step_changes()
+
     def neighbours(self, address: AHint.CellAddressType) -> \
             AHint.CellGroupSnapshotType:
         """the set of neighbours for a cell address
@@ -201,6 +472,62 @@ class AutomataUniverse:
         return frozenset(self._vector_dot_product(cell, matrix) for cell in cells)
     # end def cell_group_rotate_reflect()
 
+    def cell_array(self, cells: AHint.CellGroupType) -> np.ndarray:
+        """pack a group of cells into an integer array, one row per cell
+
+        :param cells: universe cell addresses
+        :type cells: «frozen»set of cell address tuples
+        :returns: cell coordinates
+        :rtype: numpy (N, dimensions) integer array
+        :raises: TypeError
+        """
+        self._check_cell_group(cells)
+        return np.array(list(cells), dtype=np.int64).reshape(len(cells), self.dimensions)
+    # end def cell_array()
+
+    def cell_array_translate(self, cells: np.ndarray, offset_vector: AHint.CellAddressType,
+            as_cells: bool = False) -> Union[np.ndarray, AHint.CellGroupWorkingType]:
+        """add offset «vector» to each row of a cell array, with a single broadcast add
+
+        :param cells: cell coordinates from cell_array
+        :type cells: numpy (N, dimensions) integer array
+        :param offset_vector: coordinate delta values
+        :type offset_vector: tuple of integers
+        :param as_cells: return a set of cell address tuples instead of an array
+        :type as_cells: bool
+        :returns: translated (moved) cell coordinates
+        :rtype: numpy (N, dimensions) integer array, or set of cell address tuples
+        :raises: TypeError, ValueError
+        """
+        self._check_cell_array(cells)
+        self.validate_address(offset_vector)
+        moved = cells + np.array(offset_vector, dtype=np.int64)
+        return array_cells(moved) if as_cells else moved
+    # end def cell_array_translate()
+
+    def cell_array_transform(self, cells: np.ndarray, matrix: AHint.TransformInputType,
+            as_cells: bool = False) -> Union[np.ndarray, AHint.CellGroupWorkingType]:
+        """rotate or reflect every row of a cell array around the origin, with one matmul
+
+        Same result as cell_group_transform: each cell address (as a column vector) is
+        multiplied by the matrix.
+
+        :param cells: cell coordinates from cell_array
+        :type cells: numpy (N, dimensions) integer array
+        :param matrix: rotation or reflection matrix
+        :type matrix: iterable of cell address vector tuples
+        :param as_cells: return a set of cell address tuples instead of an array
+        :type as_cells: bool
+        :returns: rotated or reflected cell coordinates
+        :rtype: numpy (N, dimensions) integer array, or set of cell address tuples
+        :raises: TypeError, ValueError
+        """
+        self.validate_matrix(matrix)
+        self._check_cell_array(cells)
+        transformed = cells @ np.array(matrix, dtype=np.int64).T
+        return array_cells(transformed) if as_cells else transformed
+    # end def cell_array_transform()
+
     def matrix_transform(self, operation: AHint.TransformInputType,
             base: AHint.TransformInputType) -> AHint.TransformType:
         """transform a cell address matrix through a rotation or reflection matrix
@@ -320,11 +647,30 @@ class AutomataUniverse:
         if origin in self._origin_neighbourhood:
             raise ValueError((origin, "the universe origin is not a valid neighbourhood address"))
 
-        # every address in the neighbourhood must have the origin as one of its neighbours
-        for addr in self._origin_neighbourhood:
-            neighbours = self.neighbours(addr)
-            if not origin in neighbours:
-                raise ValueError((addr, "no symmetric address in neighbourhood"))
+        # every address in the neighbourhood must have the origin as one of its neighbours:
+        # the origin is a neighbour of addr exactly when -addr is in the neighbourhood
+        try:
+            points = _address_array(self._origin_neighbourhood, self.dimensions)
+        except OverflowError:
+            points = None # coordinates too large for numpy: check one address at a time
+        if points is not None:
+            reach = int(np.abs(points).max())
+            base = 2 * reach + 1
+        if points is not None and base ** self.dimensions < 2 ** 63:
+            # pack each address, and its negation, to a single integer key
+            place = base ** np.arange(self.dimensions, dtype=np.int64)
+            keys = np.sort((points + reach) @ place)
+            mirrored = (reach - points) @ place
+            found = np.searchsorted(keys, mirrored)
+            found[found == len(keys)] = 0
+            missing = np.nonzero(keys[found] != mirrored)[0]
+            if len(missing) > 0:
+                raise ValueError((tuple(points[missing[0]].tolist()),
+                    "no symmetric address in neighbourhood"))
+        else:
+            for addr in self._origin_neighbourhood:
+                if tuple(-coord for coord in addr) not in self._origin_neighbourhood:
+                    raise ValueError((addr, "no symmetric address in neighbourhood"))
     # end def _validate_universe_data()
 
     def _check_cell_group(self, cells: AHint.CellGroupType):
@@ -336,10 +682,44 @@ class AutomataUniverse:
         """
         if not isinstance(cells, (set, frozenset)):
             raise TypeError((type(cells), "automata cell group is not a set"))
-        for cell in cells:
-            self.validate_address(cell)
+        if not self._all_universe_addresses(cells):
+            for cell in cells: # report the first bad address
+                self.validate_address(cell)
     # end def _check_cell_group()
 
+    def _all_universe_addresses(self, cells: AHint.CellGroupType) -> bool:
+        """quick check that every cell is a plain universe address tuple
+
+        Collects the distinct element types and lengths in bulk, instead of checking each
+        address in turn. False does not mean that an address is bad: tuple subclasses are
+        left for validate_address to decide, along with finding which address is wrong.
+
+        :param cells: universe cell addresses
+        :type cells: iterable of universe cell address tuples
+        :returns: every cell is a tuple of dimensions integers
+        :rtype: bool
+        """
+        if not cells:
+            return True
+        if set(map(type, cells)) != {tuple} or set(map(len, cells)) != {self.dimensions}:
+            return False
+        return set(map(type, chain.from_iterable(cells))) <= {int, bool}
+    # end def _all_universe_addresses()
+
+    def _check_cell_array(self, cells: np.ndarray):
+        """check that an array holds integer universe cell coordinates, one cell per row
+
+        :param cells: cell coordinates
+        :type cells: numpy (N, dimensions) integer array
+        :raises: TypeError, ValueError
+        """
+        if not isinstance(cells, np.ndarray) or not np.issubdtype(cells.dtype, np.integer):
+            raise TypeError((type(cells), "automata cell array is not an integer numpy array"))
+        if cells.ndim != 2 or cells.shape[1] != self.dimensions:
+            raise ValueError((cells.shape, "automata cell array is not (N, {}) shaped".format(
+                self.dimensions)))
+    # end def _check_cell_array()
+
     def _check_neighbourhood_type(self, input_size: int):
         """check that the cell neighbourhood is structurally correct
 
@@ -368,13 +748,14 @@ class AutomataUniverse:
         self._dimensions = len(address)
         if self.dimensions < 1: # support for 1 dimensional automata?? or only 2+?
             raise TypeError("neighbourhood address does not contain at least 1 coordinate")
-        while True:
-            self.validate_address(address)
-            try:
-                address = next(neighbourhood_iter)
-            except StopIteration:
-                break
-        # end while True:
+        if not self._all_universe_addresses(self._origin_neighbourhood):
+            while True:
+                self.validate_address(address)
+                try:
+                    address = next(neighbourhood_iter)
+                except StopIteration:
+                    break
+            # end while True:
         # self._origin_neighbourhood confirmed to be a frozenset with at least 2 members, with all
         # members being tuples with only integer elements. All of the tuples have at least
         # one element, and all tuples have the same number of elements.
@@ -11,7 +11,7 @@ manipulation of cellular automata generations
 # import os
 # import sys
 from collections.abc import Iterable
-from typing import Hashable
+from typing import Hashable, Optional
 # from threading import Lock
 
 # related third party imports
@@ -19,7 +19,11 @@ from typing import Hashable
 # local application/library specific imports
 import automata_typehints as AHint
 from automata_universe import AutomataUniverse
-from automata_transforms import AutomataTransforms
+from automata_transforms import AutomataTransforms, shared_transforms
+from automata_engine import AutomataEngine
+from automata_convolution import select_engine
+from automata_history import AutomataHistory, StopConditions, RunResult, STOP_GENERATIONS
+from automata_clusters import CellCluster, cluster_cells, normalize_cells
 
 # class AutomataCells:
 #     """Storage and operations for a group of cells in an AutomataUniverse
@@ -42,21 +46,56 @@ class Automaton:
     :type iteration: int
     :property population: the number of living cells in the current generation
     :type population: int
+    :property period: cycle length when the current generation repeats a remembered generation
+    :type period: int or None
+    :property translation: period and displacement when the current generation is a translated
+        copy of a remembered generation. Only found when track_translation is on, or during
+        advance
+    :type translation: tuple of int and universe cell address tuple, or None
+    :property track_translation: remember the translation normalized shape of every stepped
+        generation, not just the generations stepped by advance
+    :type track_translation: bool
+    :property engine: the engine used to step generations
+    :type engine: AutomataEngine
     """
 
-    def __init__(self, universe: AutomataUniverse) -> None:
+    def __init__(self, universe: AutomataUniverse, history_limit: int = 64,
+            engine: Optional[AutomataEngine] = None,
+            transforms: Optional[AutomataTransforms] = None) -> None:
         """constructor
 
         :param universe: parent cellular automata universe configuration
         :type universe: AutomataUniverse
+        :param history_limit: the maximum number of generation fingerprints to remember
+        :type history_limit: int
+        :param engine: the engine to step generations with, default the engine from select_engine
+        :type engine: AutomataEngine
+        :param transforms: the transforms to start with, default the shared empty transforms
+            for the universe. Frozen (shared) transforms are forked before adding to them.
+        :type transforms: AutomataTransforms
+        :raises: TypeError, ValueError
         """
         self._universe = universe
+        self.engine = select_engine(universe) if engine is None else engine
         self._generation = set()
         self._iteration = 0
-        self._transforms = AutomataTransforms(universe)
+        if transforms is None:
+            transforms = shared_transforms(universe)
+        elif not isinstance(transforms, AutomataTransforms):
+            raise TypeError((type(transforms), "transforms is not an AutomataTransforms"))
+        elif transforms._universe != universe: # pylint: disable=W0212
+            raise ValueError("transforms universe does not match the automaton universe")
+        self._transforms = transforms
+        self._history = AutomataHistory(history_limit)
+        self._track_translation = False
+        self._expanded_neighbourhood = None
 
     # properties : getter, setter, deleter methods
 
+    @property
+    def universe(self) -> AutomataUniverse:
+        return self._universe
+
     @property
     def dimensions(self) -> int:
         return self._universe.dimensions
@@ -110,12 +149,74 @@ class Automaton:
     def generation_extent(self) -> AHint.BoundingBoxType:
         return self._get_extent(self.generation)
 
+    @property
+    def period(self) -> Optional[int]:
+        return self._history.period
+
+    @property
+    def translation(self) -> Optional[AHint.TranslationPeriodType]:
+        return self._history.translation
+
+    @property
+    def track_translation(self) -> bool:
+        return self._track_translation
+
+    @track_translation.setter
+    def track_translation(self, new_state: bool) -> None:
+        """set whether every stepped generation is checked for translated copies
+
+        Normalizing each generation costs more than stepping it with the faster engines, so
+        this is off by default.
+
+        :param new_state: record the normalized shape of every generation
+        :type new_state: bool
+        :raises: TypeError
+        """
+        if not isinstance(new_state, bool):
+            raise TypeError((type(new_state), "track translation is not a boolean"))
+        self._track_translation = new_state
+    # end track_translation() property setter
+
+    @property
+    def engine(self) -> AutomataEngine:
+        return self._engine
+
+    @engine.setter
+    def engine(self, new_engine: AutomataEngine) -> None:
+        """set the engine used to step generations
+
+        :param new_engine: engine for the same universe configuration
+        :type new_engine: AutomataEngine
+        :raises: TypeError, ValueError
+        """
+        if not isinstance(new_engine, AutomataEngine):
+            raise TypeError((type(new_engine), "engine is not an AutomataEngine"))
+        if new_engine.universe != self._universe:
+            raise ValueError("engine universe does not match the automaton universe")
+        self._engine = new_engine
+    # end engine() property setter
+
     # end of property methods
 
     # general methods
 
     def clear(self) -> None:
         self._generation.clear()
+        self._history.clear()
+
+    def __enter__(self) -> 'Automaton':
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """release resources held by the engine, such as the worker pool of an IslandEngine
+
+        The current engine is closed whether the automaton created it or was given it. Engines
+        replaced through the engine property are left for their owner to close.
+        """
+        self._engine.close()
 
     def __hash__(self) -> int:
         # hash of the configuration and dynamic data of the automaton
@@ -154,14 +255,11 @@ class Automaton:
         # NOTE  return_value[0] is the offset vector need to move the normalized
         #       block back to its original location
         # """
-        bounding_box = self._get_extent(cells)
-        offset_vector = [-1 * delta for delta in bounding_box[0]]
-        normalized = self._universe.cell_group_translate(cells, offset_vector)
-        # n_max = self._universe.cell_group_translate(bounding_box, offset_vector)
-        # print("bb", bounding_box, "offset bb", n_max) # DEBUG
+        if not cells:
+            return self._get_extent(cells)
+        (normalized, bounding_box) = normalize_cells(cells)
         cells.clear()
         cells.update(normalized)
-        # return (tuple(offset_vector), n_max[1])
         return bounding_box
     # end def _normalize_cells()
 
@@ -177,26 +275,234 @@ class Automaton:
         # a tuple is iterable, so need to be careful with the single case test
         if self._universe.is_universe_address(cells):
             self._generation.add(cells)
+            self._history.clear()
             return
         if not isinstance(cells, Iterable):
             raise TypeError((type(cells), "cells object must be iterable"))
         for addr in cells:
             self._universe.validate_address(addr)
         self._generation.update(cells)
+        # the remembered generations no longer lead to the current generation
+        self._history.clear()
     # end merge_cells()
 
     def step(self) -> None:
         """iterate from the current generation to the next"""
-        next_generation = self._universe.step(self.generation)
-        # self.generation = next_generation
+        self._step(self._track_translation)
+
+    def _step(self, with_shape: bool) -> None:
+        """iterate to the next generation, and remember it
+
+        :param with_shape: also remember the translation normalized shape of the generation
+        :type with_shape: bool
+        """
+        if len(self._history) == 0:
+            self._record_generation(with_shape)
+        next_generation = self._engine.step(self._generation)
+        # engines return a new set, which becomes the current generation
+        self._generation = next_generation if isinstance(next_generation, set) else \
+            set(next_generation)
+        self._iteration += 1
+        self._record_generation(with_shape)
+    # end def _step()
+
+    def _record_generation(self, with_shape: bool) -> None:
+        """add the current generation, and optionally its normalized shape, to the history
+
+        :param with_shape: also remember the translation normalized shape of the generation
+        :type with_shape: bool
+        """
+        shape = None
+        if with_shape and self._generation:
+            normalized = set(self._generation)
+            extent = self._normalize_cells(normalized)
+            shape = (normalized, extent[0])
+        self._history.record(self._iteration, self._generation, shape)
+    # end def _record_generation()
+
+    def advance(self, generations: int, detect_repeats: bool = True) -> None:
+        """move forward a number of generations
+
+        Generations are stepped until the history shows that the current generation is a
+        translated (or unmoved) copy of an earlier generation. The history only compares
+        fingerprints, so the match is confirmed by stepping a copy of the generation through
+        one period. After that, the target generation is reached directly: the remaining
+        generations are whole periods, each moving the pattern by the same displacement, plus
+        less than one period of steps.
+
+        Without repeat detection, nothing is remembered for the generations in between, and
+        the whole run is handed to the engine advance, which can keep its own working form
+        of the cells from the first generation to the last.
+
+        :param generations: the number of generations to move forward
+        :type generations: int
+        :param detect_repeats: look for repeats to jump over, recording every generation
+        :type detect_repeats: bool
+        :raises: TypeError, ValueError
+        """
+        self._check_generations(generations)
+        if not isinstance(detect_repeats, bool):
+            raise TypeError((type(detect_repeats), "detect_repeats is not a boolean"))
+        if not detect_repeats:
+            if generations == 0:
+                return
+            next_generation = self._engine.advance(self._generation, generations)
+            self._generation = next_generation if isinstance(next_generation, set) else \
+                set(next_generation)
+            self._iteration += generations
+            # remembered generations are not followed by the current one any more
+            self._history.clear()
+            self._record_generation(self._track_translation)
+            return
+        target = self._iteration + generations
+        if not self._track_translation:
+            # earlier generations were remembered without their shapes
+            self._history.clear()
+            self._record_generation(True)
+        while self._iteration < target:
+            if self._history.translation is not None and self._fast_forward(
+                    target - self._iteration, self._history.translation):
+                break
+            self._step(True)
+    # end def advance()
+
+    def _repeats(self, cells: AHint.CellGroupType,
+            translation: AHint.TranslationPeriodType) -> bool:
+        """check that a group of cells really is a translating or oscillating pattern
+
+        :param cells: living cells
+        :type cells: «frozen»set of universe cell address tuples
+        :param translation: period and displacement found from the generation fingerprints
+        :type translation: tuple of int and universe cell address tuple
+        :returns: stepping the cells through one period gives the cells moved by the
+            displacement
+        :rtype: bool
+        """
+        (period, displacement) = translation
+        return self._engine.advance(cells, period) == \
+            self._universe.cell_group_translate(cells, displacement)
+    # end def _repeats()
+
+    def _fast_forward(self, generations: int, translation: AHint.TranslationPeriodType) -> bool:
+        """jump forward over whole periods of a translating or oscillating pattern
+
+        :param generations: the number of generations to move forward
+        :type generations: int
+        :param translation: period and displacement of the current generation
+        :type translation: tuple of int and universe cell address tuple
+        :returns: the pattern repeats, and the generations were moved forward
+        :rtype: bool
+        """
+        (period, displacement) = translation
+        if not self._repeats(self._generation, translation):
+            # fingerprint collision: not the same shape after all
+            return False
+        (periods, remainder) = divmod(generations, period)
+        for _count in range(remainder):
+            self._step(True)
+        if periods == 0:
+            return True
+        offset_vector = tuple(periods * delta for delta in displacement)
+        moved = self._universe.cell_group_translate(self._generation, offset_vector)
         self._generation.clear()
-        self._generation.update(next_generation)
-    # end def step()
+        self._generation.update(moved)
+        self._iteration += periods * period
+        # remembered iterations and locations do not match the moved generation
+        self._history.clear()
+        self._record_generation(True)
+        return True
+    # end def _fast_forward()
+
+    def object_period(self, cells: AHint.CellGroupType, max_period: int = 64) \
+            -> Optional[AHint.TranslationPeriodType]:
+        """period and displacement of an isolated group of cells
+
+        The cells are stepped on their own, without the rest of the current generation, until
+        they repeat a translated (or unmoved) copy of an earlier generation.
+
+        :param cells: universe cell addresses of the object
+        :type cells: «frozen»set of cell address tuples
+        :param max_period: the maximum number of generations to step
+        :type max_period: int
+        :returns: period and displacement per period, or None when the cells die out or do
+            not repeat within max_period generations
+        :rtype: tuple of int and universe cell address tuple, or None
+        :raises: TypeError, ValueError
+        """
+        self._check_generations(max_period)
+        history = AutomataHistory(max_period + 1)
+        working = set(cells)
+        for iteration in range(max_period + 1):
+            if not working:
+                return None
+            normalized = set(working)
+            extent = self._normalize_cells(normalized)
+            history.record(iteration, working, (normalized, extent[0]))
+            if history.translation is not None and self._repeats(working, history.translation):
+                return history.translation
+            working = self._engine.step(working)
+        return None
+    # end def object_period()
+
+    def run(self, generations: int, conditions: Optional[StopConditions] = None) -> RunResult:
+        """iterate through generations until a stop condition is reached
+
+        Extinction always ends the run. Other conditions are configurable.
+
+        :param generations: the maximum number of generations to step
+        :type generations: int
+        :param conditions: conditions that end the run early
+        :type conditions: StopConditions
+        :returns: why and when the run stopped
+        :rtype: RunResult
+        :raises: TypeError, ValueError
+        """
+        self._check_generations(generations)
+        if conditions is None:
+            conditions = StopConditions()
+        for _count in range(generations):
+            self.step()
+            reason = self._history.check(conditions, self._generation,
+                self._get_extent(self._generation))
+            if reason is not None:
+                return RunResult(reason, self._iteration, self._history.period)
+        return RunResult(STOP_GENERATIONS, self._iteration, self._history.period)
+    # end def run()
+
+    @staticmethod
+    def _check_generations(generations: int) -> None:
+        """check that a number of generations is valid
+
+        :param generations: the number of generations
+        :type generations: int
+        :raises: TypeError, ValueError
+        """
+        if not isinstance(generations, int):
+            raise TypeError((type(generations), "number of generations is not an integer"))
+        if generations < 0:
+            raise ValueError((generations, "number of generations can not be negative"))
+    # end def _check_generations()
 
     def add_transform(self, key: Hashable, transform: AHint.TransformInputType) -> None:
+        if self._transforms.frozen:
+            self._transforms = self._transforms.fork()
         self._transforms.add_transform_cycle(key, transform)
     # end def add_transform()
 
+    def load_symmetry_transforms(self) -> int:
+        """use every symmetry of the universe neighbourhood, instead of adding transforms
+
+        :returns: the number of transforms, including the identity
+        :rtype: int
+        """
+        if self._transforms.transform_count == 0:
+            self._transforms = shared_transforms(self._universe, symmetry=True)
+            return self._transforms.group_order
+        if self._transforms.frozen:
+            self._transforms = self._transforms.fork()
+        return self._transforms.load_symmetry_group()
+    # end def load_symmetry_transforms()
+
     # def erase_cells(self, cells: AutomataTypeHints.cell_or_cells_type):
         # """delete living cells from the current generation
 
@@ -205,31 +511,71 @@ class Automaton:
         # :param cells:
         # :type cells: single cell address tuple or iterable of cell address tuples
         # """
-    # def _get_expanded_neighborhood(self) -> AutomataTypeHints.neighbourhood_type:
-        # """neighbourhood that covers as far as it is possible of a cell to interact
-
-        # Is the union of the standard neighbourhood of every neighbourhood address an accurate
-        # representation of the extended neighbourhood? It should be for a `normal` cellular
-        # automata neighbourhood. Will it be for all possible special cases? With the
-        # neighbour symmetry rule enforced in this code, it SHOULD work.
-    #     :returns increased_neighbourhood: address of all cells that could interact with the
-        #         origin cell in the next generation
-        # :rtype: frozenset of cell address tuples
-        # """
-    # def get_connected_cells(self, address: AutomataTypeHints.address_type) -> AutomataTypeHints.neighbourhood_type:
-        # """set of cells that interact with the start cell and each other
+    def _get_expanded_neighborhood(self) -> AHint.NeighbourhoodType:
+        """neighbourhood that covers as far as it is possible of a cell to interact
 
-        # Collect all cells that are in the extended neighbourhood of the starting cell, and the
-        # extended neighborhoods of those neighbours recursively.
+        Is the union of the standard neighbourhood of every neighbourhood address an accurate
+        representation of the extended neighbourhood? It should be for a `normal` cellular
+        automata neighbourhood. Will it be for all possible special cases? With the
+        neighbour symmetry rule enforced in this code, it SHOULD work.
 
-        # The extended neighbourhood needs to be used, because empty standard neighbourhood cells
-        # at the edge of the group can be affected by existing cell one step (unit) further away.
+        Two living cells can only affect the same cell in the next generation when one is in
+        the neighbourhood of the other, or both have a common neighbour.
 
-        # :param address:
-        # :type: tuple of integer dimension coordinates
-        # :returns connected_set:
-        # :rtype: frozenset of cell address tuples
-        # """
+        :returns increased_neighbourhood: address of all cells that could interact with the
+                origin cell in the next generation
+        :rtype: frozenset of cell address tuples
+        """
+        if self._expanded_neighbourhood is None:
+            expanded = set(self.neighbourhood)
+            for address in self.neighbourhood:
+                expanded.update(self._universe.neighbours(address))
+            expanded.discard(tuple([0] * self.dimensions))
+            self._expanded_neighbourhood = frozenset(expanded)
+        return self._expanded_neighbourhood
+    # end def _get_expanded_neighborhood()
+
+    def get_connected_cells(self, address: AHint.CellAddressType) -> AHint.CellGroupSnapshotType:
+        """set of cells that interact with the start cell and each other
+
+        Collect all cells that are in the extended neighbourhood of the starting cell, and the
+        extended neighborhoods of those neighbours recursively.
+
+        The extended neighbourhood needs to be used, because empty standard neighbourhood cells
+        at the edge of the group can be affected by existing cell one step (unit) further away.
+
+        :param address:
+        :type: tuple of integer dimension coordinates
+        :returns connected_set: living cells connected to address, empty when the address is
+            not a living cell
+        :rtype: frozenset of cell address tuples
+        """
+        self._universe.validate_address(address)
+        if address not in self._generation:
+            return frozenset()
+        offsets = self._get_expanded_neighborhood()
+        connected = {address}
+        pending = [address]
+        while pending:
+            cell = pending.pop()
+            for offset in offsets:
+                neighbour = tuple(base + delta for base, delta in zip(cell, offset))
+                if neighbour in self._generation and neighbour not in connected:
+                    connected.add(neighbour)
+                    pending.append(neighbour)
+        return frozenset(connected)
+    # end def get_connected_cells()
+
+    def get_clusters(self) -> list[CellCluster]:
+        """split the current generation into groups of interacting cells
+
+        Cells in different clusters can not affect the same cell in the next generation.
+
+        :returns: connected groups of cells, with their bounding boxes
+        :rtype: list of CellCluster
+        """
+        return cluster_cells(self._generation, self._get_expanded_neighborhood())
+    # end def get_clusters()
 # end class Automaton
 
 
@@ -11,8 +11,12 @@ some purely mathematical operations
 import os  # DEBUG
 import signal
 # end needed to use `kill -SIGUSR1 «pid»` to attach pdb to running session
+from fractions import Fraction
 from typing import Iterable, Hashable, Union
 
+# related third party imports
+import numpy as np
+
 
 # def local_function_definition(«arguments»…):
 # def local_function_definition(«[argument«: «type»»[, …]»):
@@ -83,46 +87,37 @@ def matrix_transform(operation: Iterable[Iterable[int]], matrix: Iterable[Iterab
     transpose = matrix_transpose(matrix)
     return tuple(vector_dot_product(row, transpose) for row in operation)
 
-def matrix_determinant(matrix: Iterable[Iterable[int]]) -> Union[int, float]:
-    """calculated the determinant of a square matrix
+def matrix_determinant(matrix: Iterable[Iterable[int]]) -> int:
+    """calculated the exact determinant of a square integer matrix
 
-    The reference code used does not look at all pythonic. Direct translation from C.
+    Fraction free (Bareiss) elimination: every division is exact, so the intermediate values
+    stay integers, and never grow beyond the size of a minor of the matrix.
 
     :param matrix: the matrix
-    :type matrix: any iterable containing iterables of numbers.
+    :type matrix: any iterable containing iterables of integers.
                 The inner iterables are all the same size
     :returns: determinant of the matrix
-    :rtype: number
+    :rtype: int
     """
-    dim = len(matrix)
     mat = [list(row) for row in matrix] # make a fully indexable copy
-    temp = [0] * dim # temporary array for storing row
-    total = 1
-    det = 1 # initialize result
-
-    for i in range(dim): # traverse diagonal elements
-        index = i
-        while(index < dim and mat[index][i] == 0):
-            index += 1
-        if index == dim:
-            continue # the determinant is zero
-        if index != i: # swap diagonal element and index rows
-            for j in range(dim):
-                mat[index][j], mat[i][j] = mat[i][j], mat[index][j]
-            # determinant sign changes when shifting rows
-            det = det * int(pow(-1, index - i))
-        for j in range(dim): # diagonal row elements
-            temp[j] = mat[i][j]
-        for j in range(i + 1, dim): # traverse rows below diagonal element
-            num1 = temp[i]   # diagonal element
-            num2 = mat[j][i] # next row element
-            for k in range(dim): # traverse every column of row
-                # multiply to make diagonal element and next row element equal
-                mat[j][k] = (num1 * mat[j][k]) - (num2 * temp[k])
-            total = total * num1 # Det(kA) = kDet(A)
-    for i in range(dim): # product of diagonal elements is determinant
-        det = det * mat[i][i]
-    return int(det/total) # Det(kA)/k = Det(A)
+    dim = len(mat)
+    sign = 1
+    previous = 1 # pivot of the previous elimination step
+    for i in range(dim - 1):
+        if mat[i][i] == 0: # swap in a row with a non-zero pivot
+            for index in range(i + 1, dim):
+                if mat[index][i] != 0:
+                    mat[i], mat[index] = mat[index], mat[i]
+                    sign = -sign # determinant sign changes when swapping rows
+                    break
+            else:
+                return 0 # no pivot: the determinant is zero
+        pivot = mat[i][i]
+        for j in range(i + 1, dim):
+            for k in range(i + 1, dim):
+                mat[j][k] = (mat[j][k] * pivot - mat[j][i] * mat[i][k]) // previous
+        previous = pivot
+    return sign * mat[-1][-1] if dim > 0 else 1
 
 def matrix_determinant2(matrix: Iterable[Iterable[int]]) -> Union[int, float]:
     """calculated the determinant of a square matrix
@@ -167,6 +162,156 @@ def _recursive_matrix_determinant(matrix: list[list[Union[int, float]]],
     return total
 
 
+def matrix_inverse(matrix: Iterable[Iterable[int]]) -> tuple[tuple[int, ...]]:
+    """exact inverse of a unimodular (determinant ±1) integer matrix
+
+    Gauss-Jordan elimination with rational arithmetic, so the result is exact. Rotation and
+    reflection matrices are all unimodular.
+
+    :param matrix: square integer matrix
+    :type matrix: any iterable containing iterables of integers.
+                The inner iterables are all the same size
+    :returns: the integer matrix that multiplies with matrix to the identity
+    :rtype: tuple of tuples of integers
+    :raises: ValueError
+    """
+    mat = [[Fraction(value) for value in row] for row in matrix]
+    dim = len(mat)
+    inverse = [[Fraction(int(i == j)) for j in range(dim)] for i in range(dim)]
+    for i in range(dim):
+        index = next((index for index in range(i, dim) if mat[index][i] != 0), None)
+        if index is None:
+            raise ValueError((matrix, "singular matrix does not have an inverse"))
+        mat[i], mat[index] = mat[index], mat[i]
+        inverse[i], inverse[index] = inverse[index], inverse[i]
+        pivot = mat[i][i]
+        mat[i] = [value / pivot for value in mat[i]]
+        inverse[i] = [value / pivot for value in inverse[i]]
+        for j in range(dim):
+            factor = mat[j][i]
+            if j == i or factor == 0:
+                continue
+            mat[j] = [value - factor * base for value, base in zip(mat[j], mat[i])]
+            inverse[j] = [value - factor * base for value, base in zip(inverse[j], inverse[i])]
+    if any(value.denominator != 1 for row in inverse for value in row):
+        raise ValueError((matrix, "matrix inverse is not an integer matrix"))
+    return tuple(tuple(int(value) for value in row) for row in inverse)
+
+def matrix_power(matrix: Iterable[Iterable[int]], exponent: int) -> tuple[tuple[int, ...]]:
+    """integer power of a square integer matrix, by repeated squaring
+
+    Negative exponents are powers of the inverse, which must exist (unimodular matrix).
+
+    :param matrix: square integer matrix
+    :type matrix: any iterable containing iterables of integers.
+                The inner iterables are all the same size
+    :param exponent: the number of times to multiply the matrix by itself
+    :type exponent: int
+    :returns: matrix to the power of exponent
+    :rtype: tuple of tuples of integers
+    :raises: TypeError, ValueError
+    """
+    if not isinstance(exponent, int):
+        raise TypeError((type(exponent), "matrix power exponent must be an integer"))
+    base = tuple(tuple(row) for row in matrix)
+    if exponent < 0:
+        base = matrix_inverse(base)
+        exponent = -exponent
+    result = identity_matrix(len(base)) if base else ()
+    while exponent:
+        if exponent & 1:
+            result = matrix_transform(result, base)
+        exponent >>= 1
+        if exponent:
+            base = matrix_transform(base, base)
+    return result
+
+def integer_matrix_exponent(dimensions: int) -> int:
+    """a multiple of the order of every finite order integer matrix of a size
+
+    The minimal polynomial of a finite order integer matrix is a product of distinct
+    cyclotomic polynomials, with total degree no more than the matrix size. Each prime power
+    factor p^k of the order then has φ(p^k) ≤ dimensions. The result is the product of the
+    largest such prime power for each prime.
+
+    :param dimensions: the size of the square matrices
+    :type dimensions: int
+    :returns: common multiple of every possible finite matrix order
+    :rtype: int
+    """
+    exponent = 1
+    for prime in range(2, dimensions + 2):
+        if any(prime % factor == 0 for factor in range(2, prime)):
+            continue
+        power = prime
+        while power * prime - power <= dimensions: # φ(power · prime)
+            power *= prime
+        exponent *= power
+    return exponent
+
+def matrix_order(matrix: Iterable[Iterable[int]], exponent: int) -> Union[int, None]:
+    """multiplicative order of a square integer matrix: the smallest power that is the identity
+
+    The order must divide a known exponent (a multiple of every possible order). That power
+    is checked first, then the exponent is reduced, one prime factor at a time, while the
+    smaller power is still the identity. Every power is found by repeated squaring.
+
+    :param matrix: square integer matrix
+    :type matrix: any iterable containing iterables of integers.
+                The inner iterables are all the same size
+    :param exponent: positive multiple of the order, when the order is finite
+    :type exponent: int
+    :returns: the order of the matrix, or None when matrix^exponent is not the identity
+    :rtype: int or None
+    :raises: TypeError, ValueError
+    """
+    if not isinstance(exponent, int):
+        raise TypeError((type(exponent), "matrix order exponent must be an integer"))
+    if exponent < 1:
+        raise ValueError((exponent, "matrix order exponent must be positive"))
+    base = tuple(tuple(row) for row in matrix)
+    identity = identity_matrix(len(base))
+    if matrix_power(base, exponent) != identity:
+        return None
+    order = exponent
+    remaining = exponent
+    factor = 2
+    while remaining > 1:
+        if factor * factor > remaining:
+            factor = remaining # what is left is prime
+        if remaining % factor == 0:
+            while remaining % factor == 0:
+                remaining //= factor
+            while order % factor == 0 and matrix_power(base, order // factor) == identity:
+                order //= factor
+        factor += 1
+    return order
+
+def matrix_products(operations: Iterable[Iterable[Iterable[int]]],
+        matrices: Iterable[Iterable[Iterable[int]]]) -> np.ndarray:
+    """exact products of stacks of integer matrices
+
+    The stacks broadcast against each other, like numpy.matmul: a single matrix applies to
+    every matrix of the other stack. Products that could overflow 64 bit integers are
+    calculated with python integers instead.
+
+    :param operations: left hand matrices
+    :type operations: numpy (…, N, M) integer array, or nested iterables
+    :param matrices: right hand matrices
+    :type matrices: numpy (…, M, P) integer array, or nested iterables
+    :returns: operations[i] · matrices[i] for each pair
+    :rtype: numpy (…, N, P) integer (or object) array
+    """
+    left = np.asarray(operations)
+    right = np.asarray(matrices)
+    if left.size == 0 or right.size == 0:
+        return np.matmul(left, right)
+    bound = int(np.abs(left).max()) * int(np.abs(right).max()) * left.shape[-1]
+    if bound < 2 ** 63:
+        return np.matmul(left.astype(np.int64), right.astype(np.int64))
+    return np.matmul(left.astype(object), right.astype(object))
+
+
 def my_main(): # pragma: no cover
     """wrapper for test/start code so that variables do not look like constants"""
     dummy_start = identity_matrix(4)
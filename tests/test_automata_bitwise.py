@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+regression tests for the bit-parallel one dimensional engine
+"""
+
+import pytest
+from common_test_data import NEIGHBOURHOOD_1D
+from test_create_universe import base_universe_instance_2d
+from test_automata_engine import random_soup, reference_generations, assert_engine_matches
+from automata_universe import AutomataUniverse
+from automata_bitwise import BitwiseEngine
+from automata_convolution import select_engine
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+def test_bitwise_engine_packing() -> None:
+    """only 1 dimensional universes; packing keeps negative addresses"""
+    with pytest.raises(ValueError):
+        BitwiseEngine(base_universe_instance_2d())
+    engine = BitwiseEngine(AutomataUniverse(NEIGHBOURHOOD_1D, (1,), (1,)))
+    assert engine.offsets == (-1, 1)
+    assert engine.pack(set()) == (0, 0)
+    assert engine.pack({(-3,), (-1,), (2,)}) == (0b100101, -3)
+    assert engine.unpack(0b100101, -3) == {(-3,), (-1,), (2,)}
+    wide = {(coord,) for coord in range(-5000, 5000, 7)}
+    assert engine.unpack(*engine.pack(wide)) == wide
+    assert engine.pack({(9,), (1,)}) == ((1 << 8) | 1, 1)
+    assert engine.step(set()) == set()
+    assert isinstance(select_engine(AutomataUniverse(NEIGHBOURHOOD_1D, (1,), (1,))),
+        BitwiseEngine)
+
+def test_bitwise_engine_matches_reference() -> None:
+    """same generations as the universe neighbour counting"""
+    wide = ((-3,), (-2,), (-1,), (1,), (2,), (3,))
+    for (universe, cells) in (
+            (AutomataUniverse(NEIGHBOURHOOD_1D, (1,), (1,)), {(0,)}),
+            (AutomataUniverse(NEIGHBOURHOOD_1D, (0, 1), (1,)), random_soup(1, 20, 8, 2)),
+            (AutomataUniverse(wide, (2, 3, 4), (2, 3)), random_soup(1, 40, 20, 3)),
+            (AutomataUniverse(((-5,), (-2,), (2,), (5,)), (1, 4), (1, 2)),
+                frozenset((coord - 30,) for (coord,) in random_soup(1, 60, 25, 4)))):
+        assert_engine_matches(BitwiseEngine(universe), universe, cells, 12)
+    # cells too far apart for one integer use the reference neighbour counting
+    engine = BitwiseEngine(AutomataUniverse(NEIGHBOURHOOD_1D, (1,), (1,)))
+    far = {(0,), (1,), (10 ** 13,), (10 ** 13 + 1,)}
+    assert engine.step(far) == engine.universe.step(far)
+    assert engine.advance(far, 3) == reference_generations(engine.universe, far, 3)[-1]
+    with pytest.raises(ValueError):
+        engine.pack(far)
+    # and a generation that grows past the limit keeps going
+    edge = {(0,), ((1 << 24) - 4,)}
+    assert engine.advance(edge, 4) == reference_generations(engine.universe, edge, 4)[-1]
+
+def test_bitwise_engine_long_run() -> None:
+    """many generations stay in the packed form"""
+    engine = BitwiseEngine(AutomataUniverse(NEIGHBOURHOOD_1D, (1,), (1,)))
+    # rule 90 from a single cell: generation 2^k is the two cells at ±2^k
+    assert engine.advance({(0,)}, 1 << 16) == {(-(1 << 16),), (1 << 16,)}
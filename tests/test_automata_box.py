@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+regression tests for the Larger than Life box neighbourhood engine
+"""
+
+import itertools
+import pytest
+from test_create_universe import base_universe_instance_2d
+from test_automata_engine import random_soup, assert_engine_matches
+from automata_universe import AutomataUniverse
+from automata_box import BoxEngine, SeparableEngine, is_box_neighbourhood
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+def box_universe(dimensions: int, radius: int, survival, birth) -> AutomataUniverse:
+    """universe with a range radius Moore neighbourhood"""
+    return AutomataUniverse([cell for cell in itertools.product(range(-radius, radius + 1),
+        repeat=dimensions) if any(cell)], survival, birth)
+
+def test_box_engine_arguments() -> None:
+    """only box neighbourhoods, and positive integer tiles, are accepted"""
+    assert is_box_neighbourhood(base_universe_instance_2d())
+    plus = AutomataUniverse(((0, 1), (0, -1), (1, 0), (-1, 0)), (2, 3), (3,))
+    assert not is_box_neighbourhood(plus)
+    with pytest.raises(ValueError):
+        BoxEngine(plus)
+    with pytest.raises(TypeError):
+        BoxEngine(base_universe_instance_2d(), 8.0)
+    with pytest.raises(ValueError):
+        BoxEngine(base_universe_instance_2d(), 0)
+    engine = BoxEngine(box_universe(2, 3, range(8, 15), range(10, 14)))
+    assert engine.radius == (3, 3)
+    assert engine.tile == 64
+    assert engine.step(set()) == set()
+
+def test_box_engine_matches_reference() -> None:
+    """same generations as the universe neighbour counting, across tile borders"""
+    for (universe, tile, cells) in (
+            (base_universe_instance_2d(), 4, random_soup(2, 14, 70, 3)),
+            (box_universe(2, 3, range(8, 15), range(10, 14)), 5, random_soup(2, 20, 150, 2)),
+            (box_universe(1, 2, (1, 2), (2, 3)), 3, random_soup(1, 30, 14, 4)),
+            (box_universe(3, 1, (4, 5), (5,)), 64, random_soup(3, 5, 40, 5))):
+        assert_engine_matches(BoxEngine(universe, tile), universe, cells, 4)
+
+def test_separable_engine_matches_reference() -> None:
+    """per axis sums give the same generations as the universe neighbour counting"""
+    with pytest.raises(ValueError):
+        SeparableEngine(AutomataUniverse(((0, 1), (0, -1), (1, 0), (-1, 0)), (2, 3), (3,)))
+    for (universe, tile, cells) in (
+            (base_universe_instance_2d(), 4, random_soup(2, 14, 70, 3)),
+            (box_universe(2, 2, range(5, 10), range(6, 9)), 5, random_soup(2, 16, 100, 2)),
+            (box_universe(4, 1, range(8, 14), range(10, 13)), 4, random_soup(4, 4, 100, 5))):
+        assert_engine_matches(SeparableEngine(universe, tile), universe, cells, 4)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# coding=utf-8
+# pylint: disable=W0212
+
+"""
+regression tests for canonical forms of cell groups
+"""
+
+import pytest
+from test_create_universe import base_universe_instance_2d, base_universe_instance_3d
+from test_automata_engine import random_soup
+from common_test_data import ROTATE_MATRIX_2D_90
+from automata_transforms import AutomataTransforms
+from automata_canonical import PatternCanonicalizer, CanonicalForm
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+GLIDER_2D = frozenset(((0, 1), (1, 2), (2, 0), (2, 1), (2, 2)))
+
+def symmetric_canonicalizer(universe, digest_bits: int = 64) -> PatternCanonicalizer:
+    """canonicalizer for the full symmetry group of a universe"""
+    transforms = AutomataTransforms(universe)
+    transforms.load_symmetry_group()
+    return PatternCanonicalizer(transforms, digest_bits)
+
+def test_canonicalizer_arguments() -> None:
+    """bad constructor and object arguments"""
+    transforms = AutomataTransforms(base_universe_instance_2d())
+    with pytest.raises(TypeError):
+        PatternCanonicalizer(None)
+    with pytest.raises(ValueError):
+        PatternCanonicalizer(transforms, 32)
+    canonical = PatternCanonicalizer(transforms)
+    # no transforms: translation only
+    assert canonical.group_order == 1
+    with pytest.raises(ValueError):
+        canonical.canonical_form(frozenset())
+    with pytest.raises(TypeError):
+        canonical.canonical_form(((0, 0),))
+    with pytest.raises(TypeError):
+        canonical.canonical_forms((GLIDER_2D, frozenset(((0, 0), (0, 1.5)))))
+    with pytest.raises(ValueError):
+        canonical.canonical_forms((frozenset(((0, 0), (0, 1, 2))),))
+    # stored transforms are closed into a group
+    transforms.add_transform_cycle('rotate', ROTATE_MATRIX_2D_90)
+    assert PatternCanonicalizer(transforms).group_order == 4
+def test_canonical_form_invariant() -> None:
+    """every translated and transformed copy has the same canonical form"""
+    universe = base_universe_instance_2d()
+    canonical = symmetric_canonicalizer(universe)
+    translation = PatternCanonicalizer(AutomataTransforms(universe))
+    expected = canonical.canonical_form(GLIDER_2D)
+    assert isinstance(expected, CanonicalForm)
+    assert expected.digest < 2 ** 64
+    for matrix in universe.symmetry_group:
+        copy = universe.cell_group_translate(
+            universe.cell_group_transform(GLIDER_2D, matrix), (5, -9))
+        form = canonical.canonical_form(copy)
+        assert form[:2] == expected[:2]
+        # the transform and offset map the copy onto the canonical cells
+        image = universe.cell_group_transform(frozenset(copy),
+            canonical.transforms.group_transform(form.transform))
+        normalized = universe.cell_group_translate(image, tuple(-coord for coord in form.offset))
+        assert [min(axis) for axis in zip(*normalized)] == [0, 0]
+        assert translation.canonical_form(normalized).encoding == expected.encoding
+    # translation only does not identify reflections
+    mirror = frozenset((row, -col) for (row, col) in GLIDER_2D)
+    assert translation.canonical_form(mirror) != translation.canonical_form(GLIDER_2D)
+    assert canonical.canonical_form(mirror)[:2] == expected[:2]
+def test_canonical_forms_batch() -> None:
+    """batch results match single results, and distinguish different objects"""
+    universe = base_universe_instance_3d()
+    canonical = symmetric_canonicalizer(universe, 128)
+    objects = [random_soup(3, 4, population, seed) for seed in range(20)
+        for population in (3, 6)]
+    forms = canonical.canonical_forms(objects)
+    assert [form.digest for form in forms] == [canonical.canonical_form(cells).digest
+        for cells in objects]
+    assert max(form.digest for form in forms) >= 2 ** 64
+    for cells, form in zip(objects, forms):
+        rotated = frozenset((col, -row, plane + 3) for (row, col, plane) in cells)
+        assert canonical.canonical_form(rotated).encoding == form.encoding
+    # a large object uses row encoding
+    spread = frozenset(((0, 0, 0), (2 ** 22, 1, 0), (5, 2 ** 21, 3)))
+    form = canonical.canonical_form(spread)
+    assert form.encoding[1] == 0
+    assert canonical.canonical_form(frozenset((-plane, col, row)
+        for (row, col, plane) in spread)).encoding == form.encoding
+
+def test_canonical_form_wide() -> None:
+    """objects wider than 32 bit coordinates keep every coordinate in the encoding"""
+    canonical = symmetric_canonicalizer(base_universe_instance_3d())
+    wide = frozenset(((0, 0, 0), (2 ** 33, 5, 0), (7, 2 ** 33, 1)))
+    form = canonical.canonical_form(wide)
+    assert form.encoding[1] == 0
+    assert canonical.canonical_form(frozenset((row - 2 ** 40, col + 3, plane)
+        for (row, col, plane) in wide)).encoding == form.encoding
+    # differs from wide only above bit 32
+    shifted = frozenset(((0, 0, 0), (2 ** 33, 5, 0), (7 + 2 ** 32, 2 ** 33, 1)))
+    assert canonical.canonical_form(shifted).encoding != form.encoding
+    forms = canonical.canonical_forms([wide, shifted])
+    assert [item.encoding for item in forms] == [form.encoding,
+        canonical.canonical_form(shifted).encoding]
+    # an object keeps its packed form when batched with a wide one of the same population
+    glider_wide = frozenset(((0, 0), (0, 1), (1, 0), (2 ** 40, 0), (2 ** 40, 3)))
+    plane = symmetric_canonicalizer(base_universe_instance_2d())
+    mixed = plane.canonical_forms([GLIDER_2D, glider_wide])
+    assert mixed[0] == plane.canonical_form(GLIDER_2D)
+    assert mixed[0].encoding[1] != 0
+    assert mixed[1] == plane.canonical_form(glider_wide)
+    assert mixed[1].encoding[1] == 0
+    # a packing base above 32 bits, in 2 dimensions
+    assert plane.canonical_form(frozenset(((0, 0), (2 ** 40, 0)))).encoding != \
+        plane.canonical_form(frozenset(((0, 0), (2 ** 40 + 2 ** 32, 0)))).encoding
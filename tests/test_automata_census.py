@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# coding=utf-8
+# pylint: disable=W0212
+
+"""
+regression tests for the object census
+"""
+
+import pytest
+from test_create_universe import base_universe_instance_2d
+from common_test_data import NEIGHBOURHOOD_2D
+from automata_universe import AutomataUniverse
+from automata_transforms import AutomataTransforms
+from automata_canonical import PatternCanonicalizer
+from automaton import Automaton
+from automata_census import (ObjectCensus, KIND_STILL_LIFE, KIND_OSCILLATOR, KIND_SPACESHIP,
+    KIND_UNCLASSIFIED)
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+BLOCK_2D = ((0, 0), (0, 1), (1, 0), (1, 1))
+BLINKER_2D = ((0, 0), (0, 1), (0, 2))
+GLIDER_2D = ((0, 1), (1, 2), (2, 0), (2, 1), (2, 2))
+
+def place(cells: tuple, row: int, col: int, transpose: bool = False) -> tuple:
+    """copy of a pattern moved to a location, optionally with rows and columns swapped"""
+    return tuple((row + (cell[1] if transpose else cell[0]),
+        col + (cell[0] if transpose else cell[1])) for cell in cells)
+
+def settled_automaton() -> Automaton:
+    """an automaton holding several copies of a few common objects"""
+    instance = Automaton(base_universe_instance_2d())
+    instance.merge_cells(place(BLOCK_2D, 0, 0))
+    instance.merge_cells(place(BLOCK_2D, 0, 20))
+    instance.merge_cells(place(BLINKER_2D, 20, 0))
+    instance.merge_cells(place(BLINKER_2D, 20, 20, True))
+    instance.merge_cells(place(BLINKER_2D, 40, 0, True))
+    instance.merge_cells(place(GLIDER_2D, 40, 20))
+    instance.merge_cells(place(GLIDER_2D, 60, 0, True))
+    instance.merge_cells((60, 40))
+    return instance
+
+def test_census_arguments() -> None:
+    """bad constructor arguments"""
+    with pytest.raises(TypeError):
+        ObjectCensus(None)
+    with pytest.raises(ValueError):
+        ObjectCensus(Automaton(base_universe_instance_2d()), -1)
+def test_census_take() -> None:
+    """objects are classified once, then counted by canonical form"""
+    census = ObjectCensus(settled_automaton())
+    tally = census.take()
+    assert sorted(tally.values()) == [1, 2, 2, 3]
+    assert census.summary(tally) == {(KIND_STILL_LIFE, 1): 2, (KIND_OSCILLATOR, 2): 3,
+        (KIND_SPACESHIP, 4): 2, (KIND_UNCLASSIFIED, None): 1}
+    assert (census.known, census.misses, census.hits) == (4, 4, 4)
+    spaceships = [census.entry(encoding) for encoding in tally
+        if census.entry(encoding).kind == KIND_SPACESHIP]
+    assert [sorted(abs(coord) for coord in entry.displacement)
+        for entry in spaceships] == [[1, 1]]
+    assert census.take() == tally
+    assert (census.known, census.misses, census.hits) == (4, 4, 12)
+    # the automaton is not changed by the census
+    assert census.automaton.iteration == 0
+    assert census.take() == tally
+def test_census_table_persistence(tmp_path) -> None:
+    """a saved classification table makes repeat objects lookups in a new census"""
+    census = ObjectCensus(settled_automaton())
+    tally = census.take()
+    path = str(tmp_path / 'census.json')
+    census.save_table(path)
+    restored = ObjectCensus(settled_automaton())
+    assert restored.load_table(path) == 4
+    assert restored.take() == tally
+    assert (restored.misses, restored.hits) == (0, 8)
+    assert restored.summary(tally) == census.summary(tally)
+    for encoding in tally:
+        assert restored.entry(encoding) == census.entry(encoding)
+    assert ObjectCensus(Automaton(base_universe_instance_2d())).take() == {}
+
+def test_census_table_mismatch(tmp_path) -> None:
+    """tables only load into a census of the same universe and transforms, and max_period"""
+    census = ObjectCensus(settled_automaton())
+    tally = census.take()
+    path = str(tmp_path / 'census.json')
+    census.save_table(path)
+    with pytest.raises(ValueError):
+        ObjectCensus(Automaton(AutomataUniverse(NEIGHBOURHOOD_2D, frozenset((2, 3)),
+            frozenset((3, 6))))).load_table(path)
+    identity = PatternCanonicalizer(AutomataTransforms(census.automaton.universe))
+    with pytest.raises(ValueError):
+        ObjectCensus(settled_automaton(), canonicalizer=identity).load_table(path)
+    # a period longer than the max_period is unclassified
+    short = ObjectCensus(settled_automaton(), 2)
+    assert short.load_table(path) == 4
+    assert sorted(entry.population for entry in (short.entry(encoding) for encoding in tally)
+        if entry.kind == KIND_UNCLASSIFIED) == [1, 5]
+    assert short.take() == tally
+    assert (short.misses, short.hits) == (0, 8)
+    # unclassified objects are classified again with a longer max_period
+    short.save_table(path)
+    restored = ObjectCensus(settled_automaton())
+    assert restored.load_table(path) == 2
+    assert restored.take() == tally
+    assert (restored.misses, restored.hits) == (2, 6)
+    assert restored.summary(tally) == census.summary(tally)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+regression tests for packed cell keys and connected cluster labelling
+"""
+
+import pytest
+from common_test_data import (
+    NEIGHBOURHOOD_1D,
+    NEIGHBOURHOOD_2D,
+    NEIGHBOURHOOD_3D,
+)
+from automata_clusters import CellPacking, cells_extent, cluster_cells
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+PACKING_EXTENTS = (
+    ((-3,), (5,)),
+    ((-3, 7), (5, 9)),
+    ((0, 0, 0), (2, 3, 4)),
+)
+SEPARATED_2D = (
+    frozenset(((0, 0), (0, 1), (1, 0), (1, 1))),
+    frozenset(((0, 5), (0, 6), (0, 7))),
+    frozenset(((10, 10),)),
+    frozenset(((-7, -7), (-6, -5))),
+)
+
+def test_cells_extent() -> None:
+    """bounding box of cells"""
+    assert cells_extent(NEIGHBOURHOOD_1D) == ((-1,), (1,))
+    assert cells_extent(NEIGHBOURHOOD_2D) == ((-1, -1), (1, 1))
+    assert cells_extent(((4, -2, 9),)) == ((4, -2, 9), (4, -2, 9))
+def test_packing_round_trip() -> None:
+    """packed keys are unique and unpack to the original address"""
+    for extent in PACKING_EXTENTS:
+        packing = CellPacking(extent, 2)
+        assert packing.dimensions == len(extent[0])
+        keys = set()
+        for offset in NEIGHBOURHOOD_3D:
+            cell = tuple(low + abs(delta) for low, delta in zip(extent[0], offset))
+            key = packing.pack(cell)
+            assert packing.unpack(key) == cell
+            moved = tuple(coord + delta for coord, delta in zip(cell, offset))
+            assert packing.pack(moved) == key + packing.pack_offset(offset)
+            keys.add(key)
+        assert len(keys) == len(set(tuple(abs(delta) for delta in offset[:len(extent[0])])
+            for offset in NEIGHBOURHOOD_3D))
+    with pytest.raises(ValueError):
+        CellPacking(PACKING_EXTENTS[0], -1)
+    assert CellPacking.for_arrays(PACKING_EXTENTS[1], 2).strides == \
+        CellPacking(PACKING_EXTENTS[1], 2).strides
+    assert CellPacking.for_arrays(((0, 0), (1 << 32, 1 << 30)), 1) is None
+    assert CellPacking.for_arrays(((0, 0), (1 << 30, 1 << 30)), 1) is not None
+def test_cluster_cells() -> None:
+    """separated groups are found as individual clusters"""
+    assert not cluster_cells(set(), frozenset(NEIGHBOURHOOD_2D))
+    offsets = frozenset((row, col) for row in range(-2, 3) for col in range(-2, 3)
+        if (row, col) != (0, 0))
+    all_cells = frozenset().union(*SEPARATED_2D)
+    clusters = cluster_cells(all_cells, offsets)
+    assert len(clusters) == len(SEPARATED_2D)
+    assert frozenset(cluster.cells for cluster in clusters) == frozenset(SEPARATED_2D)
+    for cluster in clusters:
+        assert cluster.extent == cells_extent(cluster.cells)
+    clusters = cluster_cells(all_cells, frozenset(NEIGHBOURHOOD_2D))
+    assert frozenset(cluster.cells for cluster in clusters) == frozenset((
+        SEPARATED_2D[0], SEPARATED_2D[1], SEPARATED_2D[2],
+        frozenset(((-7, -7),)), frozenset(((-6, -5),)),
+    ))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+regression tests for the FFT convolution engine, and engine selection
+"""
+
+import itertools
+import numpy as np
+from test_create_universe import base_universe_instance_2d
+from test_automata_engine import random_soup, assert_engine_matches
+from test_automata_box import box_universe
+from automata_universe import AutomataUniverse
+from automata_engine import AutomataEngine
+from automata_sparse import SparseSeparableEngine
+from automata_box import BoxEngine, SeparableEngine
+from automata_sweep import SweepEngine
+from automata_convolution import ConvolutionEngine, select_engine
+from automaton import Automaton
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+def disc_universe(dimensions: int, radius: int, survival, birth) -> AutomataUniverse:
+    """universe with a neighbourhood of every address within euclidean distance radius"""
+    return AutomataUniverse([cell for cell in itertools.product(range(-radius, radius + 1),
+        repeat=dimensions) if any(cell) and sum(coord * coord for coord in cell)
+        <= radius * radius], survival, birth)
+
+def test_convolution_engine_kernel() -> None:
+    """the kernel marks exactly the neighbourhood"""
+    engine = ConvolutionEngine(base_universe_instance_2d())
+    assert engine.radius == (1, 1)
+    assert np.array_equal(engine.kernel, [[1, 1, 1], [1, 0, 1], [1, 1, 1]])
+    assert not engine.kernel.flags.writeable
+    assert engine.step(set()) == set()
+
+def test_convolution_engine_matches_reference() -> None:
+    """same generations as the universe neighbour counting, across tile borders"""
+    for (universe, tile, cells) in (
+            (base_universe_instance_2d(), 4, random_soup(2, 14, 70, 3)),
+            (disc_universe(2, 4, range(14, 26), range(14, 20)), 6, random_soup(2, 20, 160, 2)),
+            (AutomataUniverse(((-3,), (-1,), (1,), (3,)), (1, 2), (2,)), 3,
+                random_soup(1, 30, 14, 4)),
+            (disc_universe(3, 2, range(10, 20), range(12, 16)), 64, random_soup(3, 6, 80, 5))):
+        assert_engine_matches(ConvolutionEngine(universe, tile), universe, cells, 4)
+
+def test_select_engine() -> None:
+    """sorted rows for small 2d and 3d neighbourhoods, dense box engines for larger 2d and 3d
+    boxes, sparse counting for other product neighbourhoods, FFT for other large ones"""
+    plus = AutomataUniverse(((0, 1), (0, -1), (1, 0), (-1, 0)), (2, 3), (3,))
+    assert isinstance(select_engine(plus), SweepEngine)
+    assert isinstance(select_engine(base_universe_instance_2d()), SweepEngine)
+    cross = AutomataUniverse([cell for cell in itertools.product((-1, 0, 1), repeat=4)
+        if sum(map(abs, cell)) == 1], (2, 3), (3,))
+    assert type(select_engine(cross)) is AutomataEngine # pylint: disable=C0123
+    assert isinstance(select_engine(box_universe(4, 1, range(30, 40), range(30, 35))),
+        SparseSeparableEngine)
+    assert isinstance(select_engine(box_universe(2, 2, range(8, 12), range(8, 10))),
+        SweepEngine)
+    large_box = select_engine(box_universe(2, 5, range(30, 60), range(30, 40)))
+    assert type(large_box) is BoxEngine # pylint: disable=C0123
+    separable = select_engine(AutomataUniverse([cell for cell in
+        itertools.product((-2, -1, 0, 1, 2), (-2, -1, 0, 1, 2), (-1, 0, 1)) if any(cell)],
+        range(20, 40), range(20, 30)))
+    assert type(separable) is SeparableEngine # pylint: disable=C0123
+    assert separable.tile ** 3 <= 1 << 15
+    diagonals = AutomataUniverse(list(itertools.product((-3, -1, 1, 3), repeat=3)),
+        range(10, 20), range(10, 15))
+    assert isinstance(select_engine(diagonals), SparseSeparableEngine)
+    disc = disc_universe(2, 5, range(30, 50), range(30, 40))
+    assert isinstance(select_engine(disc), ConvolutionEngine)
+    assert isinstance(Automaton(disc).engine, ConvolutionEngine)
+    assert select_engine(disc_universe(4, 2, range(30, 50), range(30, 40))).tile ** 4 \
+        <= 1 << 18
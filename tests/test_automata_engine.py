@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# coding=utf-8
+# pylint: disable=W0212
+
+"""
+regression tests for cellular automata generation stepping engines
+"""
+
+import re
+import random
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from test_create_universe import (base_universe_instance_1d,
+    base_universe_instance_2d,
+    base_universe_instance_3d,
+)
+from automata_universe import AutomataUniverse
+from automaton import Automaton
+from automata_engine import AutomataEngine
+from automata_transforms import AutomataTransforms
+from automata_islands import IslandEngine
+from automata_object_cache import ObjectEvolutionCache
+from automata_quiescent import QuiescentEngine
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+def random_soup(dimensions: int, size: int, population: int, seed: int = 1) -> frozenset:
+    """repeatable random group of cells"""
+    generator = random.Random(seed)
+    return frozenset(tuple(generator.randrange(size) for _axis in range(dimensions))
+        for _cell in range(population))
+def scattered_soups(count: int, spacing: int, seed: int = 1) -> frozenset:
+    """many small 2d soups on a widely spaced grid"""
+    cells = set()
+    for index in range(count):
+        offset = (spacing * (index % 10), spacing * (index // 10))
+        cells.update(tuple(coord + delta for coord, delta in zip(cell, offset))
+            for cell in random_soup(2, 5, 12, seed + index))
+    return frozenset(cells)
+def reference_generations(universe, cells: frozenset, generations: int) -> list:
+    """generations from the universe neighbour counting"""
+    result = [set(cells)]
+    for _count in range(generations):
+        result.append(universe.step(result[-1]))
+    return result
+
+def assert_engine_matches(engine, universe, cells: frozenset, generations: int) -> None:
+    """an engine steps and advances to the same generations as the universe neighbour counting"""
+    expected = reference_generations(universe, cells, generations)
+    working = set(cells)
+    for generation in expected[1:]:
+        working = engine.step(working)
+        assert working == generation
+    assert engine.advance(cells, generations) == expected[-1]
+
+def test_reference_engine() -> None:
+    """the base engine matches the universe step"""
+    universe = base_universe_instance_2d()
+    engine = AutomataEngine(universe)
+    assert engine.universe is universe
+    cells = random_soup(2, 12, 60)
+    expected = reference_generations(universe, cells, 6)
+    assert engine.step(cells) == expected[1]
+    assert engine.advance(cells, 6) == expected[6]
+    with pytest.raises(TypeError, match=re.compile("engine universe is not an AutomataUniverse")):
+        AutomataEngine(None)
+def test_automaton_engine() -> None:
+    """automaton steps with the configured engine"""
+    universe = base_universe_instance_2d()
+    instance = Automaton(universe)
+    assert isinstance(instance.engine, AutomataEngine)
+    with pytest.raises(TypeError):
+        instance.engine = universe
+    with pytest.raises(ValueError):
+        instance.engine = AutomataEngine(base_universe_instance_3d())
+    instance.engine = IslandEngine(universe, workers=1)
+    cells = scattered_soups(6, 20)
+    instance.merge_cells(cells)
+    for expected in reference_generations(universe, cells, 5)[1:]:
+        instance.step()
+        assert instance.generation == expected
+    # closing the automaton shuts down the worker pool of its engine
+    with Automaton(universe, engine=IslandEngine(universe, workers=2)) as pooled:
+        pooled.merge_cells(cells)
+        pooled.step()
+        assert pooled.engine._executor is not None
+    assert pooled.engine._executor is None
+    instance.close()
+
+def test_island_engine_arguments() -> None:
+    """island engine configuration is validated"""
+    universe = base_universe_instance_1d()
+    for (lookahead, workers) in ((1.5, 1), (1, "2")):
+        with pytest.raises(TypeError):
+            IslandEngine(universe, lookahead, workers)
+    for (lookahead, workers) in ((0, 1), (1, 0)):
+        with pytest.raises(ValueError):
+            IslandEngine(universe, lookahead, workers)
+    assert IslandEngine(universe).workers >= 1
+def test_island_separation() -> None:
+    """cells further apart than the separation do not interact"""
+    engine = IslandEngine(base_universe_instance_1d(), workers=1)
+    assert engine._separation(1) == frozenset(((-2,), (-1,), (1,), (2,)))
+    assert len(engine._separation(3)) == 12
+def test_island_engine_results() -> None:
+    """stepping islands separately matches stepping the whole generation"""
+    universe = base_universe_instance_2d()
+    cells = scattered_soups(30, 16)
+    expected = reference_generations(universe, cells, 12)
+    for lookahead in (1, 3, 5):
+        engine = IslandEngine(universe, lookahead, workers=1)
+        assert engine.step(cells) == expected[1]
+        assert engine.advance(cells, 12) == expected[12]
+    with ThreadPoolExecutor(3) as pool:
+        engine = IslandEngine(universe, 4, workers=3, executor=pool)
+        assert engine.advance(cells, 12) == expected[12]
+        engine.close() # externally managed pool is left running
+        assert engine.step(cells) == expected[1]
+    with IslandEngine(universe, 4, workers=2) as engine:
+        assert engine.advance(cells, 12) == expected[12]
+        pool = engine._executor
+        assert engine.step(cells) == expected[1]
+        # one pool serves every call
+        assert engine._executor is pool
+    assert engine._executor is None
+    assert IslandEngine(universe).lookahead == 1
+def test_island_engine_cache() -> None:
+    """cached objects give the same generations as stepping them"""
+    universe = base_universe_instance_2d()
+    cells = scattered_soups(30, 16)
+    expected = reference_generations(universe, cells, 12)
+    cache = ObjectEvolutionCache(universe)
+    engine = IslandEngine(universe, 3, workers=1, cache=cache)
+    assert engine.cache is cache
+    assert engine.advance(cells, 12) == expected[12]
+    first = cache.statistics()
+    assert first.misses > 0
+    assert engine.advance(cells, 12) == expected[12]
+    second = cache.statistics()
+    assert second.misses == first.misses
+    assert second.hits > first.hits
+    with ThreadPoolExecutor(2) as pool:
+        engine = IslandEngine(universe, 2, workers=2, executor=pool, cache=cache)
+        assert engine.advance(cells, 12) == expected[12]
+    with pytest.raises(ValueError):
+        IslandEngine(base_universe_instance_1d(), cache=cache)
+def test_universe_hash_collision(monkeypatch) -> None:
+    """engines, caches and transforms are matched by universe configuration, not by hash"""
+    universe = base_universe_instance_2d()
+    other = AutomataUniverse(universe.neighbourhood, (2,), (3,))
+    instance = Automaton(universe)
+    cache = ObjectEvolutionCache(other)
+    engine = AutomataEngine(other)
+    transforms = AutomataTransforms(other)
+    monkeypatch.setattr(AutomataUniverse, '__hash__', lambda self: 0)
+    assert hash(universe) == hash(other)
+    with pytest.raises(ValueError):
+        instance.engine = engine
+    with pytest.raises(ValueError):
+        IslandEngine(universe, cache=cache)
+    with pytest.raises(ValueError):
+        Automaton(universe, transforms=transforms)
+
+def test_object_cache() -> None:
+    """least recently used entries are evicted"""
+    universe = base_universe_instance_2d()
+    with pytest.raises(TypeError):
+        ObjectEvolutionCache(universe, None)
+    with pytest.raises(ValueError):
+        ObjectEvolutionCache(universe, 0)
+    cache = ObjectEvolutionCache(universe, 2)
+    blinker = frozenset(((5, 5), (5, 6), (5, 7)))
+    block = frozenset(((0, 0), (0, 1), (1, 0), (1, 1)))
+    assert cache.advance(blinker) == {(4, 6), (5, 6), (6, 6)}
+    assert cache.advance(frozenset((row + 9, col - 3) for (row, col) in blinker)) == \
+        {(13, 3), (14, 3), (15, 3)}
+    assert cache.statistics() == (1, 1, 0, 1, 2)
+    assert cache.advance(block, 5) == set(block)
+    assert cache.advance(set(), 5) == set()
+    assert cache.advance(blinker, 2) == set(blinker)
+    assert cache.statistics() == (1, 3, 1, 2, 2)
+    assert cache.lookup(frozenset(((0, 0), (0, 1), (0, 2)))) is None
+    assert len(cache) == 2
+    cache.clear()
+    assert cache.statistics() == (0, 0, 0, 0, 2)
+
+def test_step_changes() -> None:
+    """births and deaths give the same generation as step"""
+    universe = base_universe_instance_2d()
+    cells = random_soup(2, 12, 60, 4)
+    (births, deaths) = universe.step_changes(cells)
+    assert not births & cells
+    assert deaths <= cells
+    assert (cells - deaths) | births == universe.step(cells)
+    # only the candidates are evaluated
+    assert universe.step_changes(cells, set()) == (set(), set())
+def test_quiescent_engine() -> None:
+    """frozen regions are skipped without changing the result"""
+    universe = base_universe_instance_2d()
+    cells = scattered_soups(12, 20)
+    expected = reference_generations(universe, cells, 40)
+    engine = QuiescentEngine(universe)
+    assert engine.active is None
+    working = set(cells)
+    for generation in range(1, 41):
+        working = engine.step(working)
+        assert working == expected[generation]
+    assert engine.quiet_generations == 39
+    assert engine.evaluated == len(engine._influenced(expected[39] ^ expected[38]))
+    assert engine.evaluated < len(engine._influenced(expected[39]))
+    # a generation that is not the previous result is evaluated in full
+    block = {(0, 0), (0, 1), (1, 0), (1, 1)}
+    assert engine.step(block) == block
+    assert engine.quiet_generations == 0
+    assert engine.evaluated == 16
+    assert engine.active == frozenset()
+    assert engine.step(block) == block
+    assert engine.evaluated == 0
+    engine.reset()
+    assert engine.active is None
+    assert Automaton(universe, engine=QuiescentEngine(universe)).engine.universe is universe
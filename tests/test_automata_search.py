@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# coding=utf-8
+# pylint: disable=W0212
+
+"""
+regression tests for pattern occurrence searches
+"""
+
+import pytest
+from test_create_universe import base_universe_instance_2d
+from automata_transforms import AutomataTransforms
+from automata_search import PatternFinder, PatternMatch
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+GLIDER_2D = frozenset(((0, 1), (1, 2), (2, 0), (2, 1), (2, 2)))
+BLOCK_2D = frozenset(((0, 0), (0, 1), (1, 0), (1, 1)))
+
+def symmetric_transforms() -> AutomataTransforms:
+    """transforms for the full symmetry group of the 2d universe"""
+    transforms = AutomataTransforms(base_universe_instance_2d())
+    transforms.load_symmetry_group()
+    return transforms
+
+def place(universe, cells, matrix, offset) -> frozenset:
+    """transformed copy of a pattern, moved to an offset"""
+    return frozenset(universe.cell_group_translate(
+        universe.cell_group_transform(cells, matrix), offset))
+
+def test_finder_arguments() -> None:
+    """bad constructor arguments"""
+    transforms = symmetric_transforms()
+    with pytest.raises(TypeError):
+        PatternFinder(None, GLIDER_2D)
+    with pytest.raises(TypeError):
+        PatternFinder(transforms, ((0, 0),))
+    with pytest.raises(ValueError):
+        PatternFinder(transforms, frozenset())
+    finder = PatternFinder(transforms, GLIDER_2D)
+    assert finder.orientations == 8
+    assert not finder.isolated
+    assert PatternFinder(transforms, BLOCK_2D).orientations == 1
+    assert PatternFinder(AutomataTransforms(base_universe_instance_2d()),
+        GLIDER_2D).orientations == 1
+    assert finder.find(set()) == []
+
+def test_find_orientations() -> None:
+    """every rotated and reflected copy is found at its own location"""
+    transforms = symmetric_transforms()
+    universe = transforms._universe
+    finder = PatternFinder(transforms, GLIDER_2D)
+    field = set()
+    placed = []
+    for index in range(transforms.group_order):
+        copy = place(universe, GLIDER_2D, transforms.group_transform(index), (index * 10, 5))
+        field |= copy
+        placed.append(copy)
+    matches = finder.find(field)
+    assert len(matches) == transforms.group_order
+    assert sorted(map(sorted, (match.cells for match in matches))) == \
+        sorted(map(sorted, placed))
+    for match in matches:
+        assert isinstance(match, PatternMatch)
+        image = place(universe, GLIDER_2D, transforms.group_transform(match.transform),
+            (0, 0))
+        low = tuple(min(coords) for coords in zip(*image))
+        assert place(universe, image, universe.identity_matrix,
+            tuple(delta - base for delta, base in zip(match.offset, low))) == match.cells
+
+def test_find_isolated() -> None:
+    """copies touching other living cells are only found when isolation is not needed"""
+    transforms = symmetric_transforms()
+    universe = transforms._universe
+    lonely = place(universe, BLOCK_2D, universe.identity_matrix, (0, 0))
+    crowded = place(universe, BLOCK_2D, universe.identity_matrix, (10, 0))
+    field = set(lonely | crowded | {(12, 2)})
+    assert len(PatternFinder(transforms, BLOCK_2D).find(field)) == 2
+    matches = PatternFinder(transforms, BLOCK_2D, True).find(field)
+    assert [match.cells for match in matches] == [lonely]
+    assert matches[0].offset == (0, 0)
+    # a glider is also inside a larger pattern, but not isolated there
+    field = set(GLIDER_2D | {(3, 3)})
+    assert len(PatternFinder(transforms, GLIDER_2D).find(field)) == 1
+    assert PatternFinder(transforms, GLIDER_2D, True).find(field) == []
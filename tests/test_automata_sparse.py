@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+regression tests for the sparse per axis counting engine
+"""
+
+from test_create_universe import base_universe_instance_2d
+from test_automata_engine import random_soup, assert_engine_matches
+from test_automata_box import box_universe
+from automata_universe import AutomataUniverse
+from automata_sparse import SparseSeparableEngine, neighbourhood_factors
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+def test_neighbourhood_factors() -> None:
+    """boxes, with or without the origin, factor; other shapes do not"""
+    assert neighbourhood_factors(base_universe_instance_2d()) == (((-1, 0, 1), (-1, 0, 1)),
+        True)
+    diagonal = AutomataUniverse(((1, 1), (1, -1), (-1, 1), (-1, -1)), (1, 2), (2,))
+    assert neighbourhood_factors(diagonal) == (((-1, 1), (-1, 1)), False)
+    plus = AutomataUniverse(((0, 1), (0, -1), (1, 0), (-1, 0)), (2, 3), (3,))
+    assert neighbourhood_factors(plus) is None
+    assert SparseSeparableEngine(plus).factors is None
+
+def test_sparse_engine_matches_reference() -> None:
+    """same generations as the universe neighbour counting, including the fallback"""
+    for (universe, cells) in (
+            (base_universe_instance_2d(), random_soup(2, 14, 70, 3)),
+            (box_universe(2, 2, range(5, 10), range(6, 9)), random_soup(2, 16, 100, 2)),
+            (AutomataUniverse(((1, 1), (1, -1), (-1, 1), (-1, -1)), (0, 1, 2), (2,)),
+                random_soup(2, 12, 40, 4)),
+            (AutomataUniverse(((0, 1), (0, -1), (1, 0), (-1, 0)), (2, 3), (3,)),
+                random_soup(2, 12, 60, 6)),
+            (box_universe(4, 1, range(8, 14), range(10, 13)), random_soup(4, 4, 100, 5))):
+        assert_engine_matches(SparseSeparableEngine(universe), universe, cells, 4)
+    engine = SparseSeparableEngine(base_universe_instance_2d())
+    assert engine.step(set()) == set()
+    far = {(0, 0), (0, 1), (0, 2), (1 << 62, 0), (1 << 62, 1), (1 << 62, 2)}
+    assert engine.step(far) == base_universe_instance_2d().step(far)
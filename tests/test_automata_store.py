@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# coding=utf-8
+# pylint: disable=W0212
+
+"""
+regression tests for the on-disk universe and transform group store
+"""
+
+import json
+import os
+import numpy as np
+import pytest
+from test_create_universe import base_universe_instance_2d, base_universe_instance_3d
+from common_test_data import ROTATE_MATRIX_2D_90, REFLECTION_MATRIX_2D_HORIZONTAL
+from automata_transforms import AutomataTransforms
+from automata_store import AutomataStore
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+def test_store_arguments(tmp_path) -> None:
+    """bad arguments"""
+    store = AutomataStore(tmp_path / 'cache')
+    assert os.path.isdir(store.directory)
+    with pytest.raises(TypeError):
+        AutomataStore(None)
+    with pytest.raises(TypeError):
+        store.symmetry_transforms(None)
+    with pytest.raises(TypeError):
+        store.transform_group(None)
+    with pytest.raises(ValueError):
+        store.transform_group(AutomataTransforms(base_universe_instance_2d()))
+    assert AutomataStore.universe_key(base_universe_instance_2d()) == \
+        AutomataStore.universe_key(base_universe_instance_2d())
+    assert AutomataStore.universe_key(base_universe_instance_2d()) != \
+        AutomataStore.universe_key(base_universe_instance_3d())
+
+def test_symmetry_warm_start(tmp_path) -> None:
+    """the stored symmetry group and Cayley table match a fresh calculation"""
+    universe = base_universe_instance_3d()
+    store = AutomataStore(str(tmp_path))
+    cold = store.symmetry_transforms(universe)
+    assert (store.hits, store.misses) == (0, 1)
+    warm = AutomataStore(str(tmp_path)).symmetry_transforms(universe)
+    assert warm.group_order == cold.group_order == 48
+    assert warm.group_transforms() == cold.group_transforms()
+    assert np.array_equal(warm.cayley_table, cold.cayley_table)
+    assert isinstance(warm.cayley_table, np.memmap)
+    assert warm.compose(5, warm.inverse(5)) == 0
+    # a different format version is ignored, and rewritten
+    header = os.path.join(str(tmp_path), AutomataStore.universe_key(universe), 'universe.json')
+    with open(header, 'w', encoding='utf-8') as header_file:
+        json.dump({'version': 0}, header_file)
+    store = AutomataStore(str(tmp_path))
+    assert store.symmetry_transforms(universe).group_order == 48
+    assert (store.hits, store.misses) == (0, 1)
+    assert store.symmetry_transforms(universe).group_order == 48
+    assert store.hits == 1
+
+def test_generated_group_warm_start(tmp_path) -> None:
+    """groups generated from added transforms are stored by their generators"""
+    def rotations() -> AutomataTransforms:
+        transforms = AutomataTransforms(base_universe_instance_2d())
+        transforms.add_transform_cycle('rotate', ROTATE_MATRIX_2D_90)
+        return transforms
+    store = AutomataStore(str(tmp_path))
+    assert store.transform_group(rotations()) == 4
+    warm = rotations()
+    assert store.transform_group(warm) == 4
+    assert (store.hits, store.misses) == (1, 1)
+    assert warm.group_index(ROTATE_MATRIX_2D_90) > 0
+    reflected = rotations()
+    reflected.add_transform_cycle('reflect', REFLECTION_MATRIX_2D_HORIZONTAL)
+    assert store.transform_group(reflected) == 8
+    assert store.misses == 2
+    # the symmetry group shares the universe entry with the generated groups
+    assert store.symmetry_transforms(base_universe_instance_2d()).group_order == 8
+    assert store.transform_group(rotations()) == 4
+    assert store.hits == 2
+
+def test_damaged_group_ignored(tmp_path) -> None:
+    """stored groups without the identity first, or that move the neighbourhood, are misses"""
+    store = AutomataStore(str(tmp_path))
+    cold = store.symmetry_transforms(base_universe_instance_2d())
+    folder = os.path.join(str(tmp_path), AutomataStore.universe_key(base_universe_instance_2d()))
+    matrices = np.load(os.path.join(folder, 'symmetry.npy'))
+    damaged = (matrices[::-1], np.concatenate((matrices[:1], matrices[1:] * 2)))
+    for stored in damaged:
+        np.save(os.path.join(folder, 'symmetry.npy'), stored)
+        store = AutomataStore(str(tmp_path))
+        universe = base_universe_instance_2d()
+        warm = store.symmetry_transforms(universe)
+        assert (store.hits, store.misses) == (0, 1)
+        assert warm.group_transforms() == cold.group_transforms()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""
+regression tests for the sorted row sweep engine
+"""
+
+from test_create_universe import base_universe_instance_2d
+from test_automata_engine import random_soup, assert_engine_matches
+from automata_universe import AutomataUniverse
+from automata_sweep import SweepEngine
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+def test_sweep_engine_matches_reference() -> None:
+    """same generations as the universe neighbour counting, for any neighbourhood shape"""
+    hexagonal = ((0, 1), (0, -1), (1, 0), (-1, 0), (1, -1), (-1, 1))
+    von_neumann_3d = ((0, 0, 1), (0, 0, -1), (0, 1, 0), (0, -1, 0), (1, 0, 0), (-1, 0, 0))
+    for (universe, cells) in (
+            (base_universe_instance_2d(), random_soup(2, 14, 70, 3)),
+            (AutomataUniverse(hexagonal, (3, 4), (2,)), random_soup(2, 16, 90, 2)),
+            (AutomataUniverse(von_neumann_3d, (1, 2), (1,)), random_soup(3, 8, 60, 4)),
+            (AutomataUniverse(((1, 1), (1, -1), (-1, 1), (-1, -1)), (0, 1, 2), (2,)),
+                frozenset((x - 20, y + 7) for (x, y) in random_soup(2, 12, 40, 6)))):
+        assert_engine_matches(SweepEngine(universe), universe, cells, 5)
+    engine = SweepEngine(base_universe_instance_2d())
+    assert engine.step(set()) == set()
+    assert engine.advance({(0, 0)}, 3) == set()
+    far = {(0, 0), (0, 1), (0, 2), (1 << 62, 0), (1 << 62, 1), (1 << 62, 2)}
+    assert engine.step(far) == base_universe_instance_2d().step(far)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# coding=utf-8
+# pylint: disable=W0212
+
+"""
+regression tests for symmetry reduced generations
+"""
+
+import pytest
+from test_create_universe import base_universe_instance_2d
+from test_automata_engine import random_soup, reference_generations
+from automata_symmetry import SymmetricPattern, SymmetricEngine
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+def d4_symmetric_soup(size: int, population: int, centre: tuple) -> frozenset:
+    """random 2d soup, copied to all 8 rotations and reflections around a centre"""
+    cells = set()
+    for (row, col) in random_soup(2, size, population):
+        for (first, second) in ((row, col), (col, row)):
+            for (row_sign, col_sign) in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+                cells.add((row_sign * first + centre[0], col_sign * second + centre[1]))
+    return frozenset(cells)
+
+def test_symmetric_pattern_stabiliser() -> None:
+    """the symmetries that map the pattern onto itself are detected"""
+    universe = base_universe_instance_2d()
+    pattern = SymmetricPattern(universe, d4_symmetric_soup(12, 30, (7, -3)))
+    assert len(pattern.stabiliser) == 8
+    assert pattern.stabiliser[0] == universe.identity_matrix
+    # centred between cells
+    block = frozenset(((0, 0), (0, 1), (1, 0), (1, 1)))
+    assert len(SymmetricPattern(universe, block).stabiliser) == 8
+    assert SymmetricPattern(universe, block).domain_population == 1
+    # only a reflection
+    pattern = SymmetricPattern(universe, frozenset(((0, 0), (0, 1), (0, 2), (1, 1))))
+    assert len(pattern.stabiliser) == 2
+    assert len(SymmetricPattern(universe, frozenset(((0, 0), (0, 1), (1, 1)))).stabiliser) == 2
+    with pytest.raises(ValueError):
+        SymmetricPattern(universe, block, (((2, 0), (0, 1)),))
+    with pytest.raises(TypeError):
+        SymmetricPattern(None, block)
+def test_symmetric_pattern_generations() -> None:
+    """stepping the fundamental domain gives the reference generations"""
+    universe = base_universe_instance_2d()
+    cells = d4_symmetric_soup(10, 25, (0, 0))
+    expected = reference_generations(universe, cells, 30)
+    pattern = SymmetricPattern(universe, cells)
+    assert pattern.domain_population * 4 < len(cells)
+    assert pattern.generation == expected[0]
+    for generation in range(1, 31):
+        pattern.step()
+        assert pattern.generation == expected[generation]
+    assert pattern.iteration == 30
+    empty = SymmetricPattern(universe, frozenset())
+    empty.advance(3)
+    assert empty.generation == set()
+def test_symmetric_engine() -> None:
+    """the engine keeps the reduced pattern between steps"""
+    universe = base_universe_instance_2d()
+    cells = d4_symmetric_soup(8, 16, (3, 4))
+    expected = reference_generations(universe, cells, 12)
+    engine = SymmetricEngine(universe)
+    working = set(cells)
+    for generation in range(1, 7):
+        working = engine.step(working)
+        assert working == expected[generation]
+    reduced = engine._pattern
+    assert engine.advance(working, 6) == expected[12]
+    assert engine._pattern is reduced
+    # an asymmetric generation still steps correctly
+    soup = random_soup(2, 10, 30)
+    assert engine.step(soup) == universe.step(set(soup))
@@ -8,6 +8,9 @@ regression tests for cellular automata universe transform management
 
 # import sys
 import re
+import itertools
+import gc
+import weakref
 from typing import Hashable
 # from collections import namedtuple
 # from _pytest._code.code import ExceptionInfo
@@ -36,8 +39,10 @@ from common_test_data import (
     BAD_NEIGHBOURHOOD_ELE_NOT_TUPLE,
     NOT_INTEGER_TYPE_SAMPLES,
 )
+from math_tools import matrix_power
+from automata_universe import AutomataUniverse
 from automata_transforms import (AutomataTransforms, TransformSequence, XformSequence,
-    _base_index, _check_transform_key
+    _base_index, _check_transform_key, shared_transforms
 )
 # avoid need to add parent directory to path
 # `pipenv run python -m pytest «»`
@@ -843,6 +848,119 @@ def test_generate_combinations_rot_ref_transpose_results_2d() -> None:
     assert frozenset(xform._scratch.primes.values()) == frozenset((
         (None, 0), *xform._index_to_transform.keys()))
 
+def square_matrix(dimensions: int, entry) -> tuple:
+    """build a transformation matrix from a function of the row and column"""
+    return tuple(tuple(entry(row, col) for col in range(dimensions))
+        for row in range(dimensions))
+def hyperoctahedral_transforms(dimensions: int) -> AutomataTransforms:
+    """transforms for a moore neighbourhood, with generators for the full symmetry group"""
+    universe = AutomataUniverse([cell for cell in itertools.product((-1, 0, 1),
+        repeat=dimensions) if any(cell)], [2, 3], [3])
+    xform = AutomataTransforms(universe)
+    xform.add_transform_cycle('rotate', square_matrix(dimensions, lambda row, col:
+        -1 if (row, col) == (0, 1) else int((row, col) == (1, 0) or row == col > 1)))
+    xform.add_transform_cycle('reflect', square_matrix(dimensions, lambda row, col:
+        (-1 if row == 0 else 1) if row == col else 0))
+    if dimensions > 2:
+        xform.add_transform_cycle('axes', square_matrix(dimensions, lambda row, col:
+            int(col == (row + 1) % dimensions)))
+    return xform
+def test_generate_transform_group_2d() -> None:
+    """closed group and cayley table for rotation and reflection in 2d"""
+    xform = AutomataTransforms(base_universe_instance_2d())
+    assert xform.group_order == 0
+    with pytest.raises(ValueError, match=re.compile("No transforms have been added yet")):
+        xform.generate_transform_group()
+    xform.add_transform_cycle('rotate 90°', ROTATE_MATRIX_2D_90)
+    assert xform.generate_transform_group() == 4
+    xform.add_transform_cycle('horizontal', REFLECTION_MATRIX_2D_HORIZONTAL)
+    # adding a cycle invalidates the generated group
+    assert xform.group_order == 0
+    assert xform.generate_transform_group() == 8
+    assert xform.group_transform(0) == IDENTITY_MATRIX_2D
+    for matrix in (TRANPOSE_MATRIX_2D, REFLECT_AND_ROTATE_2D, REFLECTION_MATRIX_2D_VERTICAL):
+        assert xform.group_transform(xform.group_index(matrix)) == matrix
+    for (left, right) in itertools.product(range(8), repeat=2):
+        assert xform.group_transform(xform.compose(left, right)) == xform._universe.\
+            matrix_transform(xform.group_transform(left), xform.group_transform(right))
+    for index in range(8):
+        assert xform.compose(index, xform.inverse(index)) == 0
+    with pytest.raises(ValueError):
+        xform.group_index(((2, 0), (0, 1)))
+    with pytest.raises(ValueError):
+        xform.compose(0, 8)
+    with pytest.raises(TypeError):
+        xform.inverse(None)
+    with pytest.raises(RecursionError):
+        xform.generate_transform_group(5)
+def test_generate_transform_group_nd() -> None:
+    """the full symmetry group of a hypercube grid"""
+    for (dimensions, order) in ((3, 48), (4, 384)):
+        xform = hyperoctahedral_transforms(dimensions)
+        assert xform.generate_transform_group() == order
+        table = xform.cayley_table
+        assert table.shape == (order, order)
+        # each row and column of a group multiplication table is a permutation
+        assert all(len(set(row)) == order for row in table.tolist())
+        assert all(len(set(col)) == order for col in table.T.tolist())
+        # associativity for a sample of elements
+        for (first, second, third) in itertools.product(range(0, order, order // 7), repeat=3):
+            assert table[table[first, second], third] == table[first, table[second, third]]
+def test_load_symmetry_group() -> None:
+    """the universe symmetry group is used without adding transforms"""
+    xform = AutomataTransforms(base_universe_instance_3d())
+    assert xform.load_symmetry_group() == 48
+    assert xform.group_transform(0) == IDENTITY_MATRIX_3D
+    assert xform.cayley_table.shape == (48, 48)
+    generated = hyperoctahedral_transforms(4)
+    generated.generate_transform_group()
+    loaded = hyperoctahedral_transforms(4)
+    assert loaded.load_symmetry_group() == 384
+    assert frozenset(loaded._group) == frozenset(generated._group)
+
+def test_add_transform_cycle_order_nd() -> None:
+    """cycle lengths come from the transform order, in higher dimensions"""
+    for dimensions in (4, 5):
+        xform = hyperoctahedral_transforms(dimensions)
+        assert xform._transform_cycles['rotate'] == 4
+        assert xform._transform_cycles['reflect'] == 2
+        assert xform._transform_cycles['axes'] == dimensions
+        for seq in range(1, dimensions):
+            assert xform._index_to_transform[TransformSequence('axes', seq)] == \
+                matrix_power(xform._index_to_transform[_base_index('axes')], seq)
+
+def test_shared_transforms() -> None:
+    """one frozen instance per universe configuration and transform set"""
+    universe = base_universe_instance_2d()
+    rotate = (('rotate', ROTATE_MATRIX_2D_90),)
+    shared = shared_transforms(universe, rotate)
+    assert shared.frozen
+    assert shared.group_order == 4
+    assert shared_transforms(base_universe_instance_2d(), rotate) is shared
+    assert shared_transforms(universe) is not shared
+    assert shared_transforms(universe, symmetry=True).group_order == 8
+    with pytest.raises(TypeError):
+        shared_transforms(None)
+    with pytest.raises(ValueError):
+        shared.add_transform_cycle('reflect', REFLECTION_MATRIX_2D_HORIZONTAL)
+    with pytest.raises(ValueError):
+        shared.load_symmetry_group()
+    with pytest.raises(ValueError):
+        shared.cayley_table[0, 0] = 1
+    forked = shared.fork()
+    assert not forked.frozen
+    forked.add_transform_cycle('reflect', REFLECTION_MATRIX_2D_HORIZONTAL)
+    assert forked.transform_count == 4
+    assert shared.transform_count == 3
+    assert forked.generate_transform_group() == 8
+    assert shared.group_order == 4
+    # the shared instance is not kept alive by the cache
+    released = weakref.ref(shared)
+    del shared, forked
+    gc.collect()
+    assert released() is None
+    assert shared_transforms(universe, rotate).group_order == 4
+
 def no_test_manual() -> None:
     """verify testing logic and «exception» results"""
     xform = AutomataTransforms(base_universe_instance_1d())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# coding=utf-8
+# pylint: disable=W0212
+
+"""
+regression tests for cellular automata generation management
+"""
+
+import re
+import pytest
+from test_create_universe import (base_universe_instance_1d,
+    base_universe_instance_2d,
+)
+import automata_history
+from automaton import Automaton
+from automata_history import (AutomataHistory, StopConditions, generation_fingerprint,
+    STOP_EXTINCT, STOP_STILL_LIFE, STOP_CYCLE, STOP_POPULATION, STOP_EXTENT, STOP_STABLE,
+    STOP_GENERATIONS)
+
+# remove need to add parent to path?
+# `pipenv run python -m pytest «»`
+# ? -q -v
+
+BLOCK_2D = ((0, 0), (0, 1), (1, 0), (1, 1))
+BLINKER_2D = ((0, 0), (0, 1), (0, 2))
+GLIDER_2D = ((0, 1), (1, 2), (2, 0), (2, 1), (2, 2))
+R_PENTOMINO_2D = ((0, 1), (0, 2), (1, 0), (1, 1), (2, 1))
+
+def automaton_instance_2d(cells: tuple) -> Automaton:
+    """create a standard 2d automaton containing the supplied cells"""
+    instance = Automaton(base_universe_instance_2d())
+    instance.merge_cells(cells)
+    return instance
+
+def test_load_symmetry_transforms() -> None:
+    """automaton transforms work without hand fed matrices"""
+    assert Automaton(base_universe_instance_2d()).load_symmetry_transforms() == 8
+    assert Automaton(base_universe_instance_1d()).load_symmetry_transforms() == 2
+
+def test_shared_transforms() -> None:
+    """automata share transforms until one of them adds its own"""
+    universe = base_universe_instance_2d()
+    (first, second) = (Automaton(universe), Automaton(base_universe_instance_2d()))
+    assert first._transforms is second._transforms
+    first.load_symmetry_transforms()
+    second.load_symmetry_transforms()
+    assert first._transforms is second._transforms
+    shared = second._transforms
+    second.add_transform('reflect', ((-1, 0), (0, 1)))
+    assert second._transforms is not shared
+    assert shared.frozen and shared.transform_count == 0
+    assert Automaton(universe, transforms=shared)._transforms is shared
+    with pytest.raises(TypeError):
+        Automaton(universe, transforms=universe)
+    with pytest.raises(ValueError):
+        Automaton(base_universe_instance_1d(), transforms=shared)
+
+def test_history_bad_limit() -> None:
+    """history limit is not a positive integer"""
+    with pytest.raises(TypeError, match=re.compile("history limit is not an integer")):
+        AutomataHistory(1.5)
+    for limit in (0, -1):
+        with pytest.raises(ValueError) as excinfo:
+            AutomataHistory(limit)
+        assert excinfo.value.args[0] == (limit, "history limit must be at least 1")
+def test_history_bounded() -> None:
+    """only the configured number of generations are remembered"""
+    history = AutomataHistory(3)
+    for iteration in range(10):
+        assert history.record(iteration, frozenset(((iteration, 0),))) is None
+        assert len(history) == min(iteration + 1, 3)
+    assert len(history._seen) == 3
+    # a period longer than the history is not seen
+    assert history.record(10, frozenset(((6, 0),))) is None
+    assert history.record(11, frozenset(((9, 0),))) == 2
+def test_fingerprint() -> None:
+    """fingerprint does not depend on the set type"""
+    assert generation_fingerprint(set(BLOCK_2D)) == generation_fingerprint(frozenset(BLOCK_2D))
+    assert generation_fingerprint(set())[0] == 0
+
+def test_step_iteration() -> None:
+    """stepping advances the generation sequence number"""
+    instance = automaton_instance_2d(BLINKER_2D)
+    assert instance.iteration == 0
+    instance.step()
+    assert instance.iteration == 1
+    assert instance.generation == frozenset(((-1, 1), (0, 1), (1, 1)))
+    assert instance.period is None
+    instance.step()
+    assert instance.period == 2
+
+def test_run_extinct() -> None:
+    """a dying pattern ends the run"""
+    instance = automaton_instance_2d(((0, 0), (0, 1)))
+    result = instance.run(100)
+    assert result.reason == STOP_EXTINCT
+    assert result.iteration == 1
+    assert instance.population == 0
+def test_run_still_life() -> None:
+    """a still life is detected after a single step"""
+    instance = automaton_instance_2d(BLOCK_2D)
+    assert instance.run(100) == (STOP_STILL_LIFE, 1, 1)
+def test_run_cycle() -> None:
+    """an oscillator is detected after one full period"""
+    instance = automaton_instance_2d(BLINKER_2D)
+    assert instance.run(100) == (STOP_CYCLE, 2, 2)
+    # cycle detection can be turned off
+    instance = automaton_instance_2d(BLINKER_2D)
+    assert instance.run(7, StopConditions(cycle=False)) == (STOP_GENERATIONS, 7, 2)
+def test_run_limits() -> None:
+    """configured limits end the run"""
+    instance = automaton_instance_2d(R_PENTOMINO_2D)
+    result = instance.run(100, StopConditions(population=10))
+    assert result.reason == STOP_POPULATION
+    assert instance.population > 10
+    instance = automaton_instance_2d(R_PENTOMINO_2D)
+    result = instance.run(100, StopConditions(extent=8))
+    assert result.reason == STOP_EXTENT
+    assert max(high - low for low, high in zip(*instance.generation_extent)) == 8
+    instance = automaton_instance_2d(GLIDER_2D)
+    assert instance.run(100, StopConditions(stable=6)) == (STOP_STABLE, 6, None)
+def test_run_merge_resets_history() -> None:
+    """merging cells invalidates the remembered generations"""
+    instance = automaton_instance_2d(BLOCK_2D)
+    instance.step()
+    assert instance.period == 1
+    instance.merge_cells((5, 5))
+    assert instance.period is None
+    assert len(instance._history) == 0
+def test_run_bad_generations() -> None:
+    """number of generations is not a non-negative integer"""
+    instance = Automaton(base_universe_instance_1d())
+    with pytest.raises(TypeError, match=re.compile("number of generations is not an integer")):
+        instance.run(None)
+    with pytest.raises(ValueError):
+        instance.run(-1)
+    assert instance.run(0) == (STOP_GENERATIONS, 0, None)
+
+def test_translation_detected() -> None:
+    """a spaceship is recognized as a translated copy of an earlier generation"""
+    instance = automaton_instance_2d(GLIDER_2D)
+    with pytest.raises(TypeError):
+        instance.track_translation = 1
+    for _count in range(4):
+        instance.step()
+    # shapes are only remembered when asked for
+    assert instance.translation is None
+    instance = automaton_instance_2d(GLIDER_2D)
+    instance.track_translation = True
+    for _count in range(3):
+        instance.step()
+        assert instance.translation is None
+    instance.step()
+    assert instance.translation == (4, (1, 1))
+    assert instance.period is None
+def test_advance_matches_step() -> None:
+    """jumping over whole periods gives the same generation as stepping"""
+    for cells in (GLIDER_2D, BLINKER_2D, BLOCK_2D):
+        stepped = automaton_instance_2d(cells)
+        for _count in range(103):
+            stepped.step()
+        jumped = automaton_instance_2d(cells)
+        jumped.advance(103)
+        assert jumped.iteration == stepped.iteration == 103
+        assert jumped.generation == stepped.generation
+    jumped = automaton_instance_2d(GLIDER_2D)
+    jumped.advance(4 * 10**6 + 1)
+    assert jumped.generation == frozenset((row + 10**6, col + 10**6)
+        for (row, col) in ((1, 0), (1, 2), (2, 1), (2, 2), (3, 1)))
+def test_advance_without_repeats() -> None:
+    """without repeat detection, the engine advances the whole run"""
+    stepped = automaton_instance_2d(R_PENTOMINO_2D)
+    for _count in range(60):
+        stepped.step()
+    advanced = automaton_instance_2d(R_PENTOMINO_2D)
+    advanced.advance(60, detect_repeats=False)
+    assert advanced.iteration == 60
+    assert advanced.generation == stepped.generation
+    assert advanced.period is None
+    advanced.advance(0, False)
+    assert advanced.iteration == 60
+    with pytest.raises(TypeError):
+        advanced.advance(1, None)
+    line = Automaton(base_universe_instance_1d())
+    line.merge_cells(((0,),))
+    line.advance(10**5, detect_repeats=False)
+    assert line.iteration == 10**5
+    assert line.generation == line.engine.advance({(0,)}, 10**5)
+def test_advance_fingerprint_collision(monkeypatch) -> None:
+    """shapes that only share a fingerprint are not jumped over"""
+    monkeypatch.setattr(automata_history, 'generation_fingerprint',
+        lambda cells: (len(cells), 0))
+    stepped = automaton_instance_2d(GLIDER_2D)
+    for _count in range(41):
+        stepped.step()
+    jumped = automaton_instance_2d(GLIDER_2D)
+    jumped.advance(41)
+    assert jumped.generation == stepped.generation
+    assert jumped.object_period(set(GLIDER_2D)) is None
+def test_object_period() -> None:
+    """period and displacement of isolated objects"""
+    instance = Automaton(base_universe_instance_2d())
+    assert instance.object_period(set(GLIDER_2D)) == (4, (1, 1))
+    assert instance.object_period(set(BLINKER_2D)) == (2, (0, 0))
+    assert instance.object_period(frozenset(BLOCK_2D)) == (1, (0, 0))
+    assert instance.object_period(set(((0, 0),))) is None
+    assert instance.object_period(set(R_PENTOMINO_2D), 10) is None
+    # the current generation is not involved
+    assert instance.population == 0
+
+def test_expanded_neighbourhood() -> None:
+    """cells that can interact with the origin within one generation"""
+    instance = Automaton(base_universe_instance_2d())
+    assert instance._get_expanded_neighborhood() == frozenset((row, col)
+        for row in range(-2, 3) for col in range(-2, 3) if (row, col) != (0, 0))
+    instance = Automaton(base_universe_instance_1d())
+    assert instance._get_expanded_neighborhood() == frozenset(((-2,), (-1,), (1,), (2,)))
+def test_connected_cells() -> None:
+    """cluster decomposition of the current generation"""
+    instance = automaton_instance_2d(BLOCK_2D)
+    instance.merge_cells(((0, 3), (0, 4), (0, 5)))
+    instance.merge_cells((9, 9))
+    assert instance.get_connected_cells((9, 9)) == frozenset(((9, 9),))
+    assert instance.get_connected_cells((3, 3)) == frozenset()
+    assert instance.get_connected_cells((0, 0)) == frozenset(BLOCK_2D + ((0, 3), (0, 4), (0, 5)))
+    clusters = instance.get_clusters()
+    assert sorted(len(cluster.cells) for cluster in clusters) == [1, 7]
+    assert frozenset().union(*(cluster.cells for cluster in clusters)) == instance.generation
@@ -8,8 +8,12 @@ regression tests for creation of cellular automata universe instances
 
 from typing import Iterable
 import re
+import itertools
+import gc
+import weakref
 from _pytest._code.code import ExceptionInfo
 import pytest
+import numpy as np
 from common_test_data import (
     NEIGHBOURHOOD_1D,
     NEIGHBOURHOOD_2D,
@@ -44,7 +48,7 @@ from common_test_data import (
 
     SQUARE_MATRIX_TRANSFORM_OPERATIONS_2D,
 )
-from automata_universe import AutomataUniverse
+from automata_universe import AutomataUniverse, array_cells
 
 # remove need to add parent to path?
 # `pipenv run python -m pytest «»`
@@ -916,6 +920,33 @@ def test_group_transform_result() -> None:
     for (cells, matrix, result) in GOOD_CELL_GROUP_TRANSFORM:
         assert uni.cell_group_transform(cells, matrix) == result
 
+def test_cell_array_bad_arguments() -> None:
+    """verify exception raised if cell array is not valid for universe"""
+    uni = base_universe_instance_2d()
+    with pytest.raises(TypeError, match=re.compile("cell array is not an integer numpy array")):
+        uni.cell_array_translate(((0, 0),), (1, 1))
+    with pytest.raises(TypeError):
+        uni.cell_array_transform(np.zeros((2, 2)), IDENTITY_MATRIX_2D)
+    with pytest.raises(ValueError, match=re.compile(r"is not \(N, 2\) shaped")):
+        uni.cell_array_translate(np.zeros((2, 3), dtype=int), (1, 1))
+    with pytest.raises(ValueError):
+        uni.cell_array_translate(np.zeros((2, 2), dtype=int), (1, 1, 1))
+    with pytest.raises(TypeError):
+        uni.cell_array(((0, 0),))
+def test_cell_array_result() -> None:
+    """batch array operations match the per cell group operations"""
+    uni = base_universe_instance_2d()
+    assert uni.cell_array(set()).shape == (0, 2)
+    for (cells, offset, result) in GOOD_CELL_GROUP_TRANSLATE:
+        cell_array = uni.cell_array(cells)
+        assert array_cells(cell_array) == set(cells)
+        assert uni.cell_array_translate(cell_array, offset, as_cells=True) == result
+        assert array_cells(uni.cell_array_translate(cell_array, offset)) == result
+    for (cells, matrix, result) in GOOD_CELL_GROUP_TRANSFORM:
+        cell_array = uni.cell_array(cells)
+        assert uni.cell_array_transform(cell_array, matrix, as_cells=True) == result
+        assert isinstance(uni.cell_array_transform(cell_array, matrix), np.ndarray)
+
 def test_rotate_matrix_non_iterable_matrix() -> None:
     """matrix test parameter is not iterable"""
     uni = base_universe_instance_2d()
@@ -934,6 +965,60 @@ def test_is_rotation_matrix_truth() -> None:
     for case in GOOD_ROTATION_MATRIX:
         assert uni.is_rotation_matrix(case) is True
 
+def test_symmetry_group() -> None:
+    """every neighbourhood symmetry is found, starting with the identity"""
+    for (uni, order) in ((base_universe_instance_1d(), 2), (base_universe_instance_2d(), 8),
+            (base_universe_instance_3d(), 48)):
+        group = uni.symmetry_group
+        assert len(group) == len(set(group)) == order
+        assert group[0] == uni.identity_matrix
+        for matrix in group:
+            assert uni.cell_group_transform(uni.neighbourhood, matrix) == uni.neighbourhood
+        # cached on the universe
+        assert uni.symmetry_group is group
+    # a neighbourhood that is longer along one axis can not swap axes
+    uni = AutomataUniverse(((0, 1), (0, -1), (1, 0), (-1, 0), (0, 2), (0, -2)), (2,), (3,))
+    assert frozenset(uni.symmetry_group) == frozenset((IDENTITY_MATRIX_2D,
+        ((1, 0), (0, -1)), ((-1, 0), (0, 1)), ((-1, 0), (0, -1))))
+
+def test_large_neighbourhood() -> None:
+    """neighbourhoods with many thousands of addresses still validate every address"""
+    cells = [cell for cell in itertools.product(range(-3, 4), repeat=4) if any(cell)]
+    uni = AutomataUniverse(cells, (2, 3), (3,))
+    assert uni.neighbourhood_population == 2400
+    assert uni.geometry.radius == (3, 3, 3, 3)
+    with pytest.raises(ValueError) as excinfo:
+        AutomataUniverse(cells[:-1], (2, 3), (3,))
+    assert excinfo.value.args[0] == ((-3, -3, -3, -3), "no symmetric address in neighbourhood")
+    with pytest.raises(TypeError):
+        AutomataUniverse(cells + [(1, 2, 3, 4.0)], (2, 3), (3,))
+    with pytest.raises(ValueError):
+        AutomataUniverse(cells + [(1, 2, 3)], (2, 3), (3,))
+
+def test_universe_geometry() -> None:
+    """equal configurations share one precomputed geometry"""
+    uni = base_universe_instance_2d()
+    other = base_universe_instance_2d()
+    geometry = uni.geometry
+    assert other.geometry is geometry
+    assert other == uni and hash(other) == hash(uni) == hash(geometry)
+    assert uni != base_universe_instance_1d()
+    assert other.symmetry_group is uni.symmetry_group
+    assert uni.identity_matrix is geometry.identity_matrix == IDENTITY_MATRIX_2D
+    assert frozenset(map(tuple, geometry.offsets.tolist())) == uni.neighbourhood
+    assert geometry.radius == (1, 1)
+    for count in range(uni.neighbourhood_population + 1):
+        assert geometry.rules[1, count] == (count in uni.survival_rules)
+        assert geometry.rules[0, count] == (count in uni.birth_rules)
+    with pytest.raises(ValueError):
+        geometry.offsets[0, 0] = 5
+    assert sorted(geometry.packed_offsets((10, 1)).tolist()) == \
+        sorted(10 * row + col for row, col in uni.neighbourhood)
+    # the geometry is not kept alive by the intern table
+    released = weakref.ref(AutomataUniverse(((-2,), (2,)), (1,), (1,)).geometry)
+    gc.collect()
+    assert released() is None
+
 def test_step_result() -> None:
     """verify result with good cells"""
     uni = base_universe_instance_2d()
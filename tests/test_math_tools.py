@@ -35,7 +35,8 @@ from common_test_data import (
     SQUARE_MATRIX_TRANSFORM_OPERATIONS_2D,
 )
 from math_tools import (identity_matrix, vector_dot_product, matrix_transpose, matrix_transform,
-    matrix_determinant, matrix_determinant2)
+    matrix_determinant, matrix_determinant2, matrix_inverse, matrix_power, matrix_products,
+    matrix_order, integer_matrix_exponent)
 
 # remove need to add parent to path?
 # `pipenv run python -m pytest «»`
@@ -203,3 +204,63 @@ def test_matrix_determinant2_results() -> None:
     assert len(MATRIX_AND_DETERMINANT) > 0
     for (matrix, determinant) in MATRIX_AND_DETERMINANT:
         assert matrix_determinant2(matrix) == determinant
+
+def test_matrix_determinant_exact() -> None:
+    """large integer determinants are exact"""
+    # Vandermonde matrix: det = product of (x[j] - x[i]) for i < j
+    points = (3, 10 ** 9, -7, 2 ** 40, 12345, -10 ** 6)
+    matrix = tuple(tuple(point ** power for power in range(len(points))) for point in points)
+    expected = 1
+    for i, low in enumerate(points):
+        for high in points[i + 1:]:
+            expected *= high - low
+    assert matrix_determinant(matrix) == expected
+    assert matrix_determinant(((0, 1), (1, 0))) == -1
+
+def test_matrix_inverse_results() -> None:
+    """integer inverses of unimodular matrices"""
+    for matrix in (IDENTITY_MATRIX_3D, ROTATE_MATRIX_2D_90, REFLECTION_MATRIX_2D_HORIZONTAL,
+            ((2, 3), (1, 2)), ((1, 2, 0), (0, 1, 5), (0, 0, -1))):
+        inverse = matrix_inverse(matrix)
+        assert matrix_transform(matrix, inverse) == identity_matrix(len(matrix))
+    with pytest.raises(ValueError):
+        matrix_inverse(ZERO_MATRIX_2D)
+    with pytest.raises(ValueError):
+        matrix_inverse(SCALE_3X_5Y_MATRIX)
+
+def test_matrix_power_results() -> None:
+    """repeated squaring matches repeated multiplication"""
+    matrix = ((1, 1), (1, 0))
+    product = IDENTITY_MATRIX_2D
+    for exponent in range(20):
+        assert matrix_power(matrix, exponent) == product
+        product = matrix_transform(product, matrix)
+    assert matrix_power(ROTATE_MATRIX_2D_90, 4) == IDENTITY_MATRIX_2D
+    assert matrix_power(ROTATE_MATRIX_2D_90, -1) == matrix_power(ROTATE_MATRIX_2D_90, 3)
+    assert matrix_power(matrix, 100)[0][1] == 354224848179261915075
+    with pytest.raises(TypeError):
+        matrix_power(matrix, 1.5)
+
+def test_matrix_products_results() -> None:
+    """stacked products broadcast, and stay exact when they could overflow"""
+    stack = (ROTATE_MATRIX_2D_90, ROTATE_MATRIX_2D_180, TRANPOSE_MATRIX_2D)
+    products = matrix_products(stack, ROTATE_MATRIX_2D_90)
+    for matrix, product in zip(stack, products.tolist()):
+        assert tuple(map(tuple, product)) == matrix_transform(matrix, ROTATE_MATRIX_2D_90)
+    large = ((2 ** 40, 1), (0, 2 ** 40))
+    assert tuple(map(tuple, matrix_products(large, large).tolist())) == \
+        matrix_transform(large, large)
+
+def test_matrix_order_results() -> None:
+    """orders of finite order matrices, and None for infinite order"""
+    assert [integer_matrix_exponent(size) for size in range(1, 5)] == [2, 12, 12, 120]
+    exponent = integer_matrix_exponent(2)
+    assert matrix_order(IDENTITY_MATRIX_2D, exponent) == 1
+    assert matrix_order(ROTATE_MATRIX_2D_90, exponent) == 4
+    assert matrix_order(ROTATE_MATRIX_2D_180, exponent) == 2
+    assert matrix_order(((0, -1), (1, 1)), exponent) == 6 # hexagonal rotation
+    assert matrix_order(((1, 1), (0, 1)), exponent) is None
+    cycle = tuple(tuple(int(col == (row + 1) % 7) for col in range(7)) for row in range(7))
+    assert matrix_order(cycle, integer_matrix_exponent(7)) == 7
+    with pytest.raises(ValueError):
+        matrix_order(IDENTITY_MATRIX_2D, 0)